@@ -0,0 +1,135 @@
+# grid_bench.py
+"""
+Micro-benchmarks of the Grid API over map sizes and pheromone densities. Runs offline, no API keys needed.
+
+    cd src
+    python -m benchmarks.grid_bench --out files/bench/grid.json --save-baseline --baseline benchmarks/baselines/grid.json
+    python -m benchmarks.grid_bench --out files/bench/grid.json --baseline benchmarks/baselines/grid.json
+
+Queries around one cell (get_pheromones_square, is_passable, ...) should cost the same on every map size, and
+whole-grid passes (age_pheromones, get_victim_positions) should grow with the pheromones or cells they touch.
+The printed 'vs smallest' column makes anything growing faster than that stand out.
+"""
+import argparse
+import json
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.harness import measure, report_comparison, result_key, write_results
+from idk_some_code.grid import Grid
+from idk_some_code.scenario import build_scenario
+
+SIZES = (100, 500, 1000, 2000, 5000)
+DENSITIES = (0.001, 0.01)
+PHEROMONE_TYPES = ("trail", "need_help", "area_cleared")
+VICTIM_DENSITY = 0.001
+
+
+def build_grid(size: int, density: float, seed: int = 0) -> Tuple[Grid, np.ndarray]:
+    """
+    A size x size grid with victims and pheromones of every type on about density of its cells.
+    :return: The grid and (n, 2) x, y query points spread over it
+    """
+    rng = np.random.default_rng(seed)
+    grid = Grid(size, size)
+    build_scenario(grid, 0, 0, int(size * size * VICTIM_DENSITY), rng)
+    count = int(size * size * density)
+    xs, ys = rng.integers(0, size, count), rng.integers(0, size, count)
+    types = rng.integers(0, len(PHEROMONE_TYPES), count)
+    for x, y, type_index in zip(xs.tolist(), ys.tolist(), types.tolist()):
+        grid.add_pheromone(x, y, PHEROMONE_TYPES[type_index], "bench", 0)
+    return grid, rng.integers(0, size, (256, 2))
+
+
+def _cycling(points: np.ndarray) -> Callable[[], Tuple[int, int]]:
+    """Returns the query points one after the other, round and round."""
+    coordinates = [tuple(point) for point in points.tolist()]
+    state = {"index": 0}
+
+    def next_point() -> Tuple[int, int]:
+        state["index"] = (state["index"] + 1) % len(coordinates)
+        return coordinates[state["index"]]
+
+    return next_point
+
+
+def grid_cases(grid: Grid, points: np.ndarray) -> Dict[str, Callable[[], object]]:
+    """The benchmarked calls on one grid, by name."""
+    point = _cycling(points)
+    return {
+        "age_pheromones": lambda: grid.age_pheromones(0),
+        "advance_time": lambda: grid.advance_time(1, min_intensity=0.0),
+        "get_pheromones_square": lambda: grid.get_pheromones_square(point(), 5),
+        "get_recent_need_help_pheromones": lambda: grid.get_recent_need_help_pheromones(*point(), 10, 100, 0),
+        "check_for_drone_activity": lambda: grid.check_for_drone_activity(*point(), 5),
+        "get_victim_positions": grid.get_victim_positions,
+        "is_passable": lambda: grid.is_passable(*point()),
+        # Last, every timed call leaves a pheromone behind
+        "add_pheromone": lambda: grid.add_pheromone(*point(), "trail", "bench", 0),
+    }
+
+
+def run(sizes: Iterable[int] = SIZES, densities: Iterable[float] = DENSITIES, repeat: int = 5,
+        min_time: float = 0.05, only: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    Runs every case on every size and density.
+    :param only: Names of the cases to run, all by default
+    :return: Results by result_key
+    """
+    results = {}
+    for size in sizes:
+        for density in densities:
+            grid, points = build_grid(size, density)
+            pheromones = sum(len(cell) for cell in grid.pheromones.values())
+            for name, call in grid_cases(grid, points).items():
+                if only and name not in only:
+                    continue
+                result = measure(call, repeat, min_time)
+                result.update(size=size, density=density, pheromones=pheromones)
+                results[result_key(f"grid.{name}", size=size, density=density)] = result
+    return results
+
+
+def print_table(results: Dict[str, Dict]) -> None:
+    """Median per call, with the ratio to the same case on the smallest map."""
+    smallest: Dict[Tuple[str, float], float] = {}
+    for key, result in sorted(results.items(), key=lambda item: (item[0].split("[")[0], item[1]["density"],
+                                                                  item[1]["size"])):
+        case = (key.split("[")[0], result["density"])
+        smallest.setdefault(case, result["median_us"])
+        print(f"{case[0]:<38}{result['size']:>6}{result['density']:>8}{result['median_us']:>14.2f} us"
+              f"{result['median_us'] / smallest[case]:>10.1f}x vs smallest")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Grid API micro-benchmarks.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Map sides")
+    parser.add_argument("--densities", type=float, nargs="+", default=list(DENSITIES),
+                        help="Share of cells holding a pheromone")
+    parser.add_argument("--only", nargs="+", default=None, help="Run only these cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="Shortest timed batch in seconds")
+    parser.add_argument("--out", default=None, help="Write the results as JSON")
+    parser.add_argument("--baseline", default=None, help="Baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline instead")
+    parser.add_argument("--threshold", type=float, default=1.5, help="Slowdown ratio counted as a regression")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON instead of a table")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = run(args.sizes, args.densities, args.repeat, args.min_time, args.only)
+    if args.out:
+        write_results(args.out, results)
+    if args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+    else:
+        print_table(results)
+    return report_comparison(results, args.baseline, args.threshold, args.save_baseline)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
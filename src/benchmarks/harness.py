@@ -0,0 +1,113 @@
+# harness.py
+"""
+Shared plumbing of the benchmark suites: timing, machine-readable results and baseline comparison.
+
+Results are JSON files: {"environment": {...}, "results": {key: {"median_us": ..., ...}}}. A result file saved
+with --save-baseline is compared against later runs, and any benchmark whose median got slower by more than the
+threshold ratio is reported as a regression (exit code 1).
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def measure(function: Callable[[], object], repeat: int = 5, min_time: float = 0.05) -> Dict[str, float]:
+    """
+    Times a call like timeit does: calls are batched until a batch lasts at least min_time, then batches repeat.
+    :param function: Called without arguments
+    :param repeat: Number of timed batches
+    :param min_time: Shortest batch in seconds
+    :return: Median, min and max microseconds per call, and the number of calls per batch
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 10 if number < 1000 else 2
+        if number > 10 ** 7:
+            break
+    per_call = [batch / number * 1e6 for batch in timer.repeat(repeat, number)]
+    return {"median_us": statistics.median(per_call), "min_us": min(per_call), "max_us": max(per_call),
+            "calls": number}
+
+
+def measure_once(function: Callable[[], object]) -> float:
+    """Microseconds of a single call, for operations too slow or too stateful to repeat."""
+    started = time.perf_counter()
+    function()
+    return (time.perf_counter() - started) * 1e6
+
+
+def result_key(name: str, **params) -> str:
+    """Stable key of a benchmark and its parameters, e.g. 'grid.is_passable[density=0.01,size=100]'."""
+    return f"{name}[{','.join(f'{key}={value}' for key, value in sorted(params.items()))}]"
+
+
+def environment() -> Dict[str, str]:
+    """Where the numbers come from, baselines are only meaningful on the same kind of machine."""
+    return {"python": sys.version.split()[0], "numpy": np.__version__, "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(), "cpus": str(os.cpu_count()),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def write_results(path: str, results: Dict[str, Dict]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump({"environment": environment(), "results": results}, file, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, Dict]:
+    with open(path) as file:
+        return json.load(file)["results"]
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float = 1.5,
+            metric: str = "median_us") -> List[Tuple[str, float, float, float]]:
+    """
+    Finds the benchmarks that got slower than the baseline allows.
+    :param current: Results of this run
+    :param baseline: Stored results
+    :param threshold: Largest accepted current / baseline ratio
+    :param metric: Result field compared, lower is better
+    :return: (key, baseline, current, ratio) of every regression, worst first
+    """
+    regressions = []
+    for key, result in current.items():
+        reference = baseline.get(key)
+        if reference is None or not reference.get(metric):
+            continue
+        ratio = result[metric] / reference[metric]
+        if ratio > threshold:
+            regressions.append((key, reference[metric], result[metric], ratio))
+    return sorted(regressions, key=lambda regression: -regression[3])
+
+
+def report_comparison(current: Dict[str, Dict], baseline_path: Optional[str], threshold: float,
+                      save_baseline: bool, metric: str = "median_us") -> int:
+    """
+    Saves or checks against the baseline and prints the outcome.
+    :return: Process exit code, 1 when something regressed
+    """
+    if baseline_path is None:
+        return 0
+    if save_baseline:
+        write_results(baseline_path, current)
+        print(f"Baseline saved to {baseline_path}")
+        return 0
+    if not os.path.exists(baseline_path):
+        print(f"No baseline at {baseline_path}, run with --save-baseline to create one")
+        return 0
+    regressions = compare(current, load_results(baseline_path), threshold, metric)
+    for key, reference, result, ratio in regressions:
+        print(f"REGRESSION {key}: {reference:.2f} -> {result:.2f} ({ratio:.2f}x)")
+    if not regressions:
+        print(f"No regressions beyond {threshold:.2f}x of {baseline_path}")
+    return 1 if regressions else 0
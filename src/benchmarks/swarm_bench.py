@@ -0,0 +1,161 @@
+# swarm_bench.py
+"""
+End-to-end scaling benchmark of the tick loop (perception, decision, action, decay) without any LLM.
+
+    cd src
+    python -m benchmarks.swarm_bench --drones 1 10 100 1000 10000 --sizes 100 500 2000 --out files/bench/swarm.json
+
+Drones run the 'stub' policy by default: the whole agent loop with Drone.stub_decision standing in for the model,
+or the 'heuristic' policy. Every configuration runs in a fresh process so its peak RSS is its own, and reports
+ticks per second and the cost per drone per tick, the scaling curve of the orchestration code itself.
+"""
+import argparse
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows, peak RSS is not reported there
+    resource = None
+
+from benchmarks.harness import report_comparison, result_key, write_results
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+from idk_some_code.main import schedule_drones
+from idk_some_code.profiler import PhaseProfiler
+from idk_some_code.random_streams import SimulationRandom
+from idk_some_code.scenario import build_scenario, sample_free_cells
+from idk_some_code.swarm import SwarmIndex
+
+DRONE_COUNTS = (1, 10, 100, 1000, 10000)
+SIZES = (100, 500, 2000)
+VICTIM_DENSITY = 0.01
+MOUNTAIN_DENSITY = 0.01
+# Beyond this many drones per cell trails cover the whole map and every perception window is full,
+# which measures crowding rather than scaling
+MAX_DRONE_DENSITY = 0.05
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB, None where the platform can't tell."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def build_swarm(size: int, num_drones: int, policy: str, seed: int = 0):
+    """
+    A size x size scenario with drones spread over free cells, sharing cells once there are more drones than cells.
+    :return: The grid, the drones and their scheduler
+    """
+    streams = SimulationRandom(seed)
+    grid = Grid(size, size)
+    build_scenario(grid, int(size * size * MOUNTAIN_DENSITY), 0, int(size * size * VICTIM_DENSITY),
+                   streams.generator("obstacles"))
+    cells = sample_free_cells(grid.terrain == 0, num_drones, streams.generator("start_positions"))
+    cells = np.resize(cells, num_drones)
+    swarm = SwarmIndex()
+    drones = [Drone(grid, (int(cell % size), int(cell // size)), policy=policy, swarm=swarm, rng=rng)
+              for cell, rng in zip(cells.tolist(), streams.drone_streams(num_drones))]
+    return grid, drones, schedule_drones(grid, drones)
+
+
+def run_config(size: int, num_drones: int, ticks: int, policy: str = "stub", phases: bool = False) -> Dict:
+    """
+    Builds and runs one configuration, meant to run in its own process.
+    :param phases: Also time every phase with a PhaseProfiler, which slows the run down a little
+    :return: The result of the configuration
+    """
+    rss_before = peak_rss_mb()
+    started = time.perf_counter()
+    grid, drones, scheduler = build_swarm(size, num_drones, policy)
+    setup_s = time.perf_counter() - started
+
+    profiler = PhaseProfiler() if phases else None
+    started = time.perf_counter()
+    if profiler is None:
+        scheduler.run_until(ticks)
+    else:
+        with profiler.instrumented():
+            profiler.run(scheduler, ticks)
+    run_s = time.perf_counter() - started
+
+    result = {"size": size, "drones": num_drones, "policy": policy, "ticks": ticks, "setup_s": setup_s,
+              "run_s": run_s, "ticks_per_s": ticks / run_s, "decisions": scheduler.decisions,
+              "us_per_decision": run_s / max(scheduler.decisions, 1) * 1e6,
+              "us_per_drone_tick": run_s / (ticks * num_drones) * 1e6,
+              "rss_before_mb": rss_before, "peak_rss_mb": peak_rss_mb()}
+    if profiler is not None:
+        result["phases"] = profiler.summary()
+    return result
+
+
+def run_isolated(size: int, num_drones: int, ticks: int, policy: str = "stub", phases: bool = False) -> Dict:
+    """Runs a configuration in a freshly spawned process, so peak RSS and caches start from scratch."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_config, size, num_drones, ticks, policy, phases).result()
+
+
+def run(sizes: Iterable[int] = SIZES, drone_counts: Iterable[int] = DRONE_COUNTS, ticks: int = 50,
+        policy: str = "stub", phases: bool = False, isolated: bool = True,
+        max_density: float = MAX_DRONE_DENSITY) -> Dict[str, Dict]:
+    """
+    Runs every size and drone count.
+    :param isolated: One process per configuration, without it peak RSS only ever grows
+    :param max_density: Configurations with more drones per cell are skipped
+    :return: Results by result_key
+    """
+    runner = run_isolated if isolated else run_config
+    results = {}
+    for size in sizes:
+        for num_drones in drone_counts:
+            if num_drones > max(size * size * max_density, 1):
+                print(f"{size:>6}{num_drones:>8} drones    skipped, more than {max_density} drones per cell",
+                      file=sys.stderr)
+                continue
+            result = runner(size, num_drones, ticks, policy, phases)
+            results[result_key(f"swarm.{policy}", size=size, drones=num_drones)] = result
+            print(f"{size:>6}{num_drones:>8} drones{result['ticks_per_s']:>12.1f} ticks/s"
+                  f"{result['us_per_drone_tick']:>12.2f} us/drone/tick"
+                  f"{result['peak_rss_mb'] or float('nan'):>10.1f} MB peak", file=sys.stderr)
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Swarm scaling benchmark of the tick loop, no LLM involved.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES), help="Map sides")
+    parser.add_argument("--drones", type=int, nargs="+", default=list(DRONE_COUNTS), help="Drone counts")
+    parser.add_argument("--ticks", type=int, default=50, help="Simulation time of every configuration")
+    parser.add_argument("--policy", choices=("stub", "heuristic"), default="stub")
+    parser.add_argument("--phases", action="store_true", help="Also break every run down by tick phase")
+    parser.add_argument("--max-density", type=float, default=MAX_DRONE_DENSITY,
+                        help="Skip configurations with more drones per cell")
+    parser.add_argument("--in-process", action="store_true",
+                        help="Run every configuration in this process, faster but peak RSS only grows")
+    parser.add_argument("--out", default=None, help="Write the results as JSON")
+    parser.add_argument("--baseline", default=None, help="Baseline results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline instead")
+    parser.add_argument("--threshold", type=float, default=1.5, help="Slowdown ratio counted as a regression")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = run(args.sizes, args.drones, args.ticks, args.policy, args.phases, not args.in_process,
+                  args.max_density)
+    if args.out:
+        write_results(args.out, results)
+    print(json.dumps(results, indent=2, sort_keys=True))
+    return report_comparison(results, args.baseline, args.threshold, args.save_baseline, metric="us_per_drone_tick")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
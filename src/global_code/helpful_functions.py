@@ -1,25 +1,140 @@
 """
 This is a universal Page to be used across projects
 """
+import atexit
+import functools
 import logging
 import os
+import queue
+import sqlite3
+import threading
 import traceback
 import inspect
-import time
-from typing import Optional, Callable, Any
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Optional, Callable, Any, Iterable, List
 
 import yaml
 # Optional Imports:
-# These 3 for the database connection
-import pymysql.cursors
+# pymysql is only needed for the database connection and imported there
 # from dotenv import load_dotenv
 #
 # load_dotenv()
 
 
+# Set BENCHMARK_FUNCTIONS=0 to leave benchmark decorated functions untouched, checked once at decoration time
+BENCHMARKS_ENABLED: bool = os.getenv("BENCHMARK_FUNCTIONS", "1") != "0"
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_logger(file_path: str, name: str, kind: str) -> logging.Logger:
+    """
+    One logger per (file, name, kind), created with its handlers the first time it is asked for.
+    :param kind: 'benchmark' or 'error'
+    """
+    personal_logger = PersonalLogger(file_path, name)
+    return personal_logger.create_benchmark() if kind == "benchmark" else personal_logger.create_logger_error()
+
+
+def _log_name(func: Callable, file_prefix: Optional[str]) -> str:
+    return func.__name__ if file_prefix is None else file_prefix + func.__name__
+
+
+def _defining_file(func: Callable) -> str:
+    """File the function is defined in, its logs go to the logs folder next to it."""
+    code = getattr(inspect.unwrap(func), "__code__", None)
+    return code.co_filename if code is not None else os.path.abspath(__file__)
+
+
+class TimingStats:
+    """
+    In-memory timings of one function, written to its benchmark log as a summary line
+    every flush_every calls or flush_interval seconds instead of one line per call.
+    """
+
+    def __init__(self, name: str, logger: logging.Logger, flush_every: int = 10000,
+                 flush_interval: float = 60.0):
+        self.name = name
+        self.logger = logger
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.flushed_at = perf_counter()
+
+    def add(self, seconds: float, now: float) -> None:
+        """
+        Adds one call.
+        :param seconds: Duration of the call
+        :param now: perf_counter at the end of the call, saves reading the clock again
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if self.count >= self.flush_every or now - self.flushed_at >= self.flush_interval:
+            self.flush(now)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """Logs the summary of the calls since the last flush and starts over."""
+        if self.count:
+            self.logger.debug(f"{self.name} ran {self.count} times in {self.total:.6f} seconds, "
+                              f"mean {self.total / self.count:.9f}, max {self.max:.9f}")
+        self.count, self.total, self.max = 0, 0.0, 0.0
+        self.flushed_at = perf_counter() if now is None else now
+
+
+# Every TimingStats created by the benchmark decorators, flushed when the interpreter exits
+_timing_stats: List[TimingStats] = []
+
+
+def flush_benchmarks() -> None:
+    """Writes the pending timing summaries of every benchmarked function."""
+    for stats in _timing_stats:
+        stats.flush()
+
+
+atexit.register(flush_benchmarks)
+
+
+def _timed(func: Callable, file_prefix: Optional[str], flush_every: int, flush_interval: float) -> Callable:
+    """Wraps func so every call is timed into a TimingStats, everything but the clock is resolved here."""
+    name = _log_name(func, file_prefix)
+    stats = TimingStats(name, _cached_logger(_defining_file(func), name, "benchmark"), flush_every, flush_interval)
+    _timing_stats.append(stats)
+    add = stats.add
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            end = perf_counter()
+            add(end - start, end)
+
+    wrapper.timing_stats = stats
+    return wrapper
+
+
+def _with_optional_arguments(decorator_factory: Callable) -> Callable:
+    """Lets a decorator factory be used both as @decorator and as @decorator(...)."""
+
+    @functools.wraps(decorator_factory)
+    def factory(file_prefix=None, **options):
+        if callable(file_prefix):
+            return decorator_factory(**options)(file_prefix)
+        return decorator_factory(file_prefix, **options)
+
+    return factory
+
+
+@_with_optional_arguments
 def log_exceptions(file_prefix: Optional[str] = None):
     """
-        Logs and exceptions that occur in the function
+        Logs and exceptions that occur in the function, then lets them continue up the stack
+        The logger is created once, when the function is decorated
         To use:
         from helpful_functions import log_exceptions
         @log_exceptions
@@ -27,114 +142,105 @@ def log_exceptions(file_prefix: Optional[str] = None):
     """
 
     def decorator(func: Callable):
-        def wrapper(*args, **kwargs):
-            calling_frame = inspect.stack()[1]
-            file_path: str = calling_frame[1]
-            file_name: str = func.__name__
-
-            if file_prefix is not None:
-                file_name = file_prefix + file_name
-
-            personal_logger2 = PersonalLogger(file_path, file_name)
-            py_logger_object: logging.Logger = personal_logger2.create_logger_error()
+        name = _log_name(func, file_prefix)
+        file_path = _defining_file(func)
 
-            result: Optional[Any] = None
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
             try:
-                result = func(*args, **kwargs)
-            except CustomError as custom_error:
-                personal_logger2.log_it(custom_error)
-                raise custom_error
+                return func(*args, **kwargs)
             except Exception as e:
-                personal_logger2.log_it(e)
-                raise e
-            finally:
-                return result
+                _log_error(_cached_logger(file_path, name, "error"), e)
+                raise
 
         return wrapper
 
     return decorator
 
 
-def benchmark_function(file_prefix: Optional[str] = None):
+def _log_error(logger: logging.Logger, error: Exception) -> None:
+    """Logs an error and the line it occurred on, like PersonalLogger.log_it."""
+    logger.error(f"An exception occurred on line {traceback.extract_tb(error.__traceback__)[-1].lineno}: {error}")
+
+
+@_with_optional_arguments
+def benchmark_function(file_prefix: Optional[str] = None, flush_every: int = 10000, flush_interval: float = 60.0):
     """
-    Benchmarks your function, and creates a benchmark log file
-    :param file_prefix: if you want to add a suffix to the function name
+    Benchmarks your function, and writes a summary of its timings to a benchmark log file
+    Timings are kept in memory and logged every flush_every calls or flush_interval seconds, and at exit
+    With BENCHMARK_FUNCTIONS=0 the function is returned untouched, so hot methods pay nothing
+    :param file_prefix: if you want to add a prefix to the function name
+    :param flush_every: calls between summaries
+    :param flush_interval: seconds between summaries
     :return:
     To use:
-        from helpful_functions import benchmark_logs
-        @benchmark_logs
+        from helpful_functions import benchmark_function
+        @benchmark_function
         def some_function(**args, **kwargs):
     """
 
     def decorator(func: Callable):
-        def wrapper(*args, **kwargs):
-            calling_frame = inspect.stack()[1]
-            file_path: str = calling_frame[1]
-            file_name: str = func.__name__
-
-            if file_prefix is not None:
-                file_name = file_prefix + file_name
-
-            personal_logger2 = PersonalLogger(file_path, file_name)
-            bm_logger: logging.Logger = personal_logger2.create_benchmark()
-            start_time = time.time()
-
-            result: Any = func(*args, **kwargs)
-
-            end_time_section1 = time.time()
-            time_section1 = end_time_section1 - start_time
-            bm_logger.debug(f"{file_name} took {time_section1} seconds")
-            return result
-
-        return wrapper
+        if not BENCHMARKS_ENABLED:
+            return func
+        return _timed(func, file_prefix, flush_every, flush_interval)
 
     return decorator
 
 
-def benchmark_and_log_exceptions(file_prefix: Optional[str] = None):
+@_with_optional_arguments
+def benchmark_and_log_exceptions(file_prefix: Optional[str] = None, flush_every: int = 10000,
+                                 flush_interval: float = 60.0):
     """
-        Benchmarks your function
+        Benchmarks your function and logs its exceptions
+        CustomError is raised again, any other exception is logged and the function returns None
         To use: from helpful_functions import benchmark_and_log_exceptions
         @benchmark_and_log_exceptions
         def some_function(**args, **kwargs):
     """
 
     def decorator(func: Callable):
-        def wrapper(*args, **kwargs):
-            calling_frame = inspect.stack()[1]
-            file_path: str = calling_frame[1]
-            file_name: str = func.__name__
-
-            if file_prefix is not None:
-                file_name = file_prefix + file_name
-
-            personal_logger2 = PersonalLogger(file_path, file_name)
-            bm_logger: logging.Logger = personal_logger2.create_benchmark()
-
-            personal_logger_object = PersonalLogger(file_path, file_name)
-            logger2: logging.Logger = personal_logger_object.create_logger_error()
+        name = _log_name(func, file_prefix)
+        file_path = _defining_file(func)
 
-            result: Optional[Any] = None
-
-            start_time = time.time()
+        def guarded(*args, **kwargs):
             try:
-                result = func(*args, **kwargs)
+                return func(*args, **kwargs)
             except CustomError as custom_error:
-                personal_logger2.log_it(custom_error)
+                _log_error(_cached_logger(file_path, name, "error"), custom_error)
                 raise
             except Exception as e:
-                personal_logger2.log_it(e)
-            finally:
-                end_time_section1 = time.time()
-                time_section1 = end_time_section1 - start_time
-                bm_logger.debug(f"{file_name} took {time_section1} seconds")
-                return result
+                _log_error(_cached_logger(file_path, name, "error"), e)
+                return None
 
-        return wrapper
+        guarded = functools.wraps(func)(guarded)
+        if not BENCHMARKS_ENABLED:
+            return guarded
+        return _timed(guarded, file_prefix, flush_every, flush_interval)
 
     return decorator
 
 
+def benchmark_methods(owner: type, method_names: Iterable[str], file_prefix: Optional[str] = None,
+                      flush_every: int = 10000, flush_interval: float = 60.0) -> Callable[[], None]:
+    """
+    Benchmarks methods of a class from the outside, e.g. hot Grid or Drone methods for a single run,
+    without decorating them in the source
+    :param owner: the class
+    :param method_names: names of the methods to time
+    :return: call it to put the original methods back (and flush their timings)
+    """
+    originals = {name: owner.__dict__[name] for name in method_names}
+    for name, method in originals.items():
+        setattr(owner, name, _timed(method, file_prefix or owner.__name__ + ".", flush_every, flush_interval))
+
+    def restore() -> None:
+        for restored_name, original in originals.items():
+            getattr(owner, restored_name).timing_stats.flush()
+            setattr(owner, restored_name, original)
+
+    return restore
+
+
 class PersonalLogger:
     """
     really shitty logger class
@@ -174,7 +280,11 @@ class PersonalLogger:
         os.makedirs(file_logs_dir, exist_ok=True)
         log_file = os.path.join(file_logs_dir, f'BM_{self.name_of_function}.log')
 
-        logger = logging.getLogger(self.name_of_function)
+        # Its own logger, so benchmark lines never end up in the error log of the same function
+        logger = logging.getLogger(f'BM_{self.name_of_function}')
+        if _has_file_handler(logger, log_file):
+            self.py_logger_object = logger
+            return logger
 
         # Create a file handler and set the formatter
         handler = logging.FileHandler(log_file)
@@ -223,6 +333,9 @@ class PersonalLogger:
         log_file = os.path.join(file_logs_dir, f'{self.name_of_function}.log')
 
         logger = logging.getLogger(self.name_of_function)
+        if _has_file_handler(logger, log_file):
+            self.py_logger_object = logger
+            return logger
 
         # Create a file handler and set the formatter
         handler = logging.FileHandler(log_file)
@@ -243,6 +356,12 @@ class PersonalLogger:
         return logger
 
 
+def _has_file_handler(logger: logging.Logger, log_file: str) -> bool:
+    """Whether the logger already writes to log_file, creating a logger twice must not add a second handler."""
+    return any(isinstance(handler, logging.FileHandler) and handler.baseFilename == os.path.abspath(log_file)
+               for handler in logger.handlers)
+
+
 class CustomError(Exception):
     """
         This is a custom error class, to be used in the log_exceptions decorator
@@ -257,11 +376,19 @@ class CustomError(Exception):
         super().__init__(self.message)
 
 
+def _statement_kind(query: str) -> str:
+    """Leading keyword of a statement in lower case, 'select', 'insert', ... (a column named 'inserted_at' no
+    longer makes a SELECT look like an INSERT)."""
+    words = query.lstrip(" \t\r\n(").split(None, 1)
+    return words[0].lower() if words else ""
+
+
 # this class will give us an instance of a connection to our database
 class MySQLConnection:
     """
     THIS WILL ONLY WORK IN A DOCKER CONTAINER, WITH ENVIRONMENT VARIABLES FOR MYSQL STUFF
     """
+    placeholder = "%s"
 
     def __init__(self, db, host: Optional[str] = None, port: Optional[int] = None
                  , user: Optional[str] = None, password: Optional[str] = None):
@@ -276,6 +403,7 @@ class MySQLConnection:
         # )
         # with connection.cursor() as cur:
         #     cur.execute('CREATE DATABASE swarm_db;')
+        import pymysql.cursors
         connection = pymysql.connect(
             host=host or os.getenv("MYSQL_HOST"),
             port=port or int(os.getenv("MYSQL_PORT")),
@@ -292,18 +420,18 @@ class MySQLConnection:
 
     # the method to query the database
     def query_db(self, query, data=None) -> int or tuple or bool:
+        kind = _statement_kind(query)
         with self.connection.cursor() as cursor:
             try:
-                query = cursor.mogrify(query, data)
-                # On off SQL Text buttton
-
-                # log_it(logger=self.logger, error=None, custom_message=f"SQL QUERY: {query}", log_level="info")
+                # On off SQL Text buttton, mogrify formats the statement client side, only worth it when logged
+                # log_it(logger=self.logger, error=None, custom_message=f"SQL QUERY: {cursor.mogrify(query, data)}",
+                #        log_level="info")
                 cursor.execute(query, data)
-                if query.lower().find("insert") >= 0:
+                if kind == "insert":
                     # INSERT queries will return the ID NUMBER of the row inserted
                     self.connection.commit()
                     return cursor.lastrowid
-                elif query.lower().find("select") >= 0:
+                elif kind in ("select", "show", "with"):
                     # SELECT queries will return the data from the database as a LIST OF DICTIONARIES
                     result = cursor.fetchall()
                     return result
@@ -317,6 +445,133 @@ class MySQLConnection:
             #     self.connection.close()
             # connectToMySQL receives the database we're using and uses it to create an instance of MySQLConnection
 
+    def execute_many(self, query: str, rows: List[tuple]) -> int:
+        """
+        Runs one statement for many rows in a single transaction.
+        pymysql rewrites an INSERT ... VALUES (%s, ...) into multi-row INSERTs, so a batch costs a round trip per
+        max_allowed_packet worth of rows instead of one per row.
+        :param query: The statement, with %s placeholders
+        :param rows: One tuple of values per row
+        :return: Number of rows affected
+        """
+        with self.connection.cursor() as cursor:
+            try:
+                self.connection.begin()
+                count = cursor.executemany(query, rows)
+                self.connection.commit()
+                return count
+            except Exception as e:
+                self.connection.rollback()
+                log_it(logger=self.logger, error=e, log_level="error")
+                raise
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class SQLiteConnection:
+    """
+    Local stand-in for MySQLConnection with the same methods, on a SQLite file from the standard library.
+    The connection may be handed between threads (one at a time), which is what ConnectionPool does.
+    """
+    placeholder = "?"
+
+    def __init__(self, db: str):
+        """
+        :param db: Path of the database file, created if missing
+        """
+        self.connection = sqlite3.connect(db, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # Readers don't wait for the writer, and commits don't fsync the whole file
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.logger = create_logger_error(file_path=os.path.abspath(__file__), name_of_log_file='SQL_QUERY_LOGS',
+                                          log_to_console=True, log_to_file=False)
+
+    def query_db(self, query, data=None) -> int or list or bool:
+        kind = _statement_kind(query)
+        try:
+            cursor = self.connection.execute(query, data if data is not None else ())
+            if kind == "insert":
+                self.connection.commit()
+                return cursor.lastrowid
+            elif kind in ("select", "with", "pragma"):
+                return [dict(row) for row in cursor.fetchall()]
+            else:
+                self.connection.commit()
+        except Exception as e:
+            log_it(logger=self.logger, error=e, log_level="error")
+            return False
+
+    def execute_many(self, query: str, rows: List[tuple]) -> int:
+        """
+        Runs one statement for many rows in a single transaction.
+        :param query: The statement, with ? placeholders
+        :param rows: One tuple of values per row
+        :return: Number of rows affected
+        """
+        try:
+            with self.connection:
+                return self.connection.executemany(query, rows).rowcount
+        except Exception as e:
+            log_it(logger=self.logger, error=e, log_level="error")
+            raise
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class ConnectionPool:
+    """
+    A few connections reused across threads instead of one per object that wants to talk to the database.
+    Connections are opened the first time they are needed, at most size of them; a thread asking for one while all
+    are taken waits for one to be handed back.
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = 2):
+        """
+        :param factory: Opens a connection, for instance functools.partial(MySQLConnection, "swarm_db")
+        :param size: Most connections open at once
+        """
+        self.factory = factory
+        self.size = size
+        self._idle = queue.LifoQueue()  # The most recently used connection is the least likely to have timed out
+        self._lock = threading.Lock()
+        self._opened = []
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Takes a connection out of the pool, opening one if the pool isn't full yet."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._opened) < self.size:
+                connection = self.factory()
+                self._opened.append(connection)
+                return connection
+        return self._idle.get(timeout=timeout)
+
+    def release(self, connection) -> None:
+        """Hands a connection back."""
+        self._idle.put(connection)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """A connection for the duration of the block."""
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self) -> None:
+        """Closes every connection the pool opened."""
+        with self._lock:
+            for connection in self._opened:
+                connection.close()
+            self._opened.clear()
+
 
 class PostgreSQLConnection:
     """
@@ -365,17 +620,19 @@ class PostgreSQLConnection:
     #             return False
 
 
-def connect_to_db(db, db_type: str = "mysql") -> MySQLConnection or PostgreSQLConnection:
+def connect_to_db(db, db_type: str = "mysql") -> MySQLConnection or PostgreSQLConnection or SQLiteConnection:
     """
     returns the object to interact with the DB
-    :param db: name of the database inside the DB server
-    :param db_type: types of DB you want to connect to
+    :param db: name of the database inside the DB server, or the file path for sqlite
+    :param db_type: types of DB you want to connect to: mysql, postgres or sqlite
     :return: the class you want to use to interact with the DB
     """
     if db_type == "postgres":
         return PostgreSQLConnection(db)
     if db_type == "mysql":
         return MySQLConnection(db)
+    if db_type == "sqlite":
+        return SQLiteConnection(db)
 
 
 def count_lines_of_code(directory: str) -> int:
@@ -1,14 +1,31 @@
 
 
 from global_code.helpful_functions import load_config
-from openai import OpenAI
+
+
+class _LazyConfig:
+    """Loads config.yaml the first time State.config is read instead of when the module is imported."""
+
+    def __set_name__(self, owner, name):
+        self.name = "_" + name
+
+    def __get__(self, instance, owner) -> dict:
+        config = owner.__dict__.get(self.name)
+        if config is None:
+            config = load_config()
+            setattr(owner, self.name, config)
+        return config
+
+    def __set__(self, instance, value: dict) -> None:
+        setattr(type(instance), self.name, value)
+
 
 class State:
     """
     Singleton class for storing the state of the game.
     """
 
-    config: dict = load_config()
+    config: dict = _LazyConfig()
     # client = OpenAI(api_key=config['OPENAI']['API_KEY'])
     # os.environ['OPENAI_API_KEY'] = config['OPENAI']['API_KEY']
     # os.environ['REPLICATE_API_KEY'] = config['REPLICATE_API_KEY']
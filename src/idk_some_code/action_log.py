@@ -0,0 +1,190 @@
+# action_log.py
+"""
+Append-only binary log of every decision the drones take, and its replay.
+
+Recording writes one record per consultation (drone id and tick) followed by one record per tool action the model
+called during it (move_up, go_to(x, y), ...). The header line holds the run parameters and seed. Between
+consultations drones follow their intent locally and the rest of the simulation is seeded, so replaying the logged
+actions at the same consultations rebuilds the run exactly, without calling the model, and stops replaying at any
+tick to let the drones decide for themselves from there.
+"""
+import functools
+import json
+import struct
+from collections import deque
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+MAGIC = b"DRONEACTS1\n"
+# tick, drone id, action code, number of int32 arguments following the record
+RECORD = struct.Struct("<qIBB")
+
+CONSULT = "consult"
+# Code of every logged action is its index, new actions go at the end so existing logs stay readable
+ACTIONS = (CONSULT, "move_up", "move_down", "move_left", "move_right", "go_to", "explore_frontier",
+           "respond_to_need_help", "emit_need_help_tool", "emit_area_cleared_tool")
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+
+
+class ActionRecord(NamedTuple):
+    tick: int
+    drone_id: int
+    action: str
+    args: Tuple[int, ...]
+
+
+class ActionRecorder:
+    """Writes the decisions of a running simulation, see logged_action and Drone.agent_main."""
+
+    def __init__(self, file: BinaryIO, header: Dict[str, Any]) -> None:
+        """
+        :param file: Binary file the log is written to, see open_action_log
+        :param header: Parameters of the run (seed, policy, grid size...), everything replay_simulation needs
+        """
+        self.file = file
+        self.records = 0
+        self._consulting = None  # Drone whose consultation is being recorded
+        self._tick = 0
+        self._depth = 0
+        file.write(MAGIC + json.dumps(header).encode("utf-8") + b"\n")
+
+    def _write(self, tick: int, drone_id: int, action: str, args: Tuple[int, ...]) -> None:
+        self.file.write(RECORD.pack(tick, drone_id, ACTION_CODES[action], len(args)))
+        if args:
+            self.file.write(struct.pack(f"<{len(args)}i", *args))
+        self.records += 1
+
+    def consult(self, drone, tick: int) -> bool:
+        """
+        Called when a drone is about to decide, the actions it takes until its next consultation belong to this one.
+        :return: False, the drone decides by itself
+        """
+        self._consulting = drone
+        self._tick = tick
+        self._write(tick, drone.drone_id, CONSULT, ())
+        return False
+
+    def capture(self, drone, action: str, args: Tuple) -> bool:
+        """
+        Records an action of the consulting drone, unless it is part of an action already being recorded.
+        :return: True if recorded, release must then be called once the action is done
+        """
+        if self._depth or drone is not self._consulting:
+            return False
+        self._write(self._tick, drone.drone_id, action, tuple(int(arg) for arg in args))
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        self._depth -= 1
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def open_action_log(path: str, header: Dict[str, Any]) -> ActionRecorder:
+    """Starts an action log at path."""
+    return ActionRecorder(open(path, "wb"), header)
+
+
+def read_actions(path: str) -> Iterator:
+    """
+    Reads an action log. A record cut short by an interrupted run ends the log.
+    :param path: The log written by an ActionRecorder
+    :return: The header dict first, then every ActionRecord in order
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an action log")
+        yield json.loads(file.readline())
+        while True:
+            header = file.read(RECORD.size)
+            if len(header) < RECORD.size:
+                return
+            tick, drone_id, code, num_args = RECORD.unpack(header)
+            payload = file.read(4 * num_args)
+            if len(payload) < 4 * num_args:
+                return
+            yield ActionRecord(tick, drone_id, ACTIONS[code], struct.unpack(f"<{num_args}i", payload))
+
+
+class ActionReplay:
+    """
+    Stands in for the model: every logged consultation of a drone replays the actions taken back then.
+    Drones consulting past the until tick, or past the end of the log, decide by themselves.
+    """
+
+    def __init__(self, records: Iterable[ActionRecord], until: Optional[int] = None) -> None:
+        """
+        :param records: The logged records, see read_actions
+        :param until: Only replay consultations before this tick, the whole log if None
+        """
+        self.until = until
+        self.replayed = 0
+        self._consultations: Dict[int, Deque[Tuple[int, List[ActionRecord]]]] = {}
+        for record in records:
+            queue = self._consultations.setdefault(record.drone_id, deque())
+            if record.action == CONSULT:
+                queue.append((record.tick, []))
+            elif queue:
+                queue[-1][1].append(record)
+
+    def consult(self, drone, tick: int) -> bool:
+        """
+        Replays the drone's logged decision at tick.
+        :return: True if replayed, False if the drone has to decide by itself
+        :raises RuntimeError: If the drone consults at another tick than logged, the run no longer matches the log
+        """
+        if self.until is not None and tick >= self.until:
+            return False
+        queue = self._consultations.get(drone.drone_id)
+        if not queue:
+            return False
+        logged_tick, actions = queue.popleft()
+        if logged_tick != tick:
+            raise RuntimeError(f"Drone {drone.drone_id} consulted at tick {tick} but the log has tick {logged_tick}, "
+                               f"the run diverged from the log")
+        for record in actions:
+            getattr(drone, record.action)(*record.args)
+        self.replayed += 1
+        return True
+
+    def capture(self, drone, action: str, args: Tuple) -> bool:
+        """Replayed actions are not recorded again."""
+        return False
+
+    def release(self) -> None:
+        pass
+
+
+def load_replay(path: str, until: Optional[int] = None) -> Tuple[Dict[str, Any], ActionReplay]:
+    """
+    Loads an action log for replay.
+    :param path: The log
+    :param until: Only replay consultations before this tick
+    :return: The run parameters from the header and the replay
+    """
+    records = read_actions(path)
+    header = next(records)
+    return header, ActionReplay(records, until)
+
+
+def logged_action(method: Callable) -> Callable:
+    """
+    Marks a Drone method as a tool action, calls made while the drone decides are written to its action log.
+    An action calling another one (explore_frontier going through go_to) is logged once, as the outer action.
+    """
+    name = method.__name__
+    if name not in ACTION_CODES:
+        raise ValueError(f"'{name}' has no action code, add it to ACTIONS")
+
+    @functools.wraps(method)
+    def wrapper(drone, *args):
+        log = drone.action_log
+        if log is None or not log.capture(drone, name, args):
+            return method(drone, *args)
+        try:
+            return method(drone, *args)
+        finally:
+            log.release()
+
+    return wrapper
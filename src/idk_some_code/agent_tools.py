@@ -0,0 +1,167 @@
+# agent_tools.py
+# crewai tools wrapping the Drone actions, imported by Drone.agent_main only when a drone consults the LLM
+from typing import Any
+
+from crewai_tools import BaseTool
+from crewai_tools import tool
+from pydantic import BaseModel, BaseConfig, Field
+
+
+class DroneModel(BaseModel):
+    class Config:
+        arbitrary_types_allowed = True
+
+
+# @tool("MoveEastTool")
+# def move_east_tool(drone: DroneModel) -> str:
+#     """Move the drone east."""
+#     drone.move_right()  # Assuming move_right() is a valid method on the Drone class
+#     return "Moved east"
+#
+#
+# @tool("MoveWestTool")
+# def move_west_tool(drone: Any):
+#     """Move the drone west."""
+#     drone.move_left()
+#     return "Moved West"
+#
+#
+# @tool("MoveNorthTool")
+# def move_north_tool(drone: Any):
+#     """Move the drone north."""
+#     drone.move_up()
+#     return "Moved north"
+#
+#
+# @tool("MoveSouthTool")
+# def move_south_tool(drone: Any):
+#     """Move the drone south."""
+#     drone.move_down()
+#     return "Moved south"
+#
+#
+# @tool("EmitNeedHelpTool")
+# def emit_need_help_tool(drone: Any):
+#     """Emit the 'Need Help' pheromone."""
+#     drone.emit_need_help_tool()
+#     return "Emitted 'Need Help'"
+#
+#
+# @tool("EmitAreaClearedTool")
+# def emit_area_cleared_tool(drone: any):
+#     """Emit the 'Area Cleared' pheromone."""
+#     drone.emit_area_cleared_tool()
+#     return "Emitted 'Area Cleared'"
+
+
+class MoveEastTool(BaseTool):
+    name: str = "Move East"
+    description: str = "Tool to move the drone east."
+    drone: Any = Field(..., description="Drone instance")
+
+    def __init__(self, drone):
+        super().__init__(drone=drone)
+        # self.drone = drone
+
+    def _run(self):
+        result = self.drone.move_right()
+        return result
+
+
+class MoveWestTool(BaseTool):
+    name: str = "Move West"
+    description: str = "Tool to move the drone west."
+    drone: Any = Field(..., description="Drone instance")
+
+    def __init__(self, drone):
+        super().__init__(drone=drone)
+
+    def _run(self):
+        result = self.drone.move_left()
+        return result
+
+
+class MoveNorthTool(BaseTool):
+    name: str = "Move North"
+    description: str = "Tool to move the drone north."
+    drone: Any = Field(..., description="Drone instance")
+
+    def __init__(self, drone):
+        super().__init__(drone=drone)
+
+    def _run(self):
+        return self.drone.move_up()
+
+
+
+class MoveSouthTool(BaseTool):
+    name: str = "Move South"
+    description: str = "Tool to move the drone south."
+    drone: Any = Field(..., description="Drone instance")
+
+    def __init__(self, drone):
+        super().__init__(drone=drone)
+
+    def _run(self):
+        return self.drone.move_down()
+
+
+class GoToTool(BaseTool):
+    name: str = "Go To"
+    description: str = ("Tool to fly the drone to the grid cell (x, y). The path is planned once and followed over "
+                        "the next turns, use it for anything further than one cell away.")
+    drone: Any = Field(..., description="Drone instance")
+
+    def __init__(self, drone):
+        super().__init__(drone=drone)
+
+    def _run(self, x: int, y: int):
+        return self.drone.go_to(int(x), int(y))
+
+
+class ExploreFrontierTool(BaseTool):
+    name: str = "Explore Frontier"
+    description: str = "Tool to fly the drone to the closest unexplored cell bordering already explored ground."
+    drone: Any = Field(..., description="Drone instance")
+
+    def __init__(self, drone):
+        super().__init__(drone=drone)
+
+    def _run(self):
+        return self.drone.explore_frontier()
+
+
+class RespondToNeedHelpTool(BaseTool):
+    name: str = "Respond To Need Help"
+    description: str = "Tool to fly the drone toward the closest 'Need Help' pheromone over the next turns."
+    drone: Any = Field(..., description="Drone instance")
+
+    def __init__(self, drone):
+        super().__init__(drone=drone)
+
+    def _run(self):
+        return self.drone.respond_to_need_help()
+
+
+class EmitNeedHelpTool(BaseTool):
+    name: str = "Emit Need Help"
+    description: str = "Tool to emit 'Need Help' pheromone."
+    drone: Any = Field(..., description="Drone instance")
+
+    def __init__(self, drone):
+        super().__init__(drone=drone)
+
+    def _run(self):
+        return self.drone.emit_need_help_tool()
+
+
+class EmitAreaClearedTool(BaseTool):
+    name: str = "Emit Area Cleared"
+    description: str = "Tool to emit 'Area Cleared' pheromone."
+    drone: Any = Field(..., description="Drone instance")
+
+    def __init__(self, drone):
+        super().__init__(drone=drone)
+
+    def _run(self):
+        return self.drone.emit_area_cleared_tool()
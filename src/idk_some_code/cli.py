@@ -0,0 +1,173 @@
+# cli.py
+"""
+Headless command line entry point.
+
+    python -m idk_some_code.cli --grid 100 100 --drones 8 --victims 300 --time 500 --policy heuristic --seed 7
+
+Only the simulation core is imported up front. The LLM stack is loaded by the first drone that consults the model,
+matplotlib and ffmpeg only when a video is requested, so short heuristic runs start in a fraction of a second.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from typing import List, Optional
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run a drone disaster response simulation without a display.")
+    parser.add_argument("--grid", type=int, nargs=2, default=(100, 100), metavar=("WIDTH", "HEIGHT"),
+                        help="Grid size")
+    parser.add_argument("--drones", type=int, default=4, help="Number of drones")
+    parser.add_argument("--victims", type=int, default=300, help="Number of victims")
+    parser.add_argument("--mountains", type=int, default=0, help="Number of mountain cells")
+    parser.add_argument("--buildings", type=int, default=0, help="Number of collapsed building cells")
+    parser.add_argument("--scenario", choices=("random", "procedural"), default="random",
+                        help="'procedural' grows mountain ranges, building districts and victims in the rubble "
+                             "instead of scattering them uniformly")
+    parser.add_argument("--scenario-cache", default=None, metavar="DIR",
+                        help="Keep generated procedural scenarios here and load them again on reruns")
+    parser.add_argument("--time", type=int, default=None,
+                        help="Simulation time to run for, 300 or the replayed run's by default")
+    parser.add_argument("--policy", choices=("llm", "heuristic", "stub"), default="heuristic",
+                        help="Who decides the drone moves")
+    parser.add_argument("--seed", type=int, default=None, help="Seed, a random one is picked and reported if omitted")
+    parser.add_argument("--video", default=None, metavar="PATH",
+                        help="Also stream the run to a video file through ffmpeg")
+    parser.add_argument("--downsample", type=int, default=1, help="Keep every n-th cell in the video")
+    parser.add_argument("--profile", action="store_true", help="Time every tick phase and print percentiles")
+    parser.add_argument("--profile-ticks", type=int, nargs="+", default=[], metavar="TICK",
+                        help="Also capture these ticks with cProfile, implies --profile")
+    parser.add_argument("--profile-dir", default="profiles", help="Where the cProfile captures are written")
+    parser.add_argument("--log-level", default="WARNING", choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                        help="Lowest level of the simulation events written to stderr")
+    parser.add_argument("--log-file", default=None, help="Write the simulation events to this file instead")
+    parser.add_argument("--record-actions", default=None, metavar="PATH",
+                        help="Log every drone decision to this file, for --replay")
+    parser.add_argument("--replay", default=None, metavar="PATH",
+                        help="Rerun a recorded run from its action log without model calls, the run parameters "
+                             "come from the log")
+    parser.add_argument("--replay-until", type=int, default=None, metavar="TICK",
+                        help="Only replay decisions before this tick, the drones' policy takes over from there")
+    parser.add_argument("--results", default=None, metavar="TARGET",
+                        help="Store per-tick, per-drone and run metrics in a SQLite file, or mysql://DATABASE")
+    parser.add_argument("--parquet", default=None, metavar="DIR",
+                        help="Stream positions, actions, pheromones and KPIs of every tick to Parquet datasets")
+    parser.add_argument("--tiles", type=int, nargs=2, default=None, metavar=("X", "Y"),
+                        help="Split the map into X x Y tiles, each simulated by a process of its own")
+    parser.add_argument("--transport", choices=("pipe", "socket"), default="pipe",
+                        help="How tile processes exchange their halos, 'socket' goes through TCP on localhost")
+    parser.add_argument("--json", action="store_true", help="Print the summary as a JSON line")
+    return parser
+
+
+def run(args: argparse.Namespace) -> dict:
+    """
+    Runs one simulation as described by the parsed arguments and returns its summary.
+    With profiling the summary also holds the per-phase timings under 'phases' and the cProfile files under
+    'captures'.
+    """
+    try:
+        from idk_some_code.main import PhaseProfiler, replay_simulation, simulate_disaster_response
+    except ImportError:
+        from main import PhaseProfiler, replay_simulation, simulate_disaster_response
+
+    if args.tiles is not None:
+        try:
+            from idk_some_code.distributed import simulate_distributed
+        except ImportError:
+            from distributed import simulate_distributed
+        return simulate_distributed(tuple(args.grid), args.drones, args.victims,
+                                    args.time if args.time is not None else 300, args.policy, args.seed,
+                                    tiles=tuple(args.tiles), num_mountains=args.mountains,
+                                    num_buildings=args.buildings, transport=args.transport)
+
+    profiler = None
+    if args.profile or args.profile_ticks:
+        profiler = PhaseProfiler(args.profile_ticks, args.profile_dir)
+    results_store = None
+    if args.results is not None:
+        try:
+            from idk_some_code.results_store import open_results_store
+        except ImportError:
+            from results_store import open_results_store
+        results_store = open_results_store(args.results)
+    exporter = None
+    if args.parquet is not None:
+        try:
+            from idk_some_code.parquet_export import ParquetExporter
+        except ImportError:
+            from parquet_export import ParquetExporter
+        exporter = ParquetExporter(args.parquet)
+    scenario_cache = None
+    if args.scenario_cache is not None:
+        try:
+            from idk_some_code.scenario_cache import ScenarioCache
+        except ImportError:
+            from scenario_cache import ScenarioCache
+        scenario_cache = ScenarioCache(args.scenario_cache)
+    try:
+        if args.replay is not None:
+            summary = replay_simulation(args.replay, args.replay_until, args.time, video_path=args.video,
+                                        downsample=args.downsample, profiler=profiler, results_store=results_store,
+                                        exporter=exporter, scenario_cache=scenario_cache)
+        else:
+            summary = simulate_disaster_response(tuple(args.grid), args.drones, args.victims,
+                                                 args.time if args.time is not None else 300, args.policy, args.seed,
+                                                 video_path=args.video, downsample=args.downsample,
+                                                 profiler=profiler, record_actions=args.record_actions,
+                                                 results_store=results_store, exporter=exporter,
+                                                 num_mountains=args.mountains, num_buildings=args.buildings,
+                                                 scenario=args.scenario, scenario_cache=scenario_cache)
+    finally:
+        if results_store is not None:
+            results_store.close()
+        if exporter is not None:
+            # Already closed by the run unless it failed before starting
+            exporter.close()
+    if profiler is not None:
+        summary["phases"] = profiler.summary()
+        summary["captures"] = profiler.captures
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.replay is not None and args.record_actions is not None:
+        parser.error("--record-actions can't be combined with --replay")
+    if args.tiles is not None and any((args.video, args.profile, args.profile_ticks, args.record_actions,
+                                       args.replay, args.results, args.parquet)):
+        parser.error("--tiles runs its own tick loop in every tile process, it can't be combined with videos, "
+                     "profiling, action logs or stored results")
+    if args.tiles is not None and args.scenario != "random":
+        parser.error("--tiles only supports the random scenario")
+    if args.replay is not None and (args.scenario != "random" or args.mountains or args.buildings):
+        parser.error("A replayed run takes its scenario from the action log")
+    try:
+        from idk_some_code.event_log import configure_logging, shutdown_logging
+    except ImportError:
+        from event_log import configure_logging, shutdown_logging
+    configure_logging(getattr(logging, args.log_level), path=args.log_file)
+    started = time.perf_counter()
+    summary = run(args)
+    summary["wall_time"] = round(time.perf_counter() - started, 3)
+    shutdown_logging()
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        phases = summary.pop("phases", None)
+        for key, value in summary.items():
+            print(f"{key}: {value}")
+        if phases is not None:
+            try:
+                from idk_some_code.profiler import format_summary
+            except ImportError:
+                from profiler import format_summary
+            print(format_summary(phases))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
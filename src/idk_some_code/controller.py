@@ -0,0 +1,133 @@
+# controller.py
+from typing import Optional, Set, Tuple
+
+# Offsets of the 8 perception directions, same layout as Drone.update_perceptions
+PERCEPTION_OFFSETS = {
+    "N": (0, -1), "NE": (1, -1), "E": (1, 0), "SE": (1, 1),
+    "S": (0, 1), "SW": (-1, 1), "W": (-1, 0), "NW": (-1, -1)
+}
+
+
+class EventDrivenController:
+    """
+    Decides when a drone has to consult the LLM.
+    The model is only called when something meaningful changed around the drone, every other tick the drone
+    keeps following the last intent the model gave it (a cheap local policy).
+    """
+
+    TRIGGER_INITIAL = "initial"
+    TRIGGER_NEW_VICTIM = "new_victim"
+    TRIGGER_NEED_HELP_CHANGED = "need_help_changed"
+    TRIGGER_BLOCKED = "blocked"
+    TRIGGER_STALE_PLAN = "stale_plan"
+    TRIGGER_ARRIVED = "arrived"
+
+    INTENT_GO_TO = "go_to"  # Follow the drone's planned path, see Drone.go_to
+    INTENT_FOLLOW_NEED_HELP = "follow_need_help"  # Descend the grid's shared 'Need Help' flow field
+
+    def __init__(self, need_help_radius: int = 10, max_plan_age: int = 15) -> None:
+        """
+        :param need_help_radius: Radius in which appearing/disappearing 'Need Help' pheromones are a trigger
+        :param max_plan_age: Number of local ticks after which the last intent is considered stale
+        """
+        self.need_help_radius = need_help_radius
+        self.max_plan_age = max_plan_age
+        self.last_intent: Optional[str] = None  # None means hold position
+        self.plan_age = 0
+        self.blocked = False
+        self.has_plan = False
+        self.arrived = False
+        self.known_victims: Set[Tuple[int, int]] = set()
+        self.known_need_help: Set[Tuple[int, int]] = set()
+        self.last_trigger: Optional[str] = None
+        self.llm_calls = 0
+        self.local_steps = 0
+
+    def check_triggers(self, drone) -> Optional[str]:
+        """
+        Compares what the drone sees now with what it saw at the last check.
+        Expects drone.update_perceptions() and drone.perception.update() to have been called this tick.
+        :param drone: The drone being controlled
+        :return: The name of the trigger that fired, or None if the local policy can keep going
+        """
+        x, y = drone.position
+        victims = set()
+        for direction, (dx, dy) in PERCEPTION_OFFSETS.items():
+            perception = drone.perceptions.get(direction)
+            if perception and perception.get('victim'):
+                victims.add((x + dx, y + dy))
+        need_help = drone.perception.cells_with("need_help", self.need_help_radius)
+
+        new_victims = victims - self.known_victims
+        need_help_changed = need_help != self.known_need_help
+        self.known_victims = victims
+        self.known_need_help = need_help
+
+        if not self.has_plan:
+            return self.TRIGGER_INITIAL
+        if new_victims:
+            return self.TRIGGER_NEW_VICTIM
+        if need_help_changed:
+            return self.TRIGGER_NEED_HELP_CHANGED
+        if self.blocked:
+            return self.TRIGGER_BLOCKED
+        if self.arrived:
+            return self.TRIGGER_ARRIVED
+        if self.plan_age >= self.max_plan_age:
+            return self.TRIGGER_STALE_PLAN
+        return None
+
+    def continue_intent(self, drone) -> bool:
+        """
+        Local policy: keep following the path to the destination the model picked, repeat the last move it chose,
+        or hold position if it chose not to move.
+        A planned path is the plan itself, so following it does not age the plan, arriving is a trigger instead.
+        :param drone: The drone being controlled
+        :return: False if the intent could not be followed (the drone is blocked), True otherwise
+        """
+        if self.last_intent == self.INTENT_GO_TO:
+            if not drone.follow_path():
+                self.blocked = True
+                return False
+            if drone.destination is None:
+                self.arrived = True
+                self.last_intent = None
+            self.local_steps += 1
+            return True
+        if self.last_intent == self.INTENT_FOLLOW_NEED_HELP:
+            moved = drone.follow_need_help()
+            if moved is None:
+                self.arrived = True  # Reached the call for help, or there's nothing left to respond to
+                self.last_intent = None
+            elif not moved:
+                self.blocked = True
+                return False
+            self.local_steps += 1
+            return True
+        if self.last_intent is not None:
+            if not drone.can_move(self.last_intent):
+                self.blocked = True
+                return False
+            drone.move(self.last_intent)
+        self.plan_age += 1
+        self.local_steps += 1
+        return True
+
+    def start_consultation(self, trigger: str) -> None:
+        """Resets the plan before the model is asked, the tools it calls will record the new intent."""
+        self.last_trigger = trigger
+        self.last_intent = None
+        self.blocked = False
+        self.arrived = False
+        self.plan_age = 0
+        self.has_plan = True
+        self.llm_calls += 1
+
+    def record_intent(self, direction: str) -> None:
+        """Called when the model successfully moved the drone in a direction, or picked a destination."""
+        self.last_intent = direction
+        self.blocked = False
+
+    def record_blocked(self) -> None:
+        """Called when the model tried to move into an impassable cell."""
+        self.blocked = True
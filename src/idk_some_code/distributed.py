@@ -0,0 +1,581 @@
+# distributed.py
+"""
+Spatially partitioned simulation: the map is cut into tiles, each owned by a worker process stepping the drones
+flying over it.
+
+    summary = simulate_distributed((2000, 2000), 10000, 20000, 1000, "heuristic", tiles=(4, 2), seed=1)
+
+Every worker builds the whole scenario from the seed, so static terrain is never sent anywhere. After each tick a
+worker trades one halo message with each of its (up to 8) neighbouring tiles, holding
+- the drones that flew into the neighbour's tile, with their whole state and next decision time
+- its own cells within `halo` cells of the neighbour's tile that changed, state and pheromones, so the neighbour's
+  drones perceive across the edge
+- what its drones did on the neighbour's cells during the tick (pheromones emitted, victims rescued), merged by the
+  owner
+
+A worker only keeps its tile and halo current, further away its copy of the map goes stale: frontier targets and
+'Need Help' trails beyond the halo are unknown to its drones. Runs are reproducible for a given seed and tiling, but
+don't match a single process run of the same seed.
+
+Workers on one machine talk over multiprocessing Pipes. Across nodes every tile gets a HOST:PORT and neighbours
+connect over TCP, start the tiles of each node with the same arguments everywhere
+
+    python -m idk_some_code.distributed node --tiles 2 2 --peers a:7000 a:7001 b:7000 b:7001 --own 2 3 \\
+        --grid 4000 4000 --drones 20000 --victims 50000 --time 1000 --seed 1 > b.json
+
+and combine the reports with
+
+    python -m idk_some_code.distributed merge a.json b.json
+"""
+import argparse
+import bisect
+import json
+import multiprocessing
+import pickle
+import socket
+import struct
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from idk_some_code.drone import Drone
+    from idk_some_code.grid import TERRAIN_OPEN, Grid
+    from idk_some_code.random_streams import SimulationRandom
+    from idk_some_code.scenario import build_scenario, sample_free_cells
+    from idk_some_code.scheduler import EventScheduler
+    from idk_some_code.swarm import SwarmIndex
+except ImportError:
+    from drone import Drone
+    from grid import TERRAIN_OPEN, Grid
+    from random_streams import SimulationRandom
+    from scenario import build_scenario, sample_free_cells
+    from scheduler import EventScheduler
+    from swarm import SwarmIndex
+
+HALO = 10  # Radius of the drones' perception window
+STARTS = ("spread", "center")
+TRANSPORTS = ("pipe", "socket")
+# Drone slots tied to the process the drone flies in, rebuilt by the worker receiving it
+_LOCAL_SLOTS = ("grid", "swarm", "_perception", "action_log")
+
+
+class TileLayout:
+    """How a width x height map is cut into tiles_x x tiles_y tiles, numbered row major."""
+
+    def __init__(self, width: int, height: int, tiles_x: int, tiles_y: int, halo: int = HALO) -> None:
+        """
+        :param halo: Cells around a tile its workers keep current, at least the drones' perception radius
+        """
+        if tiles_x < 1 or tiles_y < 1:
+            raise ValueError(f"Can't cut a map into {tiles_x} x {tiles_y} tiles")
+        self.width = width
+        self.height = height
+        self.tiles_x = tiles_x
+        self.tiles_y = tiles_y
+        self.halo = halo
+        self.x_edges = [column * width // tiles_x for column in range(tiles_x + 1)]
+        self.y_edges = [row * height // tiles_y for row in range(tiles_y + 1)]
+        narrowest = min(end - begin for edges in (self.x_edges, self.y_edges) for begin, end in zip(edges, edges[1:]))
+        if narrowest < max(halo, 1):
+            raise ValueError(f"Tiles would be {narrowest} cells across, they need at least the halo width ({halo}) "
+                             f"so halos only reach direct neighbours")
+
+    def __len__(self) -> int:
+        return self.tiles_x * self.tiles_y
+
+    def bounds(self, tile: int) -> Tuple[int, int, int, int]:
+        """(x0, y0, x1, y1) of a tile, x1 and y1 exclusive."""
+        column, row = tile % self.tiles_x, tile // self.tiles_x
+        return self.x_edges[column], self.y_edges[row], self.x_edges[column + 1], self.y_edges[row + 1]
+
+    def halo_bounds(self, tile: int) -> Tuple[int, int, int, int]:
+        """Bounds of a tile grown by the halo and clipped to the map, the cells its drones can perceive."""
+        x0, y0, x1, y1 = self.bounds(tile)
+        return (max(x0 - self.halo, 0), max(y0 - self.halo, 0),
+                min(x1 + self.halo, self.width), min(y1 + self.halo, self.height))
+
+    def owner(self, x: int, y: int) -> int:
+        """The tile a cell belongs to."""
+        return ((bisect.bisect_right(self.y_edges, y) - 1) * self.tiles_x
+                + bisect.bisect_right(self.x_edges, x) - 1)
+
+    def neighbours(self, tile: int) -> List[int]:
+        """The tiles touching a tile, corners included, in ascending order."""
+        column, row = tile % self.tiles_x, tile // self.tiles_x
+        return [other_row * self.tiles_x + other_column
+                for other_row in range(max(row - 1, 0), min(row + 2, self.tiles_y))
+                for other_column in range(max(column - 1, 0), min(column + 2, self.tiles_x))
+                if (other_column, other_row) != (column, row)]
+
+
+def pack_drone(drone: Drone) -> Dict:
+    """The state of a drone leaving its worker, everything but its ties to the grid and swarm it flew in."""
+    return {slot: getattr(drone, slot) for slot in Drone.__slots__ if slot not in _LOCAL_SLOTS}
+
+
+def unpack_drone(state: Dict, grid: Grid, swarm: SwarmIndex) -> Drone:
+    """Rebuilds a drone packed by pack_drone on the receiving worker's grid, its perception window starts over."""
+    drone = Drone.__new__(Drone)
+    for slot, value in state.items():
+        setattr(drone, slot, value)
+    drone.grid = grid
+    drone.swarm = swarm
+    drone._perception = None
+    drone.action_log = None
+    swarm.register(drone)
+    return drone
+
+
+def merge_cell(grid: Grid, x: int, y: int, value: int, explored: bool) -> None:
+    """
+    Merges the state of a cell as another worker saw it. Cells only ever move forward (victims get rescued,
+    buildings searched), so the most advanced state wins in whatever order the updates arrive.
+    """
+    if value == 3 and grid.grid[y, x] != 3:
+        grid.add_safe_zone(x, y)
+    if explored and not grid.building_explored[y, x]:
+        grid.explore_cell(x, y)
+
+
+class TileWorker:
+    """
+    Simulates one tile: the drones over it, on a full size grid of which only the tile and its halo are kept current.
+    Call tick, deliver each message to the neighbour it is addressed to and hand what they sent back to apply.
+    """
+
+    def __init__(self, layout: TileLayout, tile: int, num_drones: int, num_victims: int, policy: str = "heuristic",
+                 seed: int = 0, num_mountains: int = 0, num_buildings: int = 0, start: str = "spread",
+                 decay_rate: float = 100) -> None:
+        """
+        :param layout: How the map is tiled
+        :param tile: The tile simulated here
+        :param num_drones: Number of drones of the whole run, only those starting on this tile are created
+        :param num_victims: Number of victims on the whole map
+        :param seed: Seed of the run, must be the same on every worker
+        :param start: 'spread' starts the drones on random free cells, 'center' all in the middle of the map like
+                      simulate_disaster_response
+        :param decay_rate: Pheromone decay rate
+        """
+        if start not in STARTS:
+            raise ValueError(f"Unknown start '{start}', expected one of {STARTS}")
+        self.layout = layout
+        self.tile = tile
+        self.bounds = layout.bounds(tile)
+        self.neighbours = layout.neighbours(tile)
+        # Which part of this tile every neighbour perceives
+        self._readers = {neighbour: layout.halo_bounds(neighbour) for neighbour in self.neighbours}
+        streams = SimulationRandom(seed)
+        self.seed = streams.seed
+        grid = self.grid = Grid(layout.width, layout.height)
+        center = (grid.width // 2, grid.height // 2)
+        build_scenario(grid, num_mountains, num_buildings, 0, streams.generator("obstacles"), keep_clear=(*center, 0))
+        build_scenario(grid, 0, 0, num_victims, streams.generator("victims"))
+        if start == "center":
+            positions = [center] * num_drones
+        else:
+            cells = sample_free_cells(grid.terrain == TERRAIN_OPEN, num_drones, streams.generator("start_positions"))
+            positions = [(cell % grid.width, cell // grid.width) for cell in np.resize(cells, num_drones).tolist()]
+        self.swarm = SwarmIndex()
+        self.drones: Dict[int, Drone] = {}
+        for index, (position, rng) in enumerate(zip(positions, streams.drone_streams(num_drones))):
+            if layout.owner(*position) == tile:
+                self.drones[index] = Drone(grid, position, policy=policy, swarm=self.swarm, rng=rng, drone_id=index)
+        self.scheduler = EventScheduler(grid, decay_rate)
+        for drone in self.drones.values():
+            self.scheduler.schedule(drone.start_time, drone)
+        x0, y0, x1, y1 = self.bounds
+        self.victims = int(np.count_nonzero(grid.grid[y0:y1, x0:x1] == 2))
+        self.explored_cells = 0
+        self.ticks = 0
+        self.drones_sent = 0
+        self.drones_received = 0
+        self._emitted: List[Tuple[int, int, Dict]] = []  # Pheromones the drones emitted on other tiles this tick
+        # The emissions sent with the last outgoing. The owners only send them back a tick later, until then apply
+        # keeps them on top of the owners' copies of the cells
+        self._in_flight: List[Tuple[int, int, Dict]] = []
+        self._synced = grid.version  # Changes up to this version were sent to the neighbours
+        self._tick_version = grid.version  # Changes after this version were made by the drones of this tile
+        grid.on_pheromone = self._on_pheromone
+
+    def tick(self, tick: int) -> Dict[int, bytes]:
+        """
+        Steps the tile's drones through one tick.
+        :param tick: The tick, drones due before tick + 1 act
+        :return: The pickled halo message of every neighbour, see outgoing
+        """
+        explored_before = self.grid.explored_cells
+        self.scheduler.run_until(tick + 1)
+        self.explored_cells += self.grid.explored_cells - explored_before
+        self.ticks += 1
+        return self.outgoing()
+
+    def outgoing(self) -> Dict[int, bytes]:
+        """
+        Hands the drones that left the tile over and collects the changes the neighbours need to hear about.
+        :return: The pickled halo message of every neighbour
+        """
+        grid, layout = self.grid, self.layout
+        messages = {neighbour: {"drones": [], "cells": [], "writes": [], "pheromones": []}
+                    for neighbour in self.neighbours}
+        x0, y0, x1, y1 = self.bounds
+        leaving = [drone for drone in self.drones.values()
+                   if not (x0 <= drone.position[0] < x1 and y0 <= drone.position[1] < y1)]
+        for next_time, drone in self.scheduler.unschedule(leaving):
+            owner = layout.owner(*drone.position)
+            if owner not in messages:
+                raise RuntimeError(f"Drone {drone.drone_id} jumped from tile {self.tile} to tile {owner}, "
+                                   f"which isn't a neighbour")
+            messages[owner]["drones"].append((next_time, pack_drone(drone)))
+            self.swarm.unregister(drone)
+            del self.drones[drone.drone_id]
+            self.drones_sent += 1
+
+        # Only the tile and its halo can have changed, the rest of the map is never looked at
+        hx0, hy0, hx1, hy1 = layout.halo_bounds(self.tile)
+        versions = grid.cell_versions[hy0:hy1, hx0:hx1]
+        rows, columns = np.nonzero(versions > self._synced)
+        recent = versions[rows, columns] > self._tick_version
+        xs, ys = columns + hx0, rows + hy0
+        own = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+        halo = layout.halo
+        interior = (xs >= x0 + halo) & (xs < x1 - halo) & (ys >= y0 + halo) & (ys < y1 - halo)
+        edge = own & ~interior
+        for x, y in zip(xs[edge].tolist(), ys[edge].tolist()):
+            state = (x, y, int(grid.grid[y, x]), bool(grid.building_explored[y, x]),
+                     [dict(pheromone) for pheromone in grid.get_pheromones(x, y)])
+            for neighbour, (rx0, ry0, rx1, ry1) in self._readers.items():
+                if rx0 <= x < rx1 and ry0 <= y < ry1:
+                    messages[neighbour]["cells"].append(state)
+        foreign = ~own & recent
+        for x, y in zip(xs[foreign].tolist(), ys[foreign].tolist()):
+            messages[layout.owner(x, y)]["writes"].append((x, y, int(grid.grid[y, x]),
+                                                           bool(grid.building_explored[y, x])))
+        for x, y, pheromone in self._emitted:
+            messages[layout.owner(x, y)]["pheromones"].append((x, y, dict(pheromone)))
+        self._in_flight, self._emitted = self._emitted, []
+        self._synced = grid.version
+        return {neighbour: pickle.dumps(message, pickle.HIGHEST_PROTOCOL) for neighbour, message in messages.items()}
+
+    def apply(self, messages: Dict[int, bytes]) -> None:
+        """
+        Merges the halo messages of the neighbours: their edge cells replace the copies held here, what their drones
+        did on this tile is added and the drones they handed over join the scheduler at their next decision time.
+        The owners' copies predate the pheromones this tile's drones just emitted on them, those are kept on top,
+        in the order the owners append them.
+        """
+        grid = self.grid
+        in_flight: Dict[Tuple[int, int], List[Dict]] = {}
+        for x, y, pheromone in self._in_flight:
+            in_flight.setdefault((x, y), []).append(pheromone)
+        self._in_flight = []
+        for neighbour in sorted(messages):
+            message = pickle.loads(messages[neighbour])
+            for x, y, value, explored, pheromones in message["cells"]:
+                merge_cell(grid, x, y, value, explored)
+                grid.set_pheromones(x, y, pheromones + in_flight.get((x, y), []))
+            for x, y, value, explored in message["writes"]:
+                merge_cell(grid, x, y, value, explored)
+            for x, y, pheromone in message["pheromones"]:
+                grid.add_pheromone(x, y, pheromone['type'], pheromone['message'], pheromone['timestamp'],
+                                   pheromone['intensity'])
+            for next_time, state in message["drones"]:
+                drone = unpack_drone(state, grid, self.swarm)
+                self.drones[drone.drone_id] = drone
+                self.scheduler.schedule(next_time, drone)
+                self.drones_received += 1
+        self._tick_version = grid.version
+
+    def report(self) -> Dict:
+        """What the tile contributes to the summary of the run, see merge_reports."""
+        x0, y0, x1, y1 = self.bounds
+        return {"tile": self.tile, "tiles": len(self.layout), "width": self.layout.width,
+                "height": self.layout.height, "seed": self.seed, "ticks": self.ticks, "victims": self.victims,
+                "victims_left": int(np.count_nonzero(self.grid.grid[y0:y1, x0:x1] == 2)),
+                "explored_cells": self.explored_cells, "decisions": self.scheduler.decisions,
+                "drones": len(self.drones), "drones_sent": self.drones_sent, "drones_received": self.drones_received}
+
+    def _on_pheromone(self, x: int, y: int, pheromone_type: str, intensity: float) -> None:
+        x0, y0, x1, y1 = self.bounds
+        if not (x0 <= x < x1 and y0 <= y < y1):
+            # Sent once the tick is over, by then it decayed like the owner's copy will have
+            self._emitted.append((x, y, self.grid.pheromones[(x, y)][-1]))
+
+
+def merge_reports(reports: List[Dict]) -> Dict:
+    """
+    Combines the reports of every tile into a summary with the keys of simulate_disaster_response's,
+    plus the number of tiles and drones. explored_cells counts explorations like there, coverage can exceed 1.
+    """
+    first = reports[0]
+    missing = set(range(first["tiles"])) - {report["tile"] for report in reports}
+    if missing:
+        raise ValueError(f"No report of tiles {sorted(missing)}")
+    victims = sum(report["victims"] for report in reports)
+    explored_cells = sum(report["explored_cells"] for report in reports)
+    return {"seed": first["seed"], "victims": victims,
+            "victims_rescued": victims - sum(report["victims_left"] for report in reports),
+            "explored_cells": explored_cells, "coverage": explored_cells / (first["width"] * first["height"]),
+            "ticks": first["ticks"], "decisions": sum(report["decisions"] for report in reports),
+            "tiles": first["tiles"], "drones": sum(report["drones"] for report in reports)}
+
+
+class SocketChannel:
+    """A TCP connection to a neighbouring worker, with the send_bytes / recv_bytes of a multiprocessing Connection."""
+
+    _HEADER = struct.Struct("<Q")
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        if sock.family in (socket.AF_INET, socket.AF_INET6):
+            # Halo messages are latency bound, one per neighbour and tick
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def send_bytes(self, data: bytes) -> None:
+        self.sock.sendall(self._HEADER.pack(len(data)) + data)
+
+    def recv_bytes(self) -> bytearray:
+        size, = self._HEADER.unpack(self.recv_exactly(self._HEADER.size))
+        return self.recv_exactly(size)
+
+    def recv_exactly(self, size: int) -> bytearray:
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        received = 0
+        while received < size:
+            count = self.sock.recv_into(view[received:])
+            if count == 0:
+                raise EOFError("The neighbouring worker hung up")
+            received += count
+        return buffer
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def connect_peers(layout: TileLayout, tile: int, addresses: List[Tuple[str, int]],
+                  timeout: float = 60) -> Dict[int, SocketChannel]:
+    """
+    Opens a TCP channel to every neighbour of a tile. The tile listens on the port of its address, connects to the
+    neighbours numbered above it and accepts the ones below.
+    :param addresses: (host, port) of every tile
+    :param timeout: Seconds to wait for the neighbours to come up
+    :return: The channel of every neighbour
+    """
+    deadline = time.monotonic() + timeout
+    neighbours = layout.neighbours(tile)
+    channels: Dict[int, SocketChannel] = {}
+    with socket.create_server(("", addresses[tile][1])) as listener:
+        for neighbour in neighbours:
+            if neighbour < tile:
+                continue
+            while True:
+                try:
+                    sock = socket.create_connection(addresses[neighbour], timeout=1)
+                    break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Tile {neighbour} at {addresses[neighbour]} never came up")
+                    time.sleep(0.05)
+            sock.settimeout(None)
+            sock.sendall(struct.pack("<I", tile))
+            channels[neighbour] = SocketChannel(sock)
+        while len(channels) < len(neighbours):
+            listener.settimeout(max(deadline - time.monotonic(), 0.001))
+            sock, _ = listener.accept()
+            sock.settimeout(None)
+            channel = SocketChannel(sock)
+            peer, = struct.unpack("<I", channel.recv_exactly(4))
+            if peer not in neighbours or peer > tile:
+                channel.close()
+                raise ValueError(f"Tile {peer} connected to tile {tile}, which isn't expecting it")
+            channels[peer] = channel
+    return channels
+
+
+def exchange(channels: Dict, outgoing: Dict[int, bytes], pool: ThreadPoolExecutor) -> Dict[int, bytes]:
+    """
+    Sends every neighbour its message and receives theirs. Sends run on the pool so two workers sending each other
+    large messages at the same time can't both block on a full pipe.
+    :param channels: Pipe end or SocketChannel of every neighbour
+    """
+    sends = [pool.submit(channels[neighbour].send_bytes, outgoing[neighbour]) for neighbour in channels]
+    received = {neighbour: channels[neighbour].recv_bytes() for neighbour in sorted(channels)}
+    for send in sends:
+        send.result()
+    return received
+
+
+def run_tile(layout: TileLayout, tile: int, simulation_time: int, scenario: Dict, channels: Dict) -> Dict:
+    """
+    Runs one tile through the whole simulation, exchanging halos with its neighbours after every tick.
+    :param scenario: TileWorker arguments, identical on every tile
+    :param channels: Pipe end or SocketChannel of every neighbour, closed at the end
+    :return: The tile's report
+    """
+    started = time.perf_counter()
+    try:
+        worker = TileWorker(layout, tile, **scenario)
+        with ThreadPoolExecutor(max_workers=max(len(channels), 1), thread_name_prefix="halo") as pool:
+            for tick in range(simulation_time):
+                worker.apply(exchange(channels, worker.tick(tick), pool))
+    finally:
+        # Neighbours still waiting on this tile get an EOFError instead of hanging
+        for channel in channels.values():
+            channel.close()
+    report = worker.report()
+    report["wall_time"] = time.perf_counter() - started
+    return report
+
+
+def _tile_process(layout: TileLayout, tile: int, simulation_time: int, scenario: Dict, channels: Dict,
+                  results, addresses: Optional[List[Tuple[str, int]]]) -> None:
+    try:
+        if addresses is not None:
+            channels = connect_peers(layout, tile, addresses)
+        results.send(("ok", run_tile(layout, tile, simulation_time, scenario, channels)))
+    except BaseException:
+        results.send(("error", f"tile {tile}: {traceback.format_exc()}"))
+    finally:
+        results.close()
+
+
+def run_tiles(layout: TileLayout, tiles: List[int], simulation_time: int, scenario: Dict,
+              channels: Optional[Dict[int, Dict]] = None,
+              addresses: Optional[List[Tuple[str, int]]] = None) -> List[Dict]:
+    """
+    Runs tiles in processes of their own and waits for their reports.
+    :param channels: Pipe ends of every tile, by neighbour
+    :param addresses: Or the (host, port) of every tile, to connect over TCP
+    :return: The report of every tile
+    """
+    context = multiprocessing.get_context("spawn")
+    processes, results = [], []
+    for tile in tiles:
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_tile_process, name=f"tile-{tile}", daemon=True,
+                                  args=(layout, tile, simulation_time, scenario,
+                                        channels[tile] if channels is not None else {}, sender, addresses))
+        process.start()
+        sender.close()
+        processes.append(process)
+        results.append(receiver)
+    # Only the tile processes may hold the pipe ends, a dead neighbour must show up as an EOFError
+    for ends in (channels or {}).values():
+        for end in ends.values():
+            end.close()
+    outcomes = []
+    for tile, receiver in zip(tiles, results):
+        try:
+            outcomes.append(receiver.recv())
+        except EOFError:
+            outcomes.append(("error", f"tile {tile} died without a report"))
+    for process in processes:
+        process.join()
+    errors = [outcome for status, outcome in outcomes if status == "error"]
+    if errors:
+        raise RuntimeError("Distributed run failed\n" + "\n".join(errors))
+    return [outcome for _, outcome in outcomes]
+
+
+def _free_ports(count: int, host: str) -> List[int]:
+    sockets = [socket.create_server((host, 0)) for _ in range(count)]
+    ports = [sock.getsockname()[1] for sock in sockets]
+    for sock in sockets:
+        sock.close()
+    return ports
+
+
+def simulate_distributed(grid_size: Tuple[int, int], num_drones: int, num_victims: int, simulation_time: int,
+                         policy: str = "heuristic", seed: Optional[int] = None, tiles: Tuple[int, int] = (2, 2),
+                         num_mountains: int = 0, num_buildings: int = 0, halo: int = HALO, start: str = "spread",
+                         transport: str = "pipe") -> Dict:
+    """
+    Runs a whole simulation with one worker process per tile on this machine.
+    :param grid_size: Size of the grid (width, height)
+    :param num_drones: Number of drones
+    :param num_victims: Number of victims to place
+    :param simulation_time: Number of ticks to run for
+    :param policy: Drone policy, 'llm', 'heuristic' or 'stub'
+    :param seed: Seed of the run, a random one is picked (and returned) if omitted
+    :param tiles: Number of tiles along x and y
+    :param num_mountains: Number of mountains to place
+    :param num_buildings: Number of collapsed buildings to place
+    :param halo: Cells around its tile a worker keeps current
+    :param start: 'spread' drones over the map or start them all in the 'center'
+    :param transport: 'pipe', or 'socket' to go through TCP on localhost like separate nodes would
+    :return: Summary of the run, see merge_reports
+    """
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport '{transport}', expected one of {TRANSPORTS}")
+    layout = TileLayout(*grid_size, *tiles, halo=halo)
+    scenario = {"num_drones": num_drones, "num_victims": num_victims, "policy": policy,
+                "seed": SimulationRandom(seed).seed, "num_mountains": num_mountains, "num_buildings": num_buildings,
+                "start": start}
+    all_tiles = list(range(len(layout)))
+    if transport == "socket":
+        addresses = [("127.0.0.1", port) for port in _free_ports(len(layout), "127.0.0.1")]
+        return merge_reports(run_tiles(layout, all_tiles, simulation_time, scenario, addresses=addresses))
+    context = multiprocessing.get_context("spawn")
+    channels: Dict[int, Dict] = {tile: {} for tile in all_tiles}
+    for tile in all_tiles:
+        for neighbour in layout.neighbours(tile):
+            if neighbour > tile:
+                channels[tile][neighbour], channels[neighbour][tile] = context.Pipe()
+    return merge_reports(run_tiles(layout, all_tiles, simulation_time, scenario, channels=channels))
+
+
+def _address(value: str) -> Tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    return host, int(port)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run tiles of a multi-node simulation, or merge their reports.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    node = commands.add_parser("node", help="Run some tiles on this node and print their reports as JSON")
+    node.add_argument("--tiles", type=int, nargs=2, required=True, metavar=("X", "Y"), help="Tiles along x and y")
+    node.add_argument("--peers", type=_address, nargs="+", required=True, metavar="HOST:PORT",
+                      help="Address of every tile, row major")
+    node.add_argument("--own", type=int, nargs="+", required=True, metavar="TILE", help="The tiles run on this node")
+    node.add_argument("--grid", type=int, nargs=2, default=(100, 100), metavar=("WIDTH", "HEIGHT"), help="Grid size")
+    node.add_argument("--drones", type=int, default=4, help="Number of drones")
+    node.add_argument("--victims", type=int, default=300, help="Number of victims")
+    node.add_argument("--mountains", type=int, default=0, help="Number of mountains")
+    node.add_argument("--buildings", type=int, default=0, help="Number of collapsed buildings")
+    node.add_argument("--time", type=int, default=300, help="Simulation time to run for")
+    node.add_argument("--policy", choices=("llm", "heuristic", "stub"), default="heuristic",
+                      help="Who decides the drone moves")
+    node.add_argument("--seed", type=int, required=True, help="Seed, every node must use the same")
+    node.add_argument("--halo", type=int, default=HALO, help="Cells around its tile a worker keeps current")
+    node.add_argument("--start", choices=STARTS, default="spread", help="Where the drones start")
+    merge = commands.add_parser("merge", help="Combine the reports of every node into the summary of the run")
+    merge.add_argument("reports", nargs="+", help="JSON reports printed by 'node'")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "merge":
+        reports = []
+        for path in args.reports:
+            with open(path) as file:
+                reports.extend(json.load(file))
+        print(json.dumps(merge_reports(reports)))
+        return 0
+    layout = TileLayout(*args.grid, *args.tiles, halo=args.halo)
+    if len(args.peers) != len(layout):
+        parser.error(f"{len(layout)} tiles need {len(layout)} peers, got {len(args.peers)}")
+    scenario = {"num_drones": args.drones, "num_victims": args.victims, "policy": args.policy, "seed": args.seed,
+                "num_mountains": args.mountains, "num_buildings": args.buildings, "start": args.start}
+    print(json.dumps(run_tiles(layout, args.own, args.time, scenario, addresses=args.peers)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
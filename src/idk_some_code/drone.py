@@ -1,40 +1,123 @@
 # drone.py
+import logging
 import os
 import time
 from collections import deque
 
 import numpy as np
 from typing import Tuple, Dict, Any, Optional
-from crewai import Agent, Task, Crew, Process
 
-
-
-from global_code.singleton import State
 try:
     from idk_some_code.grid import Grid
 except ImportError:
     from grid import Grid
-from langchain_anthropic import ChatAnthropic
-os.environ["ANTHROPIC_API_KEY"] = State.config["ANTHROPIC_API_KEY"]
-os.environ["OPENAI_API_KEY"] = State.config["OPENAI_API_KEY"]
-os.environ["OPENAI_MODEL_NAME"] = "gpt-3.5-turbo-1106"
+try:
+    from idk_some_code.controller import EventDrivenController
+except ImportError:
+    from controller import EventDrivenController
+try:
+    from idk_some_code.perception import PerceptionWindow
+except ImportError:
+    from perception import PerceptionWindow
+try:
+    from idk_some_code.planner import plan_path
+except ImportError:
+    from planner import plan_path
+try:
+    from idk_some_code.swarm import SwarmIndex
+except ImportError:
+    from swarm import SwarmIndex
+try:
+    from idk_some_code.random_streams import RandomStream
+except ImportError:
+    from random_streams import RandomStream
+try:
+    from idk_some_code.event_log import EventLogger
+except ImportError:
+    from event_log import EventLogger
+try:
+    from idk_some_code.action_log import logged_action
+except ImportError:
+    from action_log import logged_action
+
+_log = EventLogger("drone")
+
+PERCEPTION_DIRECTIONS = ("N", "S", "E", "W", "NE", "NW", "SE", "SW")
+POLICIES = ("llm", "heuristic", "stub")
+MOVE_OFFSETS = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+_DIRECTIONS_BY_OFFSET = {offset: direction for direction, offset in MOVE_OFFSETS.items()}
+
+_shared_llm = None
+_llm_environment_ready = False
+
+
+def configure_llm_environment() -> None:
+    """
+    Exports the API keys from config.yaml for the LLM libraries, the first time an LLM backed drone needs them.
+    Heuristic runs never read the config or import any of the LLM stack.
+    """
+    global _llm_environment_ready
+    if _llm_environment_ready:
+        return
+    try:
+        from global_code.singleton import State
+    except ImportError:
+        from src.global_code.singleton import State
+    os.environ["ANTHROPIC_API_KEY"] = State.config["ANTHROPIC_API_KEY"]
+    os.environ["OPENAI_API_KEY"] = State.config["OPENAI_API_KEY"]
+    os.environ["OPENAI_MODEL_NAME"] = "gpt-3.5-turbo-1106"
+    _llm_environment_ready = True
+
+
+def get_shared_llm():
+    """
+    Returns the ChatAnthropic client shared by every drone.
+    It is only built the first time an LLM backed drone asks for it, so all drones reuse one connection pool.
+    """
+    global _shared_llm
+    if _shared_llm is None:
+        configure_llm_environment()
+        from langchain_anthropic import ChatAnthropic
+        _shared_llm = ChatAnthropic(model="claude-3-haiku-20240307")
+    return _shared_llm
+
 
 class Drone:
-    def __init__(self, grid: Grid, start_pos: Tuple[int, int], start_time: int = 0) -> None:
+    # Slots keep a drone small enough to create thousands of them for scenario sweeps
+    __slots__ = (
+        "last_action_time", "grid", "_position", "time_spent", "victim_counter", "move_counter_since_last_victim",
+        "visited_cells_history", "perceptions", "help_threshold", "last_help_time", "help_cooldown",
+        "area_cleared_cooldown", "start_time", "last_area_cleared_time", "policy", "_controller", "_perception",
+        "destination", "path", "swarm", "_rng", "drone_id", "action_log",
+    )
+
+    def __init__(self, grid: Grid, start_pos: Tuple[int, int], start_time: int = 0, policy: str = "llm",
+                 swarm: Optional[SwarmIndex] = None, rng: Optional[RandomStream] = None,
+                 drone_id: Optional[int] = None, action_log=None) -> None:
+        """
+        :param grid: The grid the drone operates on
+        :param start_pos: Starting (x, y) position
+        :param start_time: Simulation time the drone was deployed at
+        :param policy: 'llm' to let the crewai agent decide, 'heuristic' to use assess_and_act without any model,
+                       'stub' to run the whole agent loop with stub_decision standing in for the model
+        :param swarm: Shared index of drone positions, the drone registers itself and reports every move
+        :param rng: The drone's own random stream, see SimulationRandom.drone_streams. Unseeded if omitted
+        :param drone_id: Index of the drone in its simulation, identifies it in action logs
+        :param action_log: ActionRecorder writing the drone's decisions, or ActionReplay replaying them
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}', expected one of {POLICIES}")
         self.last_action_time = 0
         self.grid = grid
-        self.position = start_pos
+        self.swarm = swarm
+        self._position = start_pos
+        if swarm is not None:
+            swarm.register(self)
         self.time_spent = 0
         self.victim_counter = 0
         self.move_counter_since_last_victim = 0
         self.visited_cells_history = deque(maxlen=4)
-        self.drone_state: Dict[str, any] = {
-            "position": start_pos,
-            "perceptions": {
-                "N": None, "S": None, "E": None, "W": None,
-                "NE": None, "NW": None, "SE": None, "SW": None,
-            }
-        }
+        self.perceptions: Optional[Dict[str, Any]] = None  # Filled by update_perceptions / update_state
         self.help_threshold = 2  # Number of unique cells with victims before emitting "Need Help"
         self.last_help_time = 0  # Tracks the last time "Need Help" was emitted
         self.help_cooldown = 30  # Time units to wait before "Need Help" can be emitted again
@@ -42,12 +125,61 @@ class Drone:
         self.start_time = start_time
         self.last_area_cleared_time = 0  # Initialize the last time the 'Area Cleared' was emitted
         self.area_cleared_cooldown = 30  # Time units to wait before 'Area Cleared' can be emitted again
-        self.ClaudeHaiku = ChatAnthropic(model="claude-3-haiku-20240307")
+        self.policy = policy
+        self._controller: Optional[EventDrivenController] = None
+        self._perception: Optional[PerceptionWindow] = None
+        self.destination: Optional[Tuple[int, int]] = None  # Set by go_to, cleared on arrival
+        self.path: Optional[deque] = None  # Cached cells left to visit on the way to destination
+        self._rng = rng
+        self.drone_id = drone_id
+        self.action_log = action_log
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self._position
+
+    @position.setter
+    def position(self, value: Tuple[int, int]) -> None:
+        self._position = value
+        if self.swarm is not None:
+            self.swarm.update(self)
+
+    @property
+    def rng(self) -> RandomStream:
+        """The drone's random stream, an unseeded one is created on first use if none was given."""
+        if self._rng is None:
+            self._rng = RandomStream(np.random.default_rng())
+        return self._rng
+
+    @property
+    def llm(self):
+        """The LLM client, shared between all drones and only created when first needed."""
+        return get_shared_llm()
+
+    @property
+    def controller(self) -> EventDrivenController:
+        """Decides when the LLM actually has to be consulted, created on first use."""
+        if self._controller is None:
+            self._controller = EventDrivenController()
+        return self._controller
+
+    @property
+    def perception(self) -> PerceptionWindow:
+        """Pheromones around the drone, updated incrementally on moves, created on first use."""
+        if self._perception is None:
+            self._perception = PerceptionWindow(self.grid, 10)
+        return self._perception
+
+    @property
+    def drone_state(self) -> Dict[str, Any]:
+        """Position and latest perceptions of the drone."""
+        perceptions = self.perceptions if self.perceptions is not None else dict.fromkeys(PERCEPTION_DIRECTIONS)
+        return {"position": self.position, "perceptions": perceptions}
 
     def explore_current_cell(self, current_time: int) -> None:
         x, y = self.position
         if self.grid.is_victim(x, y):
-            if self.grid.is_obstacle(x, y) and self.grid.obstacles[y][x]['type'] == 'collapsed_building':
+            if self.grid.is_collapsed_building(x, y):
                 # print(f"Commencing assistance for victim at collapsed building ({x}, {y}).")
                 self.time_spent += 5  # Time to assist victim
             else:
@@ -56,7 +188,7 @@ class Drone:
             self.grid.remove_victim(x, y)
             self.grid.add_safe_zone(x, y)
             self.last_action_time = current_time + 5  # Drone will not perform an action for the next 5 turns
-        elif self.grid.is_obstacle(x, y) and self.grid.obstacles[y][x]['type'] == 'collapsed_building':
+        elif self.grid.is_collapsed_building(x, y):
             self.time_spent += 3  # Additional time to explore collapsed building
             self.grid.explore_cell(x, y)  # Mark the building as explored
             self.grid.add_safe_zone(x, y)
@@ -64,12 +196,24 @@ class Drone:
         self.time_spent += 1
 
     def assess_and_act(self, current_time: int) -> None:
-        """Randomly decide an action, with a simple sense of surroundings."""
-        if np.random.rand() > 0.5:  # Randomly decide to move or stay
-            directions = ['up', 'down', 'left', 'right']
-            possible_moves = [d for d in directions if self.can_move(d)]
-            if possible_moves:  # If there are any possible moves
-                self.move(np.random.choice(possible_moves))
+        """
+        Randomly decide an action, with a simple sense of surroundings.
+        The decision goes through the action log like a model's, as a consultation and the move_* action taken,
+        so heuristic runs are recorded, replayed and exported too.
+        """
+        log = self.action_log
+        if log is None or not log.consult(self, current_time):
+            if self.rng.random() > 0.5:  # Randomly decide to move or stay
+                directions = ['up', 'down', 'left', 'right']
+                possible_moves = [d for d in directions if self.can_move(d)]
+                if possible_moves:  # If there are any possible moves
+                    direction = self.rng.choice(possible_moves)
+                    captured = log is not None and log.capture(self, "move_" + direction, ())
+                    try:
+                        self.move(direction, checked=True)
+                    finally:
+                        if captured:
+                            log.release()
         self.explore_current_cell(current_time)
         # self.evaluate_area_cleared(current_time
         #                            self.grid.c
@@ -89,49 +233,42 @@ class Drone:
         return 0 <= next_x < self.grid.width and 0 <= next_y < self.grid.height and self.grid.is_passable(next_x,
                                                                                                           next_y)
 
-    def move(self, direction: str) -> None:
-        """Moves the drone in the specified direction, if possible."""
-        if direction == "up" and self.can_move("up"):
-            self.position = (self.position[0], self.position[1] - 1)
-            self.update_state()
-        elif direction == "down" and self.can_move("down"):
-            self.position = (self.position[0], self.position[1] + 1)
-            self.update_state()
-        elif direction == "left" and self.can_move("left"):
-            self.position = (self.position[0] - 1, self.position[1])
-            self.update_state()
-        elif direction == "right" and self.can_move("right"):
-            self.position = (self.position[0] + 1, self.position[1])
+    def move(self, direction: str, checked: bool = False) -> None:
+        """
+        Moves the drone in the specified direction, if possible.
+        :param checked: The caller already made sure can_move(direction) holds, the grid is not asked twice
+        """
+        offset = MOVE_OFFSETS.get(direction)
+        if offset is not None and (checked or self.can_move(direction)):
+            self.position = (self.position[0] + offset[0], self.position[1] + offset[1])
             self.update_state()
         else:
-            # Let's humorously acknowledge an unsuccessful move
-            print("This drone attempted a dance move it hasn't quite mastered yet.")
+            # The drone attempted a dance move it hasn't quite mastered yet
+            _log.debug("move_blocked", position=self.position, direction=direction)
         self.update_visited_history(self.position)
         self.emit_pheromone("trail", "Drone trail", self.time_spent)
 
     def evaluate_area_cleared(self, current_time: int) -> None:
-        print(f"Evaluating area cleared at {self.position}, time: {current_time}")
+        _log.debug("area_cleared_check", position=self.position, time=current_time)
         time_since_last_cleared = current_time - self.last_area_cleared_time
         if self.area_cleared_conditions_met(current_time) and time_since_last_cleared >= self.area_cleared_cooldown:
-            print(f"Emitting 'Area Cleared' at {self.position} at time {current_time}.")
+            _log.info("area_cleared_emitted", position=self.position, time=current_time)
             self.grid.add_pheromone(self.position[0], self.position[1], "area_cleared", "Area now under control",
                                     current_time)
             self.last_area_cleared_time = current_time  # Update the last emission time
         else:
             if not self.area_cleared_conditions_met(current_time):
-                print(f"Conditions not met for 'Area Cleared' at {self.position} at time {current_time}.")
+                _log.debug("area_cleared_conditions_not_met", position=self.position, time=current_time)
             else:
-                print(
-                    f"'Area Cleared' cooldown in effect. Time remaining: {self.area_cleared_cooldown - time_since_last_cleared} units.")
+                _log.debug("area_cleared_cooldown", position=self.position,
+                           remaining=self.area_cleared_cooldown - time_since_last_cleared)
 
     def update_state(self) -> None:
         """Updates the drone's state based on its surroundings and pheromones within its visibility range."""
-        x, y = self.position
-        self.drone_state["position"] = (x, y)
-
-        # Use the new get_pheromones_square method to update perceptions based on the current position
+        # The window only reads the entering row/column of cells, everything else is reused from the last move
         visibility_range = 5  # Define as needed
-        self.drone_state["perceptions"] = self.grid.get_pheromones_square(self.position, visibility_range)
+        self.perception.update(self.position)
+        self.perceptions = self.perception.pheromones_square(visibility_range)
 
     def update_visited_history(self, new_position: Tuple[int, int]) -> None:
         """Update the history of visited cells with the new position."""
@@ -140,12 +277,13 @@ class Drone:
 
     def evaluate_need_help(self, current_time: int) -> None:
         # print(f"Evaluating need for help at {current_time}, visited cells: {self.visited_cells_history}")
-        print(f"Current Time: {current_time}, Last Help Time: {self.last_help_time}, Cooldown: {self.help_cooldown}")
+        _log.debug("need_help_check", time=current_time, last_help_time=self.last_help_time,
+                   cooldown=self.help_cooldown)
         if len(set(self.visited_cells_history)) >= self.help_threshold:
             last_emission_time = current_time - self.last_help_time
-            print(f"Time since last help: {last_emission_time}, cooldown: {self.help_cooldown}")
             if last_emission_time > self.help_cooldown:
-                print("Emitting 'Need Help' pheromone.")
+                _log.info("need_help_emitted", position=self.position, time=current_time,
+                          since_last_help=last_emission_time)
                 self.grid.add_pheromone(self.position[0], self.position[1], "need_help", "Assistance required",
                                         current_time)
                 self.last_help_time = current_time
@@ -170,7 +308,7 @@ class Drone:
                     if self.grid.is_safe_zone(nx, ny):
                         safe_count += 1
         required_safe_zones = 5  # Example threshold
-        print(f"Safe count at ({x}, {y}): {safe_count}, required: {required_safe_zones}")
+        _log.debug("safe_count", position=(x, y), safe_count=safe_count, required=required_safe_zones)
         return safe_count >= required_safe_zones
 
     def update_perceptions(self) -> None:
@@ -181,6 +319,7 @@ class Drone:
         }
         x, y = self.position
         visibility_range = 1  # Define the visibility range of the drone
+        perceptions = {}
 
         for direction, (dx, dy) in directions.items():
             nx, ny = x + dx, y + dy
@@ -192,7 +331,7 @@ class Drone:
                 safe_zone = self.grid.is_safe_zone(nx, ny)
 
                 # Storing this information in the drone state
-                self.drone_state['perceptions'][direction] = {
+                perceptions[direction] = {
                     'pheromones': pheromones,
                     'obstacle': obstacle,
                     'victim': victim,
@@ -200,10 +339,16 @@ class Drone:
                 }
             else:
                 # Handle out-of-bound areas
-                self.drone_state['perceptions'][direction] = None
+                perceptions[direction] = None
+        self.perceptions = perceptions
 
-        # Debugging output
-        print(f"Updated perceptions at {self.position}: {self.drone_state['perceptions']}")
+        # A summary rather than the whole dict, the event is formatted later on the logging thread.
+        # Counting is only worth it when somebody listens, this runs on every perception update
+        if _log.enabled(logging.DEBUG):
+            _log.debug("perceptions_updated", position=self.position,
+                       victims=sum(1 for cell in perceptions.values() if cell and cell['victim']),
+                       obstacles=sum(1 for cell in perceptions.values() if cell and cell['obstacle']),
+                       pheromones=sum(len(cell['pheromones']) for cell in perceptions.values() if cell))
 
     def emit_pheromone(self, pheromone_type: str, message: str, current_time: int) -> None:
         """Emits a specified type of pheromone at the drone's current position."""
@@ -223,7 +368,7 @@ class Drone:
 
     def evaluate_situation(self) -> str:
         """Analyzes the current cell and decides the next action."""
-        current_info = self.drone_state['perceptions']
+        current_info = self.perceptions
         if current_info['victim']:
             return 'assist_victim'
         elif self.should_emit_help():
@@ -232,45 +377,86 @@ class Drone:
             return 'emit_area_cleared'
         return 'explore'
 
+    @logged_action
     def emit_need_help_tool(self):
         """Emit the 'Need Help' pheromone to request assistance from other drones."""
         self.emit_pheromone("need_help", "Assistance required", self.time_spent)
         return "Emitting 'Need Help' pheromone at current position."
 
+    @logged_action
     def emit_area_cleared_tool(self):
         """Emit the 'Area Cleared' pheromone to indicate the area is safe."""
         self.emit_pheromone("area_cleared", "Area now under control", self.time_spent)
         return "Emitting 'Area Cleared' pheromone at current position."
 
-    def agent_main(self) -> None:
-        """Main function for the drone to be called at each simulation time interval."""
+    def step(self, current_time: int) -> int:
+        """
+        Lets the drone take one decision at the given simulation time, used by the discrete-event scheduler.
+        The drone is not called again while it is busy, so work taking several ticks (assisting a victim,
+        exploring a collapsed building) costs a single call.
+        :param current_time: Current simulation time
+        :return: Simulation time of the drone's next decision
+        """
+        time_spent_before = self.time_spent
+        if self.policy == "heuristic":
+            self.assess_and_act(current_time)
+        else:
+            self.agent_main(current_time)
+            if self.policy == "stub":
+                self.explore_current_cell(current_time)
+        busy_for = max(self.time_spent - time_spent_before, self.last_action_time - current_time, 1)
+        return current_time + busy_for
+
+    def agent_main(self, current_time: Optional[int] = None) -> None:
+        """
+        Main function for the drone to be called at each simulation time interval.
+        :param current_time: Simulation time, identifies the decision in the action log. Defaults to time_spent
+        """
         if self.last_action_time > self.time_spent:
-            print(
-                f"Drone is currently assisting at ({self.position[0]}, {self.position[1]}) and will resume actions at time {self.last_action_time}.")
+            _log.debug("busy", position=self.position, resume_time=self.last_action_time)
             return  # Skip this turn as the drone is busy
 
+        if self.policy == "heuristic":
+            self.assess_and_act(self.time_spent)
+            return
+
         # Refresh perceptions before making any decisions
         self.update_perceptions()
-        nearby_pheromones = self.grid.get_pheromones_square(self.position, 10)
+        self.perception.update(self.position)
+
+        # Only consult the model when something meaningful changed, otherwise keep following the last intent
+        trigger = self.controller.check_triggers(self)
+        if trigger is None:
+            if self.controller.continue_intent(self):
+                return
+            trigger = EventDrivenController.TRIGGER_BLOCKED
+        self.controller.start_consultation(trigger)
+        if self.action_log is not None and self.action_log.consult(
+                self, self.time_spent if current_time is None else current_time):
+            return  # The logged decision was replayed, no model involved
+        if self.policy == "stub":
+            self.stub_decision(trigger)
+            return
+
+        # The agent stack is only imported once a drone really consults the model
+        configure_llm_environment()
+        from crewai import Agent, Task, Crew
+        try:
+            from idk_some_code.agent_tools import (MoveEastTool, MoveWestTool, MoveNorthTool, MoveSouthTool, GoToTool,
+                                                   ExploreFrontierTool, RespondToNeedHelpTool, EmitNeedHelpTool,
+                                                   EmitAreaClearedTool)
+        except ImportError:
+            from agent_tools import (MoveEastTool, MoveWestTool, MoveNorthTool, MoveSouthTool, GoToTool,
+                                     ExploreFrontierTool, RespondToNeedHelpTool, EmitNeedHelpTool,
+                                     EmitAreaClearedTool)
         tools = [
             MoveEastTool(drone=self), MoveWestTool(drone=self), MoveNorthTool(drone=self), MoveSouthTool(drone=self),
+            GoToTool(drone=self), ExploreFrontierTool(drone=self), RespondToNeedHelpTool(drone=self),
             EmitNeedHelpTool(drone=self), EmitAreaClearedTool(drone=self)
         ]
         # tools = [move_north_tool(self), move_south_tool(self), move_east_tool(self), move_west_tool(self), emit_need_help_tool(self), emit_area_cleared_tool(self)]
         # Get all pheromones in the surrounding area
-        all_phers = {"N": {"need_help": 0, "area_cleared": 0}, "S": {"need_help": 0, "area_cleared": 0},
-                     "E": {"need_help": 0, "area_cleared": 0}, "W": {"need_help": 0, "area_cleared": 0},
-                     "NE": {"need_help": 0, "area_cleared": 0}, "NW": {"need_help": 0, "area_cleared": 0},
-                     "SE": {"need_help": 0, "area_cleared": 0}, "SW": {"need_help": 0, "area_cleared": 0}}
-        cardinal_signs = ["N", "S", "E", "W", "NE", "NW", "SE", "SW"]
-        for sign in cardinal_signs:
-            for pher in nearby_pheromones[sign]:
-                if pher["type"] == "need_help":
-                    all_phers[sign]["need_help"] += 1
-                elif pher["type"] == "area_cleared":
-                    all_phers[sign]["area_cleared"] += 1
-                # elif pher["type"] == "trail":
-                #     all_phers[sign]["trail"] += 1
+        all_phers = self.perception.pheromone_counts(("need_help", "area_cleared"), 10)
 
         # agent code time
         drone_agent = Agent(
@@ -290,19 +476,22 @@ Surrounding Pheromones:
 - Southwest: {all_phers["SW"]}
 
 Perceptions:
-- North: {self.drone_state['perceptions']['N']}
-- South: {self.drone_state['perceptions']['S']}
-- East: {self.drone_state['perceptions']['E']}
-- West: {self.drone_state['perceptions']['W']}
-- Northeast: {self.drone_state['perceptions']['NE']}
-- Northwest: {self.drone_state['perceptions']['NW']}
-- Southeast: {self.drone_state['perceptions']['SE']}
-- Southwest: {self.drone_state['perceptions']['SW']}
+- North: {self.perceptions['N']}
+- South: {self.perceptions['S']}
+- East: {self.perceptions['E']}
+- West: {self.perceptions['W']}
+- Northeast: {self.perceptions['NE']}
+- Northwest: {self.perceptions['NW']}
+- Southeast: {self.perceptions['SE']}
+- Southwest: {self.perceptions['SW']}
 
 The disaster area is broken up into grid cells with obstacles, victims, and safe zones scattered throughout. The grid measures {self.grid.height}x{self.grid.width}. Your current position: {self.position}.
 
 Possible Actions:
 - Move: North, South, East, West (if passable)
+- Go To (x, y): fly to a distant cell, the drone plans a path around mountains and keeps following it on its own over the next turns
+- Explore Frontier: fly to the closest unexplored cell bordering explored ground
+- Respond To Need Help: fly to the closest 'Need Help' pheromone, the drone keeps heading there on its own over the next turns
 - Emit 'Need Help' pheromone (if needed)
 - Emit 'Area Cleared' pheromone (if applicable)
 When to emit pheromone:
@@ -325,7 +514,7 @@ When to Emit Pheromones:
             verbose=False,
             allow_delegation=False,
             tools=tools,
-            # llm="gpt-3.5-turbo-1106", # llm=self.ClaudeHaiku to use haiku
+            # llm="gpt-3.5-turbo-1106", # llm=self.llm to use haiku
             max_iter=3,
             max_execution_time=2,
             memory=True
@@ -341,164 +530,151 @@ When to Emit Pheromones:
             verbose=2,  # You can set it to 1 or 2 to different logging levels
         )
         result = crew.kickoff()
-        print("*************")
+        _log.info("crew_finished", position=self.position, trigger=trigger, result=str(result))
 
         time.sleep(3)
 
 
+    def stub_decision(self, trigger: str) -> str:
+        """
+        Decides like a very predictable model would, through the same drone methods the agent tools call:
+        respond to a new 'Need Help', else head for the frontier, else move in a random direction.
+        Lets benchmarks run the whole orchestration loop without any API call.
+        :param trigger: The controller trigger that asked for a decision
+        :return: The tool message
+        """
+        if trigger == EventDrivenController.TRIGGER_NEED_HELP_CHANGED and self.controller.known_need_help:
+            return self.respond_to_need_help()
+        if trigger != EventDrivenController.TRIGGER_BLOCKED:
+            message = self.explore_frontier()
+            if self.destination is not None:
+                return message
+        return getattr(self, self.rng.choice(("move_up", "move_down", "move_left", "move_right")))()
+
+    @logged_action
+    def go_to(self, x: int, y: int) -> str:
+        """
+        Plans a path to (x, y) and takes its first step, the rest is followed locally by the controller.
+        :param x: Destination x
+        :param y: Destination y
+        :return: Message for the agent
+        """
+        path = plan_path(self.grid, self.position, (x, y))
+        if path is None:
+            self.controller.record_blocked()
+            return "UNREACHABLE"
+        self.destination = (x, y)
+        self.path = deque(path)
+        self.controller.record_intent(EventDrivenController.INTENT_GO_TO)
+        if path:
+            self.follow_path()
+        return f"Heading to ({x}, {y}), {len(path)} cells away"
+
+    def follow_path(self) -> bool:
+        """
+        Takes the next step on the cached path, replanning from the current position if that step is blocked.
+        :return: False if the destination can no longer be reached, True otherwise
+        """
+        if not self.path:
+            self.destination = None
+            self.path = None
+            return True
+        direction = self._direction_to(self.path[0])
+        if direction is None or not self.can_move(direction):
+            path = plan_path(self.grid, self.position, self.destination)
+            if not path:
+                self.destination = None
+                self.path = None
+                return False
+            self.path = deque(path)
+            direction = self._direction_to(self.path[0])
+        self.move(direction)
+        self.path.popleft()
+        if not self.path:
+            self.destination = None
+            self.path = None
+        return True
+
+    def follow_need_help(self) -> Optional[bool]:
+        """
+        Takes one step toward the closest 'Need Help' pheromone using the grid's shared flow field.
+        :return: True if the drone moved, False if the step was blocked, None if there is nowhere to go
+                 (already at a 'Need Help' cell or none can be reached)
+        """
+        direction = self.grid.get_need_help_flow_field().next_direction(*self.position)
+        if direction is None:
+            return None
+        if not self.can_move(direction):
+            return False
+        self.move(direction, checked=True)
+        return True
+
+    @logged_action
+    def respond_to_need_help(self) -> str:
+        """Heads toward the closest 'Need Help' pheromone, the controller keeps following the field afterwards."""
+        field = self.grid.get_need_help_flow_field()
+        distance = field.distance(*self.position)
+        if distance is None:
+            return "No reachable 'Need Help' pheromone"
+        self.controller.record_intent(EventDrivenController.INTENT_FOLLOW_NEED_HELP)
+        self.follow_need_help()
+        return f"Responding to 'Need Help', {distance} away"
+
+    @logged_action
+    def explore_frontier(self) -> str:
+        """Heads for the closest unexplored cell bordering explored ground, using the grid's frontier index."""
+        target = self.grid.frontier.nearest(*self.position)
+        if target is None:
+            return "No frontier left to explore"
+        return self.go_to(*target)
+
+    def nearby_drones(self, radius: float) -> list:
+        """Other drones of the swarm within radius, empty if the drone isn't part of a swarm index."""
+        if self.swarm is None:
+            return []
+        return self.swarm.drones_within(*self.position, radius, exclude=self)
+
+    def _direction_to(self, cell: Tuple[int, int]) -> Optional[str]:
+        """Direction of an adjacent cell, None if the cell is not a single move away."""
+        dx, dy = cell[0] - self.position[0], cell[1] - self.position[1]
+        return _DIRECTIONS_BY_OFFSET.get((dx, dy))
+
+    @logged_action
     def move_up(self) -> str:
         """Move the drone up if possible."""
         if not self.can_move("up"):
+            self.controller.record_blocked()
             return "IMPASSABLE"
-        self.move("up")
+        self.move("up", checked=True)
+        self.controller.record_intent("up")
         return "Moved to the north"
 
+    @logged_action
     def move_down(self) -> str:
         """Move the drone down if possible."""
         if not self.can_move("down"):
+            self.controller.record_blocked()
             return "IMPASSABLE"
-        self.move("down")
+        self.move("down", checked=True)
+        self.controller.record_intent("down")
         return "Moved to the south"
 
+    @logged_action
     def move_left(self) -> str:
         """Move the drone left if possible."""
         if not self.can_move("left"):
+            self.controller.record_blocked()
             return "IMPASSABLE"
-        self.move("left")
+        self.move("left", checked=True)
+        self.controller.record_intent("left")
         return "Moved to the west"
 
+    @logged_action
     def move_right(self) -> str:
         """Move the drone right if possible."""
         if not self.can_move("right"):
+            self.controller.record_blocked()
             return "IMPASSABLE"
-        self.move("right")
+        self.move("right", checked=True)
+        self.controller.record_intent("right")
         return "Moved to the east"
-
-
-# Cheap fix to get around circular imports
-from crewai_tools import BaseTool
-from crewai_tools import tool
-from pydantic import BaseModel, BaseConfig, Field
-
-
-class DroneModel(BaseModel):
-    class Config:
-        arbitrary_types_allowed = True
-
-
-# @tool("MoveEastTool")
-# def move_east_tool(drone: DroneModel) -> str:
-#     """Move the drone east."""
-#     drone.move_right()  # Assuming move_right() is a valid method on the Drone class
-#     return "Moved east"
-#
-#
-# @tool("MoveWestTool")
-# def move_west_tool(drone: Any):
-#     """Move the drone west."""
-#     drone.move_left()
-#     return "Moved West"
-#
-#
-# @tool("MoveNorthTool")
-# def move_north_tool(drone: Any):
-#     """Move the drone north."""
-#     drone.move_up()
-#     return "Moved north"
-#
-#
-# @tool("MoveSouthTool")
-# def move_south_tool(drone: Any):
-#     """Move the drone south."""
-#     drone.move_down()
-#     return "Moved south"
-#
-#
-# @tool("EmitNeedHelpTool")
-# def emit_need_help_tool(drone: Any):
-#     """Emit the 'Need Help' pheromone."""
-#     drone.emit_need_help_tool()
-#     return "Emitted 'Need Help'"
-#
-#
-# @tool("EmitAreaClearedTool")
-# def emit_area_cleared_tool(drone: any):
-#     """Emit the 'Area Cleared' pheromone."""
-#     drone.emit_area_cleared_tool()
-#     return "Emitted 'Area Cleared'"
-
-
-class MoveEastTool(BaseTool):
-    name: str = "Move East"
-    description: str = "Tool to move the drone east."
-    drone: Any = Field(..., description="Drone instance")
-
-    def __init__(self, drone):
-        super().__init__(drone=drone)
-        # self.drone = drone
-
-    def _run(self):
-        result = self.drone.move_right()
-        return result
-
-
-class MoveWestTool(BaseTool):
-    name: str = "Move West"
-    description: str = "Tool to move the drone west."
-    drone: Any = Field(..., description="Drone instance")
-
-    def __init__(self, drone):
-        super().__init__(drone=drone)
-
-    def _run(self):
-        result = self.drone.move_left()
-        return result
-
-
-class MoveNorthTool(BaseTool):
-    name: str = "Move North"
-    description: str = "Tool to move the drone north."
-    drone: Any = Field(..., description="Drone instance")
-
-    def __init__(self, drone):
-        super().__init__(drone=drone)
-
-    def _run(self):
-        return self.drone.move_up()
-
-
-
-class MoveSouthTool(BaseTool):
-    name: str = "Move South"
-    description: str = "Tool to move the drone south."
-    drone: Any = Field(..., description="Drone instance")
-
-    def __init__(self, drone):
-        super().__init__(drone=drone)
-
-    def _run(self):
-        return self.drone.move_down()
-
-
-class EmitNeedHelpTool(BaseTool):
-    name: str = "Emit Need Help"
-    description: str = "Tool to emit 'Need Help' pheromone."
-    drone: Any = Field(..., description="Drone instance")
-
-    def __init__(self, drone):
-        super().__init__(drone=drone)
-
-    def _run(self):
-        return self.drone.emit_need_help_tool()
-
-
-class EmitAreaClearedTool(BaseTool):
-    name: str = "Emit Area Cleared"
-    description: str = "Tool to emit 'Area Cleared' pheromone."
-    drone: Any = Field(..., description="Drone instance")
-
-    def __init__(self, drone):
-        super().__init__(drone=drone)
-
-    def _run(self):
-        return self.drone.emit_area_cleared_tool()
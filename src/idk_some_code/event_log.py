@@ -0,0 +1,219 @@
+# event_log.py
+"""
+Structured, leveled logging for the simulation hot loop.
+
+Code emits cheap events, a name and a few fields:
+
+    _log = EventLogger("drone")
+    _log.debug("move_blocked", position=self.position, direction=direction)
+
+A disabled level costs one isEnabledFor check. Enabled events go through their sampling / rate limit policy before
+a LogRecord is even built, and are put on a queue unformatted; a QueueListener thread formats and writes them.
+Nothing is written anywhere until configure_logging is called, apart from warnings and errors reaching Python's
+last resort handler.
+"""
+import atexit
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from time import monotonic
+from typing import Any, Dict, Optional, TextIO, Tuple
+
+ROOT_LOGGER = "idk_some_code"
+
+# Policies of the chattiest events, used unless configure_logging is given its own: event -> (sample_every, rate)
+DEFAULT_POLICIES: Dict[str, Tuple[int, Optional[float]]] = {
+    "drone.move_blocked": (1, 50.0),
+    "drone.perceptions_updated": (100, 50.0),
+    "drone.safe_count": (10, 50.0),
+    "drone.need_help_check": (10, 50.0),
+    "drone.area_cleared_check": (10, 50.0),
+    "drone.busy": (1, 20.0),
+}
+
+
+class EventPolicy:
+    """
+    Sampling and rate limit of one event.
+    Keeps one in sample_every events, then lets at most rate of those through per second with bursts up to burst.
+    Dropped events are counted and reported as 'suppressed' on the next event that gets through.
+    """
+    __slots__ = ("sample_every", "rate", "burst", "seen", "suppressed", "_tokens", "_last")
+
+    def __init__(self, sample_every: int = 1, rate: Optional[float] = None, burst: Optional[float] = None) -> None:
+        """
+        :param sample_every: Keep one event in this many
+        :param rate: Events per second let through, unlimited if None
+        :param burst: Events let through back to back, rate by default
+        """
+        self.sample_every = max(sample_every, 1)
+        self.rate = rate
+        self.burst = max(burst if burst is not None else (rate or 1.0), 1.0)
+        self.seen = 0
+        self.suppressed = 0
+        self._tokens = self.burst
+        self._last = monotonic()
+
+    def allow(self) -> bool:
+        """Whether the next event gets through."""
+        self.seen += 1
+        if (self.seen - 1) % self.sample_every:
+            self.suppressed += 1
+            return False
+        if self.rate is not None:
+            now = monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens < 1:
+                self.suppressed += 1
+                return False
+            self._tokens -= 1
+        return True
+
+
+# Policies by full event name, e.g. 'drone.move_blocked'
+_policies: Dict[str, EventPolicy] = {}
+
+
+def set_event_policy(event: str, sample_every: int = 1, rate: Optional[float] = None,
+                     burst: Optional[float] = None) -> None:
+    """Sets the sampling and rate limit of an event, by its full 'component.event' name."""
+    _policies[event] = EventPolicy(sample_every, rate, burst)
+
+
+class EventLogger:
+    """Emits structured events of one component under the idk_some_code logger."""
+    __slots__ = ("component", "logger")
+
+    def __init__(self, component: str) -> None:
+        self.component = component
+        self.logger = logging.getLogger(f"{ROOT_LOGGER}.{component}")
+
+    def enabled(self, level: int) -> bool:
+        """
+        Whether events of a level are emitted at all. Hot call sites whose fields cost something to compute check it
+        first, the arguments of a call are evaluated before debug() can drop the event.
+        """
+        return self.logger.isEnabledFor(level)
+
+    def debug(self, event: str, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._emit(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self._emit(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, event, fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._emit(logging.ERROR, event, fields)
+
+    def _emit(self, level: int, event: str, fields: Dict[str, Any]) -> None:
+        name = f"{self.component}.{event}"
+        policy = _policies.get(name)
+        if policy is not None:
+            if not policy.allow():
+                return
+            if policy.suppressed:
+                fields["suppressed"] = policy.suppressed
+                policy.suppressed = 0
+        # makeRecord skips the caller lookup logger.log would do
+        record = self.logger.makeRecord(self.logger.name, level, "", 0, name, None, None,
+                                        extra={"event": name, "fields": fields})
+        self.logger.handle(record)
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats events as 'time level event key=value ...' lines, or as JSON lines."""
+
+    def __init__(self, json_lines: bool = False) -> None:
+        super().__init__()
+        self.json_lines = json_lines
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = getattr(record, "fields", None)
+        event = getattr(record, "event", None) or record.getMessage()
+        if self.json_lines:
+            return json.dumps({"time": record.created, "level": record.levelname, "event": event,
+                               **(fields or {})}, default=str)
+        line = f"{self.formatTime(record)} {record.levelname} {event}"
+        if fields:
+            line += " " + " ".join(f"{key}={value!r}" for key, value in fields.items())
+        return line
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    Puts records on the queue as they are. The stock QueueHandler formats in the emitting thread, which is exactly
+    the work this pipeline moves to the listener. Records never leave the process, so nothing needs pickling.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def configure_logging(level: int = logging.INFO, stream: Optional[TextIO] = None, path: Optional[str] = None,
+                      json_lines: bool = False,
+                      policies: Optional[Dict[str, Tuple[int, Optional[float]]]] = None) -> QueueListener:
+    """
+    Starts the logging pipeline: events of every idk_some_code logger go on a queue and a background thread writes
+    them to the console and/or a file. Calling it again replaces the previous pipeline.
+    :param level: Lowest level emitted, events below it cost a single check
+    :param stream: Console stream, stderr by default; ignored when only a path is given
+    :param path: Optional file the events are appended to
+    :param json_lines: Write JSON lines instead of key=value text
+    :param policies: Sampling and rate limits by event, {event: (sample_every, rate)}, DEFAULT_POLICIES by default
+    :return: The running listener
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+    _policies.clear()
+    for event, (sample_every, rate) in (DEFAULT_POLICIES if policies is None else policies).items():
+        set_event_policy(event, sample_every, rate)
+
+    formatter = StructuredFormatter(json_lines)
+    handlers = []
+    if stream is not None or path is None:
+        handlers.append(logging.StreamHandler(stream or sys.stderr))
+    if path is not None:
+        handlers.append(logging.FileHandler(path))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    event_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(event_queue)
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    root.propagate = False
+    _listener = QueueListener(event_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Writes every queued event, stops the background thread and closes the outputs."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    root = logging.getLogger(ROOT_LOGGER)
+    root.removeHandler(_queue_handler)
+    root.propagate = True
+    root.setLevel(logging.NOTSET)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener, _queue_handler = None, None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,67 @@
+# flow_field.py
+import heapq
+from typing import FrozenSet, Iterable, Optional, Tuple
+
+import numpy as np
+
+# Step codes stored in FlowField.next_steps, same order as the drone's move directions
+STEP_DIRECTIONS = ("up", "down", "left", "right")
+STEP_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+NO_STEP = -1
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+class FlowField:
+    """
+    Multi-source Dijkstra distance field over passable cells.
+    Computed once for a set of targets (e.g. every active 'Need Help' pheromone), after which any drone reads its
+    best next step with an O(1) lookup instead of running its own search.
+    Distances are in exploration time: entering a cell costs Grid.exploration_cost.
+    """
+
+    def __init__(self, grid, sources: Iterable[Tuple[int, int]], max_distance: Optional[int] = None) -> None:
+        """
+        :param grid: The grid to compute the field on
+        :param sources: The (x, y) targets, every cell flows toward the closest one
+        :param max_distance: Stop expanding beyond this distance, cells further away are left unreachable
+        """
+        self.sources: FrozenSet[Tuple[int, int]] = frozenset(sources)
+        self.max_distance = max_distance
+        self.distances: np.ndarray = np.full((grid.height, grid.width), UNREACHABLE, dtype=np.int32)
+        self.next_steps: np.ndarray = np.full((grid.height, grid.width), NO_STEP, dtype=np.int8)
+        self._compute(grid)
+
+    def _compute(self, grid) -> None:
+        heap = []
+        for x, y in self.sources:
+            if 0 <= x < grid.width and 0 <= y < grid.height and grid.is_passable(x, y):
+                self.distances[y, x] = 0
+                heap.append((0, x, y))
+        heapq.heapify(heap)
+
+        while heap:
+            distance, x, y = heapq.heappop(heap)
+            if distance > self.distances[y, x]:
+                continue  # Stale heap entry
+            # A neighbour stepping into (x, y) pays the cost of entering (x, y)
+            new_distance = distance + grid.exploration_cost(x, y)
+            if self.max_distance is not None and new_distance > self.max_distance:
+                continue
+            for step, (dx, dy) in enumerate(STEP_OFFSETS):
+                nx, ny = x - dx, y - dy  # The neighbour that reaches (x, y) by taking this step
+                if not (0 <= nx < grid.width and 0 <= ny < grid.height) or not grid.is_passable(nx, ny):
+                    continue
+                if new_distance < self.distances[ny, nx]:
+                    self.distances[ny, nx] = new_distance
+                    self.next_steps[ny, nx] = step
+                    heapq.heappush(heap, (new_distance, nx, ny))
+
+    def distance(self, x: int, y: int) -> Optional[int]:
+        """Distance from (x, y) to the closest source, None if no source can be reached."""
+        distance = int(self.distances[y, x])
+        return None if distance == UNREACHABLE else distance
+
+    def next_direction(self, x: int, y: int) -> Optional[str]:
+        """The move ('up', 'down', 'left', 'right') that brings (x, y) closer to a source, None at a source."""
+        step = int(self.next_steps[y, x])
+        return None if step == NO_STEP else STEP_DIRECTIONS[step]
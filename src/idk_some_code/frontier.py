@@ -0,0 +1,71 @@
+# frontier.py
+from typing import List, Optional, Tuple
+
+try:
+    from idk_some_code.spatial_index import BucketIndex
+except ImportError:
+    from spatial_index import BucketIndex
+
+NEIGHBOUR_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
+
+class FrontierIndex:
+    """
+    The exploration frontier: unexplored passable cells next to an explored (safe) cell.
+    Kept up to date incrementally by the grid whenever a cell gets explored or becomes impassable,
+    and stored in a BucketIndex so the nearest frontier cell is found without scanning the grid.
+    """
+
+    def __init__(self, grid, bucket_size: int = 16) -> None:
+        """
+        :param grid: The grid the frontier belongs to
+        :param bucket_size: Bucket size of the spatial index
+        """
+        self.grid = grid
+        self._index = BucketIndex(bucket_size)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        return cell in self._index
+
+    def cells(self) -> List[Tuple[int, int]]:
+        """Every frontier cell."""
+        return list(self._index)
+
+    def on_explored(self, x: int, y: int) -> None:
+        """A cell got explored: it leaves the frontier and its unexplored neighbours join it."""
+        self._index.discard((x, y))
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.grid.width and 0 <= ny < self.grid.height and \
+                    self.grid.is_passable(nx, ny) and not self.grid.is_explored(nx, ny):
+                self._index.add((nx, ny), nx, ny)
+
+    def on_unexplored(self, x: int, y: int) -> None:
+        """
+        A cell is no longer explored, e.g. a victim turned up on a safe cell: it rejoins the frontier if it borders
+        explored ground, and neighbours that only bordered this cell leave it.
+        """
+        if self.grid.is_passable(x, y) and self._borders_explored(x, y):
+            self._index.add((x, y), x, y)
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if (nx, ny) in self._index and not self._borders_explored(nx, ny):
+                self._index.discard((nx, ny))
+
+    def on_blocked(self, x: int, y: int) -> None:
+        """A cell became impassable and can't be explored anymore."""
+        self._index.discard((x, y))
+
+    def _borders_explored(self, x: int, y: int) -> bool:
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.grid.width and 0 <= ny < self.grid.height and self.grid.is_explored(nx, ny):
+                return True
+        return False
+
+    def nearest(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """The frontier cell closest to (x, y), None if there is no frontier yet."""
+        return self._index.nearest(x, y)
@@ -1,35 +1,273 @@
 # grid.py
 import numpy as np
-from typing import List, Tuple, Dict, Optional
+from collections import defaultdict
+from typing import Callable, List, Tuple, Dict, Optional, Set, Iterable
+try:
+    from idk_some_code.flow_field import FlowField
+except ImportError:
+    from flow_field import FlowField
+try:
+    from idk_some_code.frontier import FrontierIndex
+except ImportError:
+    from frontier import FrontierIndex
+
+# Codes of the terrain layer
+TERRAIN_OPEN = 0
+TERRAIN_MOUNTAIN = 1
+TERRAIN_COLLAPSED_BUILDING = 2
+# Changes kept in Grid's change journal, readers that fell further behind compare cell_versions instead
+JOURNAL_LENGTH = 1 << 16
+
+
+class _ObstacleCell(dict):
+    """
+    An obstacle dict handed out by Grid.obstacles. Setting a key writes the changed obstacle back through
+    Grid.set_obstacle, so the old grid.obstacles[y][x]['explored'] = True still marks the building as explored.
+    Keys can't be removed, assign grid.obstacles[y][x] instead.
+    """
+
+    __slots__ = ("_grid", "_x", "_y")
+
+    def __init__(self, grid: "Grid", x: int, y: int, obstacle: Dict) -> None:
+        super().__init__(obstacle)
+        self._grid = grid
+        self._x = x
+        self._y = y
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self._grid.set_obstacle(self._x, self._y, dict(self))
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._grid.set_obstacle(self._x, self._y, dict(self))
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def _removal(self, *args, **kwargs):
+        raise TypeError("Obstacle keys can't be removed, assign grid.obstacles[y][x] instead")
+
+    __delitem__ = pop = popitem = clear = _removal
+
+
+class _ObstacleRow:
+    """One row of Grid.obstacles, building the old obstacle dicts from the terrain layers on access."""
+
+    __slots__ = ("_grid", "_y")
+
+    def __init__(self, grid: "Grid", y: int) -> None:
+        self._grid = grid
+        self._y = y
+
+    def __len__(self) -> int:
+        return self._grid.width
+
+    def __getitem__(self, x: int) -> Optional[Dict]:
+        terrain = self._grid.terrain[self._y, x]
+        if terrain == TERRAIN_MOUNTAIN:
+            return _ObstacleCell(self._grid, x, self._y, {'type': 'mountain'})
+        if terrain == TERRAIN_COLLAPSED_BUILDING:
+            return _ObstacleCell(self._grid, x, self._y, {'type': 'collapsed_building',
+                                                          'explored': bool(self._grid.building_explored[self._y, x])})
+        return None
+
+    def __setitem__(self, x: int, obstacle: Optional[Dict]) -> None:
+        self._grid.set_obstacle(x, self._y, obstacle)
+
+
+class _ObstacleView:
+    """
+    View with the shape of the old list-of-lists obstacle layer. Reading grid.obstacles[y][x] builds the obstacle
+    dict from Grid.terrain and Grid.building_explored, where the data lives. Assigning grid.obstacles[y][x] or a key
+    of the dict read from it writes through to the layers, see Grid.set_obstacle.
+    """
+
+    __slots__ = ("_grid",)
+
+    def __init__(self, grid: "Grid") -> None:
+        self._grid = grid
+
+    def __len__(self) -> int:
+        return self._grid.height
+
+    def __getitem__(self, y: int) -> _ObstacleRow:
+        return _ObstacleRow(self._grid, y)
 
 
 class Grid:
     def __init__(self, width: int, height: int) -> None:
         self.width: int = width
         self.height: int = height
-        self.grid: np.ndarray = np.zeros((height, width), dtype=int)
-        # Initialize a structure to hold obstacle information
-        self.obstacles: List[List[Optional[Dict]]] = [[None for _ in range(width)] for _ in range(height)]
-        # Adding a pheromone layer, with clearer initialization
-        self.pheromones: List[List[List[Dict]]] = [[[] for _ in range(width)] for _ in range(height)]
+        # Cell contents: 0 empty, 1 obstacle, 2 victim, 3 safe zone
+        self.grid: np.ndarray = np.zeros((height, width), dtype=np.int8)
+        # Terrain layers, whole maps can be written at once by the scenario builder
+        self.terrain: np.ndarray = np.zeros((height, width), dtype=np.int8)
+        self.building_explored: np.ndarray = np.zeros((height, width), dtype=bool)
+        self.obstacles = _ObstacleView(self)
+        # Sparse pheromone layer, only cells holding at least one pheromone have an entry
+        self.pheromones: Dict[Tuple[int, int], List[Dict]] = {}
         self.explored_cells = 0
         self.saved_victims: int = 0
+        # Every mutation of a cell stamps it with a new version, so readers can tell what changed since they last looked
+        self.version: int = 0
+        self.cell_versions: np.ndarray = np.zeros((height, width), dtype=np.int64)
+        # The most recent changed cells (flat indices) with their versions, in version order. Lets readers of a small
+        # area visit only what changed instead of comparing the stamps of the whole area
+        self._journal_cells: np.ndarray = np.empty(JOURNAL_LENGTH, dtype=np.int64)
+        self._journal_versions: np.ndarray = np.empty(JOURNAL_LENGTH, dtype=np.int64)
+        self._journal_size = 0
+        self._journal_start = 1  # Every change from this version on is in the journal
+        # Cells currently holding pheromones, split by pheromone type, e.g. every cell currently calling for help
+        self.pheromone_type_cells: Dict[str, Set[Tuple[int, int]]] = defaultdict(set)
+        # Bumped whenever a type's set of cells above changes, a cheap cache key for fields built from it
+        self.pheromone_type_versions: Dict[str, int] = defaultdict(int)
+        # Bumped whenever passability or exploration costs change, invalidates cached flow fields
+        self.terrain_version: int = 0
+        self._need_help_field: Optional[FlowField] = None
+        self._need_help_field_key = None
+        # Unexplored passable cells next to explored ones, updated as cells get explored
+        self.frontier = FrontierIndex(self)
+        # Optional observer of every pheromone added, called with (x, y, pheromone_type, intensity)
+        self.on_pheromone: Optional[Callable[[int, int, str, float], None]] = None
+
+    @property
+    def pheromone_cells(self):
+        """Cells currently holding at least one pheromone, so decay never has to scan the whole grid."""
+        return self.pheromones.keys()
+
+    def touch(self, x: int, y: int) -> None:
+        """Marks a cell as changed."""
+        self.version += 1
+        self.cell_versions[y, x] = self.version
+        if self._journal_size == len(self._journal_cells):
+            self._trim_journal()
+        self._journal_cells[self._journal_size] = y * self.width + x
+        self._journal_versions[self._journal_size] = self.version
+        self._journal_size += 1
+
+    def touch_many(self, flat_indices: np.ndarray) -> None:
+        """Marks many cells, given as flat (row major) indices, as changed with a single version stamp."""
+        self.version += 1
+        self.cell_versions.reshape(-1)[flat_indices] = self.version
+        count = np.size(flat_indices)
+        if count > len(self._journal_cells) // 2:
+            # A bulk write like a scenario build, readers compare the stamps once instead
+            self._journal_size = 0
+            self._journal_start = self.version + 1
+            return
+        if self._journal_size + count > len(self._journal_cells):
+            self._trim_journal()
+        end = self._journal_size + count
+        self._journal_cells[self._journal_size:end] = flat_indices
+        self._journal_versions[self._journal_size:end] = self.version
+        self._journal_size = end
+
+    def _trim_journal(self) -> None:
+        """Drops the older half of the journal."""
+        half = len(self._journal_cells) // 2
+        # The version of the last dropped cell may have more cells in the kept half, it is not complete anymore
+        self._journal_start = int(self._journal_versions[half - 1]) + 1
+        kept = self._journal_size - half
+        self._journal_cells[:kept] = self._journal_cells[half:self._journal_size]
+        self._journal_versions[:kept] = self._journal_versions[half:self._journal_size]
+        self._journal_size = kept
+
+    def changes_since(self, version: int) -> Optional[np.ndarray]:
+        """
+        The cells changed after a version, as flat indices in version order, a cell changed twice is listed twice.
+        The array is a view into the journal, valid until the grid changes again.
+        :param version: A version a reader synced at
+        :return: The flat indices, None if the journal no longer reaches back to the version and the reader has to
+                 compare cell_versions instead
+        """
+        if version + 1 < self._journal_start:
+            return None
+        size = self._journal_size
+        first = int(np.searchsorted(self._journal_versions[:size], version, side="right"))
+        return self._journal_cells[first:size]
+
+    def add_mountains(self, flat_indices: np.ndarray) -> None:
+        """Marks many cells, given as flat indices, as mountains in one go."""
+        self.terrain.reshape(-1)[flat_indices] = TERRAIN_MOUNTAIN
+        self.building_explored.reshape(-1)[flat_indices] = False
+        self.terrain_version += 1
+        self.touch_many(flat_indices)
+        for x, y in self.frontier.cells():
+            if self.terrain[y, x] == TERRAIN_MOUNTAIN:
+                self.frontier.on_blocked(x, y)
+
+    def add_collapsed_buildings(self, flat_indices: np.ndarray) -> None:
+        """Marks many cells, given as flat indices, as unexplored collapsed buildings in one go."""
+        self.terrain.reshape(-1)[flat_indices] = TERRAIN_COLLAPSED_BUILDING
+        self.building_explored.reshape(-1)[flat_indices] = False
+        self.terrain_version += 1
+        self.touch_many(flat_indices)
+
+    def add_victims(self, flat_indices: np.ndarray) -> None:
+        """Places victims on many cells, given as flat indices, in one go."""
+        cells = self.grid.reshape(-1)
+        # Usually none, scenarios are built before anything is explored
+        uncovered = flat_indices[(cells[flat_indices] == 3) & ~self.building_explored.reshape(-1)[flat_indices]]
+        cells[flat_indices] = 2
+        self.touch_many(flat_indices)
+        for cell in uncovered.tolist():
+            self.frontier.on_unexplored(cell % self.width, cell // self.width)
+
+    def set_obstacle(self, x: int, y: int, obstacle: Optional[Dict]) -> None:
+        """
+        Sets the obstacle of a cell from an obstacle dict like the ones grid.obstacles returns, None clears it.
+        Prefer add_mountain / add_collapsed_building, this exists for direct grid.obstacles[y][x] assignments.
+        """
+        if obstacle is None:
+            self.terrain[y, x] = TERRAIN_OPEN
+            self.building_explored[y, x] = False
+        elif obstacle['type'] == 'mountain':
+            self.terrain[y, x] = TERRAIN_MOUNTAIN
+            self.building_explored[y, x] = False
+        elif obstacle['type'] == 'collapsed_building':
+            self.terrain[y, x] = TERRAIN_COLLAPSED_BUILDING
+            self.building_explored[y, x] = obstacle.get('explored', False)
+        else:
+            raise ValueError(f"Unknown obstacle type '{obstacle['type']}'")
+        self.terrain_version += 1
+        self.touch(x, y)
+        # The cell may have turned passable, impassable, explored or unexplored, the frontier is told whichever it is
+        if self.is_explored(x, y):
+            self.frontier.on_explored(x, y)
+        else:
+            if not self.is_passable(x, y):
+                self.frontier.on_blocked(x, y)
+            self.frontier.on_unexplored(x, y)
 
     def add_obstacle(self, x: int, y: int) -> None:
-        self.grid[y][x] = 1
+        self._set_cell(x, y, 1)
 
     def add_victim(self, x: int, y: int) -> None:
-        self.grid[y][x] = 2
+        self._set_cell(x, y, 2)
         # print(f"Added victim at ({x}, {y}) - Grid value: {self.grid[y][x]}")
 
+    def _set_cell(self, x: int, y: int, value: int) -> None:
+        """Writes a cell content, taking it off the explored ground (and the frontier along) if it was a safe zone."""
+        was_explored = self.is_explored(x, y)
+        self.grid[y][x] = value
+        self.touch(x, y)
+        if was_explored and not self.is_explored(x, y):
+            self.frontier.on_unexplored(x, y)
+
     def add_safe_zone(self, x: int, y: int) -> None:
         self.explored_cells += 1
         self.grid[y][x] = 3
+        self.touch(x, y)
+        self.frontier.on_explored(x, y)
 
     def is_obstacle(self, x: int, y: int) -> bool:
-        if self.obstacles[y][x] is not None:
-            return True
-        return False
+        return bool(self.terrain[y, x] != TERRAIN_OPEN)
+
+    def is_collapsed_building(self, x: int, y: int) -> bool:
+        return bool(self.terrain[y, x] == TERRAIN_COLLAPSED_BUILDING)
 
     def is_victim(self, x: int, y: int) -> bool:
         is_vic = self.grid[y][x] == 2
@@ -39,89 +277,200 @@ class Grid:
     def is_safe_zone(self, x: int, y: int) -> bool:
         return self.grid[y][x] == 3
 
+    def is_explored(self, x: int, y: int) -> bool:
+        """A cell is explored once it is a safe zone or, for collapsed buildings, once it has been searched."""
+        return self.is_safe_zone(x, y) or bool(self.building_explored[y, x])
+
     def get_pheromones(self, x: int, y: int) -> List[Dict]:
         """Returns a list of pheromones in the specified location."""
-        return self.pheromones[y][x]
+        return self.pheromones.get((x, y), [])
 
     def remove_victim(self, x: int, y: int) -> None:
         """Mark a cell as no longer containing a victim."""
         if self.is_victim(x, y):
             self.grid[y][x] = 3  # Assuming 3 is the safe zone code
+            self.touch(x, y)
+            self.frontier.on_explored(x, y)
             # print(f"Victim removed at ({x}, {y}), grid updated to safe zone.")
 
     def add_pheromone(self, x: int, y: int, pheromone_type: str, message: str, timestamp: int,
                       intensity: float = 1.0) -> None:
         """Adds a pheromone with a specific type to a cell."""
-        self.pheromones[y][x].append({
+        self.pheromones.setdefault((x, y), []).append({
             'type': pheromone_type,
             'message': message,
             'timestamp': timestamp,
             'intensity': intensity
         })
+        self._add_type_cell(pheromone_type, x, y)
+        self.touch(x, y)
+        if self.on_pheromone is not None:
+            self.on_pheromone(x, y, pheromone_type, intensity)
 
     def pheromone_decay_function(self, intensity: float, age: int, decay_rate: float) -> float:
         """Calculate the new intensity of a pheromone based on its age and a decay rate."""
         return intensity * 0.9 ** (age / decay_rate)
 
     def age_pheromones(self, current_time: int, decay_rate: float = 100) -> None:
-        """Ages pheromones based on the current time, reducing their intensity according to the decay function."""
-        for y in range(self.height):
-            for x in range(self.width):
-                self.pheromones[y][x] = [
-                    {**pheromone, 'intensity': self.pheromone_decay_function(pheromone['intensity'],
-                                                                             current_time - pheromone['timestamp'],
-                                                                             decay_rate)}
-                    for pheromone in self.pheromones[y][x] if
-                    self.pheromone_decay_function(pheromone['intensity'], current_time - pheromone['timestamp'],
-                                                  decay_rate) > 0
-                ]
+        """
+        Ages pheromones based on the current time, reducing their intensity according to the decay function.
+        The pheromone lists are updated in place so perception caches holding them stay valid,
+        only cells that lose a pheromone are marked as changed.
+        """
+        for x, y in list(self.pheromone_cells):
+            cell = self.pheromones[(x, y)]
+            kept = []
+            for pheromone in cell:
+                intensity = self.pheromone_decay_function(pheromone['intensity'],
+                                                          current_time - pheromone['timestamp'], decay_rate)
+                if intensity > 0:
+                    pheromone['intensity'] = intensity
+                    kept.append(pheromone)
+            if len(kept) != len(cell):
+                self._replace_cell_pheromones(x, y, kept)
+
+    def advance_time(self, elapsed: int, decay_rate: float = 100, min_intensity: float = 0.01) -> None:
+        """
+        Decays every pheromone by the time elapsed since the last call, used by the discrete-event scheduler.
+        Unlike age_pheromones the decay does not depend on how often it is called, so idle stretches can be skipped.
+        :param elapsed: Simulation time elapsed since the previous call
+        :param decay_rate: Time units for the intensity to drop by 10%
+        :param min_intensity: Pheromones fading below this intensity are removed
+        """
+        if elapsed <= 0:
+            return
+        factor = self.pheromone_decay_function(1.0, elapsed, decay_rate)
+        for x, y in list(self.pheromone_cells):
+            cell = self.pheromones[(x, y)]
+            kept = []
+            for pheromone in cell:
+                pheromone['intensity'] *= factor
+                if pheromone['intensity'] >= min_intensity:
+                    kept.append(pheromone)
+            if len(kept) != len(cell):
+                self._replace_cell_pheromones(x, y, kept)
+
+    def set_pheromones(self, x: int, y: int, pheromones: List[Dict]) -> None:
+        """
+        Replaces every pheromone of a cell, e.g. with the copy another process holds of it.
+        The cell's list is updated in place like in age_pheromones, so perception caches holding it stay valid.
+        """
+        if (x, y) not in self.pheromones:
+            if not pheromones:
+                return
+            self.pheromones[(x, y)] = []
+        for pheromone_type in {pheromone['type'] for pheromone in pheromones}:
+            self._add_type_cell(pheromone_type, x, y)
+        self._replace_cell_pheromones(x, y, list(pheromones))
+
+    def _add_type_cell(self, pheromone_type: str, x: int, y: int) -> None:
+        cells = self.pheromone_type_cells[pheromone_type]
+        if (x, y) not in cells:
+            cells.add((x, y))
+            self.pheromone_type_versions[pheromone_type] += 1
+
+    def _replace_cell_pheromones(self, x: int, y: int, kept: List[Dict]) -> None:
+        """Replaces the content of a pheromone cell in place, keeping pheromone_cells and versions in sync."""
+        cell = self.pheromones[(x, y)]
+        for pheromone_type in {pheromone['type'] for pheromone in cell} - {pheromone['type'] for pheromone in kept}:
+            self.pheromone_type_cells[pheromone_type].discard((x, y))
+            self.pheromone_type_versions[pheromone_type] += 1
+        cell[:] = kept
+        if not kept:
+            del self.pheromones[(x, y)]
+        self.touch(x, y)
+
+    @staticmethod
+    def _positions_of(mask: np.ndarray) -> List[Tuple[int, int]]:
+        """(x, y) coordinates of the set cells of a layer mask, in row major order."""
+        ys, xs = np.nonzero(mask)
+        return list(zip(xs.tolist(), ys.tolist()))
 
     def get_victim_positions(self) -> List[Tuple[int, int]]:
         """Returns a list of coordinates for all victims."""
-        return [(x, y) for y in range(self.height) for x in range(self.width) if self.is_victim(x, y)]
+        return self._positions_of(self.grid == 2)
 
     def get_safe_zone_positions(self) -> List[Tuple[int, int]]:
         """Returns a list of coordinates for all safe zones."""
-        return [(x, y) for y in range(self.height) for x in range(self.width) if self.is_safe_zone(x, y)]
+        return self._positions_of(self.grid == 3)
 
     def decay_pheromones(self) -> None:
         """Decays the pheromones on the grid to simulate the passage of time."""
         decay_factor = 0.95  # Example decay rate
-        for y in range(self.height):
-            for x in range(self.width):
-                for pheromone in self.pheromones[y][x]:
-                    pheromone['intensity'] *= decay_factor
+        for cell in self.pheromones.values():
+            for pheromone in cell:
+                pheromone['intensity'] *= decay_factor
 
     def add_mountain(self, x: int, y: int) -> None:
         """Mark a cell as a mountain, impassable."""
-        self.obstacles[y][x] = {'type': 'mountain'}
+        self.terrain[y, x] = TERRAIN_MOUNTAIN
+        self.building_explored[y, x] = False
+        self.terrain_version += 1
+        self.touch(x, y)
+        self.frontier.on_blocked(x, y)
 
     def add_collapsed_building(self, x: int, y: int) -> None:
         """Mark a cell as a collapsed building, harder to explore."""
-        self.obstacles[y][x] = {'type': 'collapsed_building', 'explored': False}
+        self.terrain[y, x] = TERRAIN_COLLAPSED_BUILDING
+        self.building_explored[y, x] = False
+        self.terrain_version += 1
+        self.touch(x, y)
 
     def is_passable(self, x: int, y: int) -> bool:
         """Check if a cell is passable (not a mountain)."""
-        obstacle = self.obstacles[y][x]
-        return obstacle is None or obstacle['type'] != 'mountain'
+        return bool(self.terrain[y, x] != TERRAIN_MOUNTAIN)
 
     def get_mountain_positions(self) -> List[Tuple[int, int]]:
         """Returns a list of coordinates for all mountains."""
-        return [(x, y) for y in range(self.height) for x in range(self.width) if
-                self.obstacles[y][x] and self.obstacles[y][x]['type'] == 'mountain']
+        return self._positions_of(self.terrain == TERRAIN_MOUNTAIN)
 
     def explore_cell(self, x: int, y: int) -> int:
         """Returns the time taken to explore a cell, considering various obstacles."""
-        obstacle = self.obstacles[y][x]
-        if obstacle is None:
+        terrain = self.terrain[y, x]
+        if terrain == TERRAIN_OPEN:
             return 1  # Time taken to explore an empty cell
-        elif obstacle['type'] == 'collapsed_building' and not obstacle.get('explored', False):
-            obstacle['explored'] = True  # Mark as explored
+        elif terrain == TERRAIN_COLLAPSED_BUILDING and not self.building_explored[y, x]:
+            self.building_explored[y, x] = True  # Mark as explored
+            self.terrain_version += 1
+            self.touch(x, y)
+            self.frontier.on_explored(x, y)
             return 3  # Exploring a collapsed building requires more effort
-        elif obstacle['type'] == 'mountain':
+        elif terrain == TERRAIN_MOUNTAIN:
             return 0  # Mountains are impassable, thus cannot be explored
         return 1  # Default exploration time for any other condition
 
+    def exploration_cost(self, x: int, y: int) -> int:
+        """Returns the time explore_cell would take for a cell, without marking anything as explored."""
+        terrain = self.terrain[y, x]
+        if terrain == TERRAIN_OPEN:
+            return 1
+        elif terrain == TERRAIN_COLLAPSED_BUILDING and not self.building_explored[y, x]:
+            return 3
+        elif terrain == TERRAIN_MOUNTAIN:
+            return 0
+        return 1
+
+    def get_need_help_flow_field(self, extra_targets: Iterable[Tuple[int, int]] = (),
+                                 max_distance: Optional[int] = None) -> FlowField:
+        """
+        Returns the shared flow field toward every active 'Need Help' pheromone. It is only recomputed when the
+        'Need Help' cells or the terrain change, so any number of drones can read their next step from it for the
+        cost of one search.
+        :param extra_targets: Additional (x, y) targets, e.g. victims a drone knows about. Such a field is private to
+                              the caller and computed on every call, the shared one is left alone
+        :param max_distance: Cells further than this from every target are left unreachable
+        :return: The flow field
+        """
+        sources = self.pheromone_type_cells["need_help"]
+        extra_targets = frozenset(extra_targets)
+        if extra_targets:
+            return FlowField(self, extra_targets.union(sources), max_distance)
+        key = (self.pheromone_type_versions["need_help"], self.terrain_version, max_distance)
+        if self._need_help_field is None or self._need_help_field_key != key:
+            self._need_help_field = FlowField(self, sources, max_distance)
+            self._need_help_field_key = key
+        return self._need_help_field
+
     def get_recent_need_help_pheromones(self, x: int, y: int, radius: int, age_threshold: int, current_time: int) -> \
             List[Dict]:
         """
@@ -138,7 +487,7 @@ class Grid:
             for dx in range(-radius, radius + 1):
                 nx, ny = x + dx, y + dy
                 if 0 <= nx < self.width and 0 <= ny < self.height:
-                    for pheromone in self.pheromones[ny][nx]:
+                    for pheromone in self.get_pheromones(nx, ny):
                         if pheromone['type'] == 'need_help' and current_time - pheromone['timestamp'] <= age_threshold:
                             recent_pheromones.append(pheromone)
         return recent_pheromones
@@ -149,7 +498,7 @@ class Grid:
             for dx in range(-radius, radius + 1):
                 nx, ny = x + dx, y + dy
                 if 0 <= nx < self.width and 0 <= ny < self.height:
-                    if any(pheromone['type'] == 'trail' for pheromone in self.pheromones[ny][nx]):
+                    if any(pheromone['type'] == 'trail' for pheromone in self.get_pheromones(nx, ny)):
                         return True
         return False
 
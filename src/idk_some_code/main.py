@@ -1,22 +1,14 @@
 # main.py
-import random
 import sys
 sys.path.append('/src')
 
-import os
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
 
 import numpy as np
-from typing import List, Tuple
-import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
-from crewai import Agent, Task, Crew, Process
-from langchain_anthropic import ChatAnthropic
-try:
-    from global_code.singleton import State
-except ImportError:
-    from src.global_code.singleton import State
-
-os.environ["ANTHROPIC_API_KEY"] = State.config["ANTHROPIC_API_KEY"]
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+# matplotlib and the LLM stack are imported where they are used, a headless heuristic run never loads them
 try:
     from idk_some_code.drone import Drone
 except ImportError:
@@ -25,161 +17,373 @@ try:
     from idk_some_code.grid import Grid
 except ImportError:
     from grid import Grid
+try:
+    from idk_some_code.scheduler import EventScheduler
+except ImportError:
+    from scheduler import EventScheduler
+try:
+    from idk_some_code.swarm import SwarmIndex
+except ImportError:
+    from swarm import SwarmIndex
+try:
+    from idk_some_code.scenario import build_scenario
+except ImportError:
+    from scenario import build_scenario
+try:
+    from idk_some_code.procedural import build_procedural_scenario
+    from idk_some_code.scenario_cache import ScenarioCache
+except ImportError:
+    from procedural import build_procedural_scenario
+    from scenario_cache import ScenarioCache
+try:
+    from idk_some_code.random_streams import SimulationRandom
+except ImportError:
+    from random_streams import SimulationRandom
+try:
+    from idk_some_code.raster import COLORS, GridRaster
+except ImportError:
+    from raster import COLORS, GridRaster
+try:
+    from idk_some_code.trajectory import open_recorder
+    from idk_some_code.video import RawVideoWriter, frame_size, render_video, write_grid_frame
+except ImportError:
+    from trajectory import open_recorder
+    from video import RawVideoWriter, frame_size, render_video, write_grid_frame
+try:
+    from idk_some_code.profiler import PhaseProfiler
+except ImportError:
+    from profiler import PhaseProfiler
+try:
+    from idk_some_code.action_log import ActionReplay, load_replay, open_action_log
+except ImportError:
+    from action_log import ActionReplay, load_replay, open_action_log
+try:
+    from idk_some_code.results_store import ResultsStore
+except ImportError:
+    from results_store import ResultsStore
+try:
+    from idk_some_code.event_log import EventLogger, configure_logging
+except ImportError:
+    from event_log import EventLogger, configure_logging
+
+_log = EventLogger("simulation")
 
 
-def initialize_victims(grid: Grid, num_victims: int) -> None:
-    """Randomly places a specified number of victims on the grid."""
-    for _ in range(num_victims):
-        x, y = np.random.randint(0, grid.width), np.random.randint(0, grid.height)
-        while grid.is_obstacle(x, y) or grid.is_victim(x, y):
-            x, y = np.random.randint(0, grid.width), np.random.randint(0, grid.height)
-        grid.add_victim(x, y)
+def initialize_victims(grid: Grid, num_victims: int, rng: Optional[np.random.Generator] = None) -> None:
+    """Randomly places a specified number of victims on distinct free cells of the grid."""
+    build_scenario(grid, 0, 0, num_victims, rng)
 
 
 def simulate_disaster_response(grid_size: Tuple[int, int], num_drones: int, num_victims: int,
-                               simulation_time: int) -> None:
+                               simulation_time: int, policy: str = "llm", seed: Optional[int] = None,
+                               video_path: Optional[str] = None, downsample: int = 1, num_mountains: int = 0,
+                               num_buildings: int = 0, profiler: Optional[PhaseProfiler] = None,
+                               record_actions: Optional[str] = None, replay: Optional[ActionReplay] = None,
+                               results_store: Optional[ResultsStore] = None, exporter=None,
+                               run_id: Optional[str] = None, scenario: str = "random",
+                               scenario_cache: Optional[ScenarioCache] = None) -> Dict:
+    """
+    Runs a whole simulation without any visualization.
+    :param grid_size: Size of the grid (width, height)
+    :param num_drones: Number of drones, all starting in the middle of the grid
+    :param num_victims: Number of victims to place
+    :param simulation_time: Simulation time to run for
+    :param policy: Drone policy, 'llm', 'heuristic' or 'stub'
+    :param seed: Seed of the run, a random one is picked (and returned) if omitted
+    :param video_path: Optionally stream every tick to this video, see video_frames
+    :param downsample: Keep every n-th cell in the video
+    :param num_mountains: Number of mountains to place, never on the start cell
+    :param num_buildings: Number of collapsed buildings to place, never on the start cell
+    :param profiler: Optionally time every phase of every tick
+    :param record_actions: Optionally log every drone decision to this file, see replay_simulation
+    :param replay: Replays logged decisions instead of consulting the policy, see replay_simulation
+    :param results_store: Optionally store the metrics of every tick and drone, and of the run, see results_store.py
+    :param exporter: Optionally stream the run to Parquet, a parquet_export.ParquetExporter closed at the end
+    :param run_id: Identifies the run in the results store and the Parquet partitions, a random one if omitted
+    :param scenario: 'random' scatters obstacles and victims uniformly, 'procedural' generates mountain ranges,
+                     building districts and victims in the rubble, see procedural.py
+    :param scenario_cache: Optionally load procedural scenarios generated before from this cache
+    :return: Summary of the run
+    """
+    if scenario not in ("random", "procedural"):
+        raise ValueError(f"Unknown scenario '{scenario}', expected 'random' or 'procedural'")
+    if record_actions is not None and replay is not None:
+        raise ValueError("A replayed run can't record its actions again")
+    started = time.perf_counter()
+    streams = SimulationRandom(seed)
     grid = Grid(*grid_size)
-    drones: List[Drone] = [Drone(grid, (grid.width // 2, grid.height // 2)) for _ in range(num_drones)]
-
-    initialize_victims(grid, num_victims)
-
-    for current_time in range(simulation_time):
-        for drone in drones:
-            # Example simple behavior: Move randomly, then assess and act.
-            drone.agent_main()  # Call the agent_main function to decide and act
+    swarm = SwarmIndex()
+    parameters = {"grid_size": list(grid_size), "num_drones": num_drones, "num_victims": num_victims,
+                  "simulation_time": simulation_time, "policy": policy, "seed": streams.seed,
+                  "num_mountains": num_mountains, "num_buildings": num_buildings, "scenario": scenario}
+    action_log = replay
+    if record_actions is not None:
+        action_log = open_action_log(record_actions, parameters)
+    drones: List[Drone] = [Drone(grid, (grid.width // 2, grid.height // 2), policy=policy, swarm=swarm, rng=rng,
+                                 drone_id=index, action_log=action_log)
+                           for index, rng in enumerate(streams.drone_streams(num_drones))]
+
+    start_area = (grid.width // 2, grid.height // 2, 0)
+    if scenario == "procedural":
+        # The scenario seed comes from the run seed, so the same run seed hits the same cached scenario
+        scenario_seed = int(streams.generator("obstacles").integers(2 ** 63))
+        build_procedural_scenario(grid, num_mountains, num_buildings, num_victims, scenario_seed,
+                                  cache=scenario_cache, keep_clear=start_area)
+    else:
+        build_scenario(grid, num_mountains, num_buildings, 0, streams.generator("obstacles"), keep_clear=start_area)
+        initialize_victims(grid, num_victims, streams.generator("victims"))
+    victims_placed = len(grid.get_victim_positions())
+
+    # Every drone acts at its next decision time, busy drones are skipped until their work is done
+    # and pheromones decay by the time elapsed between decisions, assuming a decay rate of 100 time units
+    scheduler = schedule_drones(grid, drones)
+    observers = []
+    if results_store is not None or exporter is not None:
+        run_id = run_id or uuid.uuid4().hex[:16]
+    if results_store is not None:
+        observers.append(lambda tick: results_store.record_tick(run_id, tick, grid, drones, scheduler.decisions))
+    if exporter is not None:
+        exporter.attach(grid, drones, scheduler, run_id)
+        observers.append(exporter.record_tick)
+    try:
+        with ExitStack() as stack:
+            if profiler is not None:
+                stack.enter_context(profiler.instrumented())
+            if video_path is not None:
+                observers.insert(0, stack.enter_context(video_frames(grid, drones, video_path,
+                                                                     downsample=downsample)))
+            if profiler is not None:
+                profiler.run(scheduler, simulation_time, observers)
+            elif observers:
+                observe_ticks(scheduler, simulation_time, observers)
+            else:
+                scheduler.run_until(simulation_time)
+    finally:
+        if record_actions is not None:
+            action_log.close()
+        if exporter is not None:
+            exporter.close()
+
+    victims_left = len(grid.get_victim_positions())
+    summary = {"seed": streams.seed, "victims": victims_placed, "victims_rescued": victims_placed - victims_left,
+               "explored_cells": grid.explored_cells, "coverage": grid.explored_cells / (grid.width * grid.height),
+               "ticks": simulation_time, "decisions": scheduler.decisions}
+    if replay is not None:
+        summary["replayed_decisions"] = replay.replayed
+    if results_store is not None:
+        results_store.record_run(run_id, dict(parameters, width=grid.width, height=grid.height),
+                                 dict(summary, wall_time=time.perf_counter() - started))
+    if run_id is not None:
+        summary["run_id"] = run_id
+    return summary
+
+
+def replay_simulation(log_path: str, until: Optional[int] = None, simulation_time: Optional[int] = None,
+                      **kwargs) -> Dict:
+    """
+    Runs a recorded simulation again from its action log, with the logged decisions instead of model calls.
+    Decisions before until are replayed, after it the drones consult their policy again: fast-forwarding an 'llm'
+    run to a tick only pays for the model calls from that tick on.
+    :param log_path: Action log written with simulate_disaster_response(record_actions=...)
+    :param until: Stop replaying at this tick, replay the whole log if None
+    :param simulation_time: Simulation time to run for, the recorded run's by default
+    :param kwargs: Other simulate_disaster_response arguments, video_path or profiler for instance
+    :return: Summary of the run, replayed_decisions counts the decisions taken from the log
+    """
+    header, replay = load_replay(log_path, until)
+    return simulate_disaster_response(tuple(header["grid_size"]), header["num_drones"], header["num_victims"],
+                                      simulation_time if simulation_time is not None else header["simulation_time"],
+                                      header["policy"], header["seed"], num_mountains=header["num_mountains"],
+                                      num_buildings=header["num_buildings"], replay=replay,
+                                      scenario=header.get("scenario", "random"), **kwargs)
 
-            # Example of aging pheromones at a fixed rate, assuming a decay rate of 100 time units
-            grid.age_pheromones(current_time, 100)
 
-        # Optional: Add a call to a visualization function here to see the grid state
+def schedule_drones(grid: Grid, drones: List[Drone], decay_rate: float = 100) -> EventScheduler:
+    """
+    Creates the discrete-event scheduler driving the simulation, with every drone due at its start time.
+    :param grid: The simulation grid
+    :param drones: The drones to schedule
+    :param decay_rate: Pheromone decay rate
+    :return: The scheduler, advance it with run_until
+    """
+    scheduler = EventScheduler(grid, decay_rate)
+    for drone in drones:
+        scheduler.schedule(drone.start_time, drone)
+    return scheduler
 
 
-def generate_start_positions(center: Tuple[int, int], num_positions: int, spread: int) -> List[Tuple[int, int]]:
+def generate_start_positions(center: Tuple[int, int], num_positions: int, spread: int,
+                             rng: Optional[np.random.Generator] = None) -> List[Tuple[int, int]]:
     """
     Generate random start positions within a given spread around a center.
     :param center: Central starting position (x, y)
     :param num_positions: Number of positions to generate
     :param spread: The size of the area around the center to generate positions
+    :param rng: Seeded generator, a fresh unseeded one is used if omitted
     :return: List of start positions
     """
-    x_center, y_center = center
-    return [
-        (random.randint(x_center - spread, x_center + spread), random.randint(y_center - spread, y_center + spread))
-        for _ in range(num_positions)
-    ]
+    if rng is None:
+        rng = np.random.default_rng()
+    offsets = rng.integers(-spread, spread + 1, size=(num_positions, 2))
+    return [(center[0] + int(dx), center[1] + int(dy)) for dx, dy in offsets]
+
 
-def initialize_simulation(grid_size: Tuple[int, int], num_drones: int, num_mountains: int, num_buildings: int) -> Tuple[Grid, List[Drone]]:
+def initialize_simulation(grid_size: Tuple[int, int], num_drones: int, num_mountains: int, num_buildings: int,
+                          streams: Optional[SimulationRandom] = None) -> Tuple[Grid, List[Drone]]:
     """
     Set up the grid, drones, and obstacles.
     :param grid_size: Size of the grid (width, height)
     :param num_drones: Number of drones to initialize
     :param num_mountains: Number of mountains to place
     :param num_buildings: Number of buildings to place
+    :param streams: Random streams of the simulation, unseeded if omitted
     :return: Tuple containing the grid and list of drones
     """
+    if streams is None:
+        streams = SimulationRandom()
     grid = Grid(*grid_size)
-    initialize_obstacles(grid, num_mountains, num_buildings)
+    initialize_obstacles(grid, num_mountains, num_buildings, streams.generator("obstacles"))
     start_position = (grid.width // 2, grid.height // 2)
-    drone_positions = generate_start_positions(start_position, num_drones, 2)  # Spread of 2 allows for a 5x5 area
-    drones = [Drone(grid, position) for position in drone_positions]
+    # Spread of 2 allows for a 5x5 area
+    drone_positions = generate_start_positions(start_position, num_drones, 2, streams.generator("start_positions"))
+    swarm = SwarmIndex()
+    drones = [Drone(grid, position, swarm=swarm, rng=rng, drone_id=index)
+              for index, (position, rng) in enumerate(zip(drone_positions, streams.drone_streams(num_drones)))]
     return grid, drones
 
 
 def setup_visualization(grid, grid_size, drones):
-    """Prepare the matplotlib figure for the simulation."""
+    """
+    Prepare the matplotlib figure for the simulation.
+    The grid layers are a single raster image, only the drones are drawn as a scatter overlay.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.patches import Patch
+
     fig, ax = plt.subplots()
-    ax.set_xlim(0, grid_size[0])
-    ax.set_ylim(0, grid_size[1])
-    ax.set_facecolor('black')
+    ax.set_xlim(-0.5, grid_size[0] - 0.5)
+    ax.set_ylim(-0.5, grid_size[1] - 0.5)
 
-    # Plotting mountains
-    mountain_positions = np.array(grid.get_mountain_positions())
-    if mountain_positions.size > 0:
-        ax.scatter(mountain_positions[:, 0], mountain_positions[:, 1], s=100, color='brown', label='Mountains', zorder=1)
+    raster = GridRaster(grid)
+    grid_image = ax.imshow(raster.update(), origin='lower', interpolation='nearest',
+                           extent=(-0.5, grid.width - 0.5, -0.5, grid.height - 0.5), zorder=1)
 
     # Plotting drones
     drone_positions = np.array([drone.position for drone in drones])
     drone_scatter = ax.scatter(drone_positions[:, 0], drone_positions[:, 1], s=100, color='red', label='Drones', zorder=4)
 
-    # Initializing placeholders for safe zones, "Need Help", and "Area Cleared" pheromones
-    safe_zone_scatter = ax.scatter([], [], s=100, color='green', label='Safe Zones', zorder=2)
-    need_help_scatter = ax.scatter([], [], s=50, color='cyan', label='"Need Help" Pheromones', zorder=3)
-    area_cleared_scatter = ax.scatter([], [], s=50, color='pink', label='"Area Cleared" Pheromones', zorder=3)
+    legend_layers = [('mountain', 'Mountains'), ('collapsed_building', 'Collapsed Buildings'), ('victim', 'Victims'),
+                     ('safe_zone', 'Safe Zones'), ('need_help', '"Need Help" Pheromones'),
+                     ('area_cleared', '"Area Cleared" Pheromones')]
+    handles = [Patch(color=np.array(COLORS[layer]) / 255, label=label) for layer, label in legend_layers]
+    ax.legend(handles=[drone_scatter] + handles)
 
-    ax.legend()
+    return fig, ax, drone_scatter, grid_image, raster
 
-    return fig, ax, drone_scatter, safe_zone_scatter, need_help_scatter, area_cleared_scatter
 
+def update_visualization(frame, grid, drones, scheduler, drone_scatter, grid_image, raster):
+    """Update function for the animation, refreshing drone positions and repainting the cells that changed."""
 
-def update_visualization(frame, grid, drones, drone_scatter, safe_zone_scatter, need_help_scatter,
-                         area_cleared_scatter):
-    """Update function for the animation, refreshing drone positions, safe zones, and pheromones."""
-
-    # Simulate drone actions and update positions
-    for drone in drones:
-        # drone.assess_and_act(frame)  # Assuming this method updates the drone's position
-        drone.agent_main()
+    # Simulate every drone decision due up to this frame and update positions
+    scheduler.run_until(frame + 1)
 
     # Update drone positions on the plot
     drone_positions = np.array([drone.position for drone in drones])
     drone_scatter.set_offsets(drone_positions)
 
-    # Update safe zones
-    safe_zone_positions = np.array(grid.get_safe_zone_positions())
-    if safe_zone_positions.size > 0:
-        safe_zone_scatter.set_offsets(safe_zone_positions)
-    else:
-        safe_zone_scatter.set_offsets(np.empty((0, 2)))
-    # Update visualization for "Need Help" pheromones (similarly update for "Area Cleared" and other pheromones)
-    need_help_positions = np.array([
-        (x, y) for y in range(grid.height) for x in range(grid.width)
-        if any(pheromone['type'] == 'need_help' for pheromone in grid.get_pheromones(x, y))
-    ])
-    if need_help_positions.size > 0:
-        # Need help pheromone emitted
-        # print('hello')
-        need_help_scatter.set_offsets(need_help_positions)
-    else:
-        need_help_scatter.set_offsets(np.empty((0, 2)))
-
-    # Similarly update for "Area Cleared" pheromones...
-    area_cleared_positions = np.array([
-        (x, y) for y in range(grid.height) for x in range(grid.width)
-        if any(pheromone['type'] == 'area_cleared' for pheromone in grid.get_pheromones(x, y))
-    ])
-    if area_cleared_positions.size > 0:
-        # print("area cleared pheromone emitted at: ", area_cleared_positions, "at time: ", frame)
-        area_cleared_scatter.set_offsets(area_cleared_positions)
-    else:
-        area_cleared_scatter.set_offsets(np.empty((0, 2)))
-
-    # Don't forget to refresh or update other elements like safe zones if they change over time
+    # Safe zones, victims and pheromones all live in the raster, only changed cells get repainted
+    grid_image.set_data(raster.update())
 
-    return drone_scatter, safe_zone_scatter, need_help_scatter, area_cleared_scatter
+    return drone_scatter, grid_image
 
 
-def main():
+def main(show: bool = False):
+    """
+    Runs the demo scenario and saves it as a video, or with show animates it live in a matplotlib window instead.
+    """
     grid_size = (100, 100)
     num_drones = 4
     num_mountains = 50
     num_buildings = 500
     num_victims = 300
-    grid, drones = initialize_simulation(grid_size, num_drones, num_mountains, num_buildings)
+    configure_logging()
+    streams = SimulationRandom()
+    _log.info("started", seed=streams.seed)
+    grid, drones = initialize_simulation(grid_size, num_drones, num_mountains, num_buildings, streams)
+
+    initialize_victims(grid, num_victims, streams.generator("victims"))
+    scheduler = schedule_drones(grid, drones)
+
+    if show:
+        import matplotlib.pyplot as plt
+        from matplotlib.animation import FuncAnimation
+
+        fig, ax, drone_scatter, grid_image, raster = setup_visualization(grid, grid_size, drones)
+        # Matplotlib only keeps a weak reference to the animation, it has to stay alive while the window is open
+        animation = FuncAnimation(fig, update_visualization, frames=300, blit=True, repeat=False,
+                                  fargs=(grid, drones, scheduler, drone_scatter, grid_image, raster))
+        plt.show()
+        del animation
+        return
+
+    # Simulate first, logging every tick, then render the log on all cores without holding up the simulation
+    record_simulation(grid, drones, scheduler, 300, 'files/trajectory.log')
+    render_video('files/trajectory.log', 'files/animation.mp4', fps=30)
+    _log.info("saved", video='files/animation.mp4')
+
+
+def stream_simulation(grid: Grid, drones: List[Drone], scheduler: EventScheduler, num_ticks: int,
+                      output_path: str, fps: int = 30, downsample: int = 1) -> None:
+    """
+    Runs the simulation for num_ticks ticks, piping every tick straight to ffmpeg as a raw frame with one pixel per
+    (downsampled) cell. Meant for large grids where drawing a matplotlib figure per frame is the bottleneck.
+    """
+    with video_frames(grid, drones, output_path, fps, downsample) as write_frame:
+        observe_ticks(scheduler, num_ticks, [write_frame])
 
-    initialize_victims(grid, num_victims)
-    fig, ax, drone_scatter, safe_zone_scatter, need_help_scatter, area_cleared_scatter = setup_visualization(grid,
-                                                                                                             grid_size,
-                                                                                                             drones)
 
-    ani = FuncAnimation(fig, update_visualization,
-                        fargs=(grid, drones, drone_scatter, safe_zone_scatter, need_help_scatter, area_cleared_scatter),
-                        frames=np.arange(300), blit=True)
+@contextmanager
+def video_frames(grid: Grid, drones: List[Drone], output_path: str, fps: int = 30,
+                 downsample: int = 1) -> Iterator[Callable[[int], None]]:
+    """
+    Opens an ffmpeg video and yields a tick observer writing the current grid and drones as its next frame,
+    for observe_ticks or PhaseProfiler.run. The video is finished when the block exits.
+    """
+    raster = GridRaster(grid)
+    with RawVideoWriter(output_path, *frame_size(grid.width, grid.height, downsample), fps=fps) as writer:
+        yield lambda tick: write_grid_frame(writer, raster.update(), [drone.position for drone in drones],
+                                            downsample)
+
 
-    ani.save('files/animation.mp4', writer='ffmpeg', fps=30)
-    print("Simulation complete and saved.")
+def record_simulation(grid: Grid, drones: List[Drone], scheduler: EventScheduler, num_ticks: int,
+                      log_path: str) -> None:
+    """
+    Runs the simulation for num_ticks ticks, writing drone positions and changed cells of every tick to a log
+    that video.render_video turns into a video afterwards.
+    """
+    recorder = open_recorder(grid, log_path)
+    try:
+        for tick in range(num_ticks):
+            scheduler.run_until(tick + 1)
+            recorder.record(tick, drones)
+    finally:
+        recorder.close()
+
+
+def observe_ticks(scheduler: EventScheduler, num_ticks: int, observers: List[Callable[[int], None]]) -> None:
+    """
+    Runs the simulation for num_ticks ticks, calling every observer with the tick once it is done.
+    Observers only buffer (results store, Parquet exporter), the loop never waits on a database or disk.
+    """
+    for tick in range(num_ticks):
+        scheduler.run_until(tick + 1)
+        for observer in observers:
+            observer(tick)
 
 
 def refined_static_victim_visualization_test():
+    import matplotlib.pyplot as plt
+
     grid_size = (100, 100)
     num_victims = 10  # Adjust based on your setup
     grid = Grid(*grid_size)
@@ -210,19 +414,10 @@ def refined_static_victim_visualization_test():
     plt.savefig('files/plot.png')
 
 
-def initialize_obstacles(grid: Grid, num_mountains: int, num_buildings: int) -> None:
-    """Randomly place mountains and collapsed buildings on the grid."""
-    # Add mountains
-    for _ in range(num_mountains):
-        x, y = np.random.randint(0, grid.width), np.random.randint(0, grid.height)
-        grid.add_mountain(x, y)
-
-    # Add collapsed buildings
-    for _ in range(num_buildings):
-        x, y = np.random.randint(0, grid.width), np.random.randint(0, grid.height)
-        while not grid.is_passable(x, y):  # Ensure we don't place a building where a mountain is
-            x, y = np.random.randint(0, grid.width), np.random.randint(0, grid.height)
-        grid.add_collapsed_building(x, y)
+def initialize_obstacles(grid: Grid, num_mountains: int, num_buildings: int,
+                         rng: Optional[np.random.Generator] = None) -> None:
+    """Randomly place mountains and collapsed buildings on distinct free cells of the grid."""
+    build_scenario(grid, num_mountains, num_buildings, 0, rng)
 
 
 if __name__ == "__main__":
@@ -250,4 +445,4 @@ if __name__ == "__main__":
     # )
     # result = crew.kickoff()
     # print(result)
-    main()
+    main(show="--show" in sys.argv)
@@ -0,0 +1,198 @@
+# parquet_export.py
+"""
+Streams a running simulation to partitioned Parquet files: drone positions, tool actions, pheromone emissions and
+grid KPIs, one dataset each.
+
+    out/positions/run_id=<run>/part-00000.parquet
+    out/actions/run_id=<run>/part-00000.parquet
+    out/pheromones/run_id=<run>/...
+    out/kpis/run_id=<run>/...
+
+Rows are buffered as columns and written as one row group once row_group_size of them piled up, so memory stays
+bounded however long the run is. A new part file is started every ticks_per_file ticks, finished parts can be read
+while the run goes on. Read a dataset back with
+
+    pyarrow.dataset.dataset("out/positions", partitioning="hive").to_table(filter=...)
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from idk_some_code.grid import Grid
+    from idk_some_code.scheduler import EventScheduler
+except ImportError:
+    from grid import Grid
+    from scheduler import EventScheduler
+
+SCHEMAS: Dict[str, pa.Schema] = {
+    "positions": pa.schema([("tick", pa.int64()), ("drone_id", pa.int32()), ("x", pa.int32()), ("y", pa.int32())]),
+    "actions": pa.schema([("tick", pa.int64()), ("drone_id", pa.int32()), ("action", pa.string()),
+                          ("arg0", pa.int32()), ("arg1", pa.int32())]),
+    "pheromones": pa.schema([("tick", pa.int64()), ("x", pa.int32()), ("y", pa.int32()), ("type", pa.string()),
+                             ("intensity", pa.float32())]),
+    "kpis": pa.schema([("tick", pa.int64()), ("explored_cells", pa.int64()), ("victims_left", pa.int64()),
+                       ("pheromone_cells", pa.int64()), ("decisions", pa.int64())]),
+}
+
+
+class _TableBuffer:
+    """Columns of one table waiting to be written, as numpy chunks (whole ticks) or single rows (events)."""
+
+    def __init__(self, schema: pa.Schema) -> None:
+        self.schema = schema
+        self.rows = 0
+        self._chunks: List[List[np.ndarray]] = [[] for _ in schema]
+        self._values: List[list] = [[] for _ in schema]
+
+    def add_columns(self, *columns: np.ndarray) -> None:
+        for chunks, column in zip(self._chunks, columns):
+            chunks.append(column)
+        self.rows += len(columns[0])
+
+    def add_row(self, *values) -> None:
+        for column, value in zip(self._values, values):
+            column.append(value)
+        self.rows += 1
+
+    def take(self) -> pa.RecordBatch:
+        """The buffered rows as a record batch, emptying the buffer."""
+        arrays = []
+        for field, chunks, values in zip(self.schema, self._chunks, self._values):
+            if chunks:
+                arrays.append(pa.array(np.concatenate(chunks), type=field.type))
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        self._chunks = [[] for _ in self.schema]
+        self._values = [[] for _ in self.schema]
+        self.rows = 0
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+class ParquetExporter:
+    """
+    Streaming exporter of one simulation run, see attach and record_tick.
+    Actions are seen the way action_log.py sees them: the exporter takes the drones' action_log slot and passes
+    everything on to the recorder or replay that was there.
+    """
+
+    def __init__(self, directory: str, row_group_size: int = 1 << 20, ticks_per_file: int = 10000,
+                 compression: str = "zstd") -> None:
+        """
+        :param directory: Root of the datasets, one sub directory per table
+        :param row_group_size: Rows of a table buffered before they are written as a row group
+        :param ticks_per_file: Ticks per part file
+        :param compression: Parquet compression codec
+        """
+        self.directory = directory
+        self.row_group_size = row_group_size
+        self.ticks_per_file = ticks_per_file
+        self.compression = compression
+        self.run_id: Optional[str] = None
+        self.files: List[str] = []
+        self._buffers = {table: _TableBuffer(schema) for table, schema in SCHEMAS.items()}
+        self._writers: Dict[str, pq.ParquetWriter] = {}
+        self._part = 0
+        self._grid: Optional[Grid] = None
+        self._drones: List = []
+        self._drone_ids: Optional[np.ndarray] = None
+        self._scheduler: Optional[EventScheduler] = None
+        # Action log state, same protocol as action_log.ActionRecorder
+        self.inner = None
+        self._consulting = None
+        self._tick = 0
+        self._captured: List[bool] = []  # Per open action: whether inner captured it too
+
+    def attach(self, grid: Grid, drones: List, scheduler: EventScheduler, run_id: str) -> None:
+        """
+        Starts exporting a simulation: hooks the grid's pheromone emissions and the drones' actions.
+        :param run_id: Partition of this run in every dataset
+        """
+        self.run_id = run_id
+        self._grid = grid
+        self._drones = drones
+        self._drone_ids = np.array([index if drone.drone_id is None else drone.drone_id
+                                    for index, drone in enumerate(drones)], dtype=np.int32)
+        self._scheduler = scheduler
+        grid.on_pheromone = self._on_pheromone
+        self.inner = drones[0].action_log if drones else None
+        for drone in drones:
+            drone.action_log = self
+
+    def record_tick(self, tick: int) -> None:
+        """Adds the drone positions and grid KPIs after a tick, starting a new part file when the tick calls for it."""
+        positions = np.array([drone.position for drone in self._drones], dtype=np.int32).reshape(-1, 2)
+        self._add_columns("positions", np.full(len(positions), tick, dtype=np.int64), self._drone_ids,
+                          positions[:, 0], positions[:, 1])
+        grid = self._grid
+        self._add_row("kpis", tick, grid.explored_cells, int(np.count_nonzero(grid.grid == 2)),
+                      len(grid.pheromones), self._scheduler.decisions)
+        if (tick + 1) // self.ticks_per_file != tick // self.ticks_per_file:
+            self._close_part()
+            self._part = (tick + 1) // self.ticks_per_file
+
+    def close(self) -> None:
+        """Ends the run: writes whatever is buffered, closes the files and unhooks the grid. attach starts another."""
+        self._close_part()
+        if self._grid is not None and self._grid.on_pheromone == self._on_pheromone:
+            self._grid.on_pheromone = None
+        for drone in self._drones:
+            drone.action_log = self.inner
+        self._part = 0
+        self._grid, self._drones, self._scheduler, self.inner = None, [], None, None
+
+    def consult(self, drone, tick: int) -> bool:
+        self._consulting = drone
+        self._tick = tick
+        return self.inner is not None and self.inner.consult(drone, tick)
+
+    def capture(self, drone, action: str, args: Tuple) -> bool:
+        inner_captured = self.inner is not None and self.inner.capture(drone, action, args)
+        exported = not self._captured and drone is self._consulting
+        if exported:
+            padded = (tuple(args) + (None, None))[:2]
+            self._add_row("actions", self._tick, drone.drone_id, action, *padded)
+        if not (exported or inner_captured):
+            return False
+        self._captured.append(inner_captured)
+        return True
+
+    def release(self) -> None:
+        if self._captured.pop():
+            self.inner.release()
+
+    def _on_pheromone(self, x: int, y: int, pheromone_type: str, intensity: float) -> None:
+        self._add_row("pheromones", self._scheduler.now, x, y, pheromone_type, intensity)
+
+    def _add_columns(self, table: str, *columns: np.ndarray) -> None:
+        buffer = self._buffers[table]
+        buffer.add_columns(*columns)
+        if buffer.rows >= self.row_group_size:
+            self._write(table)
+
+    def _add_row(self, table: str, *values) -> None:
+        buffer = self._buffers[table]
+        buffer.add_row(*values)
+        if buffer.rows >= self.row_group_size:
+            self._write(table)
+
+    def _write(self, table: str) -> None:
+        writer = self._writers.get(table)
+        if writer is None:
+            directory = os.path.join(self.directory, table, f"run_id={self.run_id}")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{self._part:05d}.parquet")
+            writer = self._writers[table] = pq.ParquetWriter(path, SCHEMAS[table], compression=self.compression)
+            self.files.append(path)
+        writer.write_batch(self._buffers[table].take(), row_group_size=self.row_group_size)
+
+    def _close_part(self) -> None:
+        for table, buffer in self._buffers.items():
+            if buffer.rows:
+                self._write(table)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
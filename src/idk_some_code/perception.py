@@ -0,0 +1,169 @@
+# perception.py
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    from idk_some_code.grid import Grid
+except ImportError:
+    from grid import Grid
+
+Rect = Tuple[int, int, int, int]  # x0, x1, y0, y1 (half open, clipped to the grid)
+
+
+class PerceptionWindow:
+    """
+    Incrementally maintained view of the pheromones in a square window around a drone.
+    When the drone moves one cell only the entering row/column is read from the grid and the leaving one is dropped.
+    Cells inside the window are only re-read when the grid changed them since the last sync, found through the grid's
+    change journal, so the per-move cost scales with the window's perimeter and the changes made instead of its area.
+    """
+
+    def __init__(self, grid: Grid, radius: int = 10) -> None:
+        """
+        :param grid: The grid the drone lives on
+        :param radius: Half size of the window, every query is answered for a radius up to this one
+        """
+        self.grid = grid
+        self.radius = radius
+        self.center: Optional[Tuple[int, int]] = None
+        self.cells_read = 0  # Number of cells read from the grid, handy to check the window stays cheap
+        self._rect: Optional[Rect] = None
+        self._occupied: Dict[Tuple[int, int], List[Dict]] = {}  # Only cells holding at least one pheromone
+        self._synced_version = -1
+
+    def update(self, center: Tuple[int, int]) -> None:
+        """
+        Moves the window to a new center and brings it up to date with the grid.
+        :param center: The (x, y) coordinates of the drone
+        """
+        new_rect = self._rect_around(center)
+        if self._rect is None:
+            self._read_rect(new_rect)
+            self._synced_version = self.grid.version
+        elif new_rect != self._rect:
+            for rect in self._rect_difference(self._rect, new_rect):
+                self._drop_rect(rect)
+            for rect in self._rect_difference(new_rect, self._rect):
+                self._read_rect(rect)
+        self.center = center
+        self._rect = new_rect
+        self._sync_changed_cells()
+
+    def pheromones_at(self, x: int, y: int) -> List[Dict]:
+        """Returns the pheromones of a cell inside the window."""
+        return self._occupied.get((x, y), [])
+
+    def pheromones_square(self, visibility: Optional[int] = None) -> Dict[str, List[Dict]]:
+        """
+        Same result as Grid.get_pheromones_square, answered from the window.
+        :param visibility: The visibility range, defaults to the window radius
+        :return: A dictionary categorizing the pheromones based on relative direction.
+        """
+        x_center, y_center = self.center
+        pheromones_info = {
+            "N": [], "S": [], "E": [], "W": [],
+            "NE": [], "NW": [], "SE": [], "SW": []
+        }
+        for (x, y) in self._cells_in_range(visibility):
+            direction = self.grid._get_relative_direction(x_center, y_center, x, y)
+            pheromones_info[direction].extend(self._occupied[(x, y)])
+        return pheromones_info
+
+    def pheromone_counts(self, pheromone_types: Tuple[str, ...], visibility: Optional[int] = None) -> \
+            Dict[str, Dict[str, int]]:
+        """
+        Counts pheromones of the given types per relative direction.
+        :param pheromone_types: The pheromone types to count
+        :param visibility: The visibility range, defaults to the window radius
+        :return: {direction: {pheromone_type: count}}
+        """
+        x_center, y_center = self.center
+        counts = {direction: {pheromone_type: 0 for pheromone_type in pheromone_types}
+                  for direction in ("N", "S", "E", "W", "NE", "NW", "SE", "SW")}
+        for (x, y) in self._cells_in_range(visibility):
+            direction_counts = counts[self.grid._get_relative_direction(x_center, y_center, x, y)]
+            for pheromone in self._occupied[(x, y)]:
+                if pheromone['type'] in direction_counts:
+                    direction_counts[pheromone['type']] += 1
+        return counts
+
+    def cells_with(self, pheromone_type: str, visibility: Optional[int] = None) -> Set[Tuple[int, int]]:
+        """Returns the coordinates of every cell in range holding a pheromone of the given type."""
+        return {cell for cell in self._cells_in_range(visibility)
+                if any(pheromone['type'] == pheromone_type for pheromone in self._occupied[cell])}
+
+    def _cells_in_range(self, visibility: Optional[int]) -> List[Tuple[int, int]]:
+        """Occupied cells within the visibility range, in row major order like Grid.get_pheromones_square."""
+        x_center, y_center = self.center
+        if visibility is None or visibility >= self.radius:
+            cells = list(self._occupied)
+        else:
+            cells = [(x, y) for (x, y) in self._occupied
+                     if abs(x - x_center) <= visibility and abs(y - y_center) <= visibility]
+        cells.sort(key=lambda cell: (cell[1], cell[0]))
+        return cells
+
+    def _rect_around(self, center: Tuple[int, int]) -> Rect:
+        x, y = center
+        return (max(0, x - self.radius), min(self.grid.width, x + self.radius + 1),
+                max(0, y - self.radius), min(self.grid.height, y + self.radius + 1))
+
+    @staticmethod
+    def _rect_difference(a: Rect, b: Rect) -> List[Rect]:
+        """Splits the cells of rect a that are not in rect b into at most 4 rects."""
+        ax0, ax1, ay0, ay1 = a
+        bx0, bx1, by0, by1 = b
+        ix0, ix1, iy0, iy1 = max(ax0, bx0), min(ax1, bx1), max(ay0, by0), min(ay1, by1)
+        if ix0 >= ix1 or iy0 >= iy1:
+            return [a]
+        rects = [
+            (ax0, ax1, ay0, iy0),  # Rows above the intersection
+            (ax0, ax1, iy1, ay1),  # Rows below the intersection
+            (ax0, ix0, iy0, iy1),  # Left of the intersection
+            (ix1, ax1, iy0, iy1),  # Right of the intersection
+        ]
+        return [(x0, x1, y0, y1) for (x0, x1, y0, y1) in rects if x0 < x1 and y0 < y1]
+
+    def _read_cell(self, x: int, y: int) -> None:
+        pheromones = self.grid.get_pheromones(x, y)
+        if pheromones:
+            self._occupied[(x, y)] = pheromones
+        else:
+            self._occupied.pop((x, y), None)
+        self.cells_read += 1
+
+    def _read_rect(self, rect: Rect) -> None:
+        x0, x1, y0, y1 = rect
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                self._read_cell(x, y)
+
+    def _drop_rect(self, rect: Rect) -> None:
+        x0, x1, y0, y1 = rect
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                self._occupied.pop((x, y), None)
+
+    def _sync_changed_cells(self) -> None:
+        """
+        Re-reads the cells of the window whose grid contents changed since the last sync.
+        The cells come from the grid's change journal, so the cost follows the number of changes since the last sync
+        rather than the window's area. Only when the journal no longer reaches back that far, or holds more changes
+        than the window has cells, the cell_versions stamps of the window are compared instead.
+        """
+        grid = self.grid
+        if grid.version == self._synced_version:
+            return
+        x0, x1, y0, y1 = self._rect
+        changes = grid.changes_since(self._synced_version)
+        if changes is None or changes.size > (x1 - x0) * (y1 - y0):
+            changed_ys, changed_xs = np.nonzero(grid.cell_versions[y0:y1, x0:x1] > self._synced_version)
+            cells = zip((changed_xs + x0).tolist(), (changed_ys + y0).tolist())
+        else:
+            ys, xs = np.divmod(changes, grid.width)
+            inside = (xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)
+            cells = set(zip(xs[inside].tolist(), ys[inside].tolist()))
+        for x, y in cells:
+            self._read_cell(x, y)
+        self._synced_version = grid.version
@@ -0,0 +1,66 @@
+# planner.py
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from idk_some_code.grid import Grid
+except ImportError:
+    from grid import Grid
+
+NEIGHBOUR_OFFSETS = ((0, -1), (0, 1), (-1, 0), (1, 0))  # up, down, left, right, the moves a drone can make
+
+
+def plan_path(grid: Grid, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+    """
+    A* search over passable cells using single-cell moves.
+    Entering a cell costs what exploring it would (Grid.exploration_cost), so unexplored collapsed buildings
+    are avoided when a cheaper way around exists and mountains are never crossed.
+    :param grid: The grid to plan on
+    :param start: The (x, y) the drone is at
+    :param goal: The (x, y) the drone wants to reach
+    :return: The cells to visit in order (start excluded, goal included), [] if already there,
+             None if the goal can't be reached
+    """
+    if start == goal:
+        return []
+    goal_x, goal_y = goal
+    if not (0 <= goal_x < grid.width and 0 <= goal_y < grid.height) or not grid.is_passable(goal_x, goal_y):
+        return None
+
+    def heuristic(cell: Tuple[int, int]) -> int:
+        # Manhattan distance, admissible because entering any cell costs at least 1
+        return abs(cell[0] - goal_x) + abs(cell[1] - goal_y)
+
+    sequence = itertools.count()  # Tie breaker so cells never get compared
+    open_heap = [(heuristic(start), next(sequence), start)]
+    best_cost: Dict[Tuple[int, int], int] = {start: 0}
+    came_from: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    while open_heap:
+        _, _, cell = heapq.heappop(open_heap)
+        if cell == goal:
+            path = [cell]
+            while path[-1] in came_from:
+                path.append(came_from[path[-1]])
+            path.pop()  # Drop the start cell
+            path.reverse()
+            return path
+        cost = best_cost[cell]
+        x, y = cell
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < grid.width and 0 <= ny < grid.height) or not grid.is_passable(nx, ny):
+                continue
+            new_cost = cost + grid.exploration_cost(nx, ny)
+            neighbour = (nx, ny)
+            if new_cost < best_cost.get(neighbour, new_cost + 1):
+                best_cost[neighbour] = new_cost
+                came_from[neighbour] = cell
+                heapq.heappush(open_heap, (new_cost + heuristic(neighbour), next(sequence), neighbour))
+    return None
+
+
+def path_cost(grid: Grid, path: List[Tuple[int, int]]) -> int:
+    """Total cost of following a path returned by plan_path."""
+    return sum(grid.exploration_cost(x, y) for x, y in path)
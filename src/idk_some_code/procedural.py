@@ -0,0 +1,160 @@
+# procedural.py
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    from idk_some_code.grid import Grid
+    from idk_some_code.scenario import apply_scenario
+    from idk_some_code.scenario_cache import ScenarioCache
+except ImportError:
+    from grid import Grid
+    from scenario import apply_scenario
+    from scenario_cache import ScenarioCache
+
+# Bumped whenever the generator changes its output, so cached scenarios of older versions are not reused
+GENERATOR_VERSION = 1
+
+
+def fractal_noise(width: int, height: int, feature_size: float, rng: np.random.Generator,
+                  octaves: int = 4) -> np.ndarray:
+    """
+    Smooth value noise in [0, 1], summed over octaves of halving feature size.
+    Every octave is a coarse random lattice interpolated up to the full grid, one row pass then one column pass.
+    :param width: Width of the noise map
+    :param height: Height of the noise map
+    :param feature_size: Lattice spacing in cells of the first octave, roughly the size of a hill
+    :param rng: The generator to draw the lattices with
+    :param octaves: Number of octaves
+    :return: (height, width) float32 array
+    """
+    total = np.zeros((height, width), dtype=np.float32)
+    amplitude, amplitude_sum = 1.0, 0.0
+    for octave in range(octaves):
+        spacing = max(feature_size / 2 ** octave, 1.0)
+        lattice = rng.random((int(height / spacing) + 2, int(width / spacing) + 2), dtype=np.float32)
+        x0, fx = _lattice_coordinates(width, spacing)
+        y0, fy = _lattice_coordinates(height, spacing)
+        rows = lattice[:, x0] * (1 - fx) + lattice[:, x0 + 1] * fx
+        total += amplitude * (rows[y0] * (1 - fy)[:, None] + rows[y0 + 1] * fy[:, None])
+        amplitude_sum += amplitude
+        amplitude *= 0.5
+    return total / amplitude_sum
+
+
+def _lattice_coordinates(size: int, spacing: float):
+    """Lattice cell index and smoothstepped offset inside it for every position along one axis."""
+    position = np.arange(size, dtype=np.float32) / spacing
+    index = position.astype(np.int64)
+    offset = position - index
+    return index, offset * offset * (3 - 2 * offset)
+
+
+def district_density(width: int, height: int, num_districts: int, district_radius: float,
+                     rng: np.random.Generator) -> np.ndarray:
+    """
+    Sum of Gaussian blobs around randomly placed district centers, 1 at a center.
+    Each blob is the outer product of a row and a column profile, so it never needs per-cell distances.
+    :return: (height, width) float32 array
+    """
+    density = np.zeros((height, width), dtype=np.float32)
+    xs, ys = np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32)
+    centers_x = rng.uniform(0, width, num_districts)
+    centers_y = rng.uniform(0, height, num_districts)
+    for center_x, center_y in zip(centers_x, centers_y):
+        column = np.exp(-((ys - center_y) ** 2) / (2 * district_radius ** 2))
+        row = np.exp(-((xs - center_x) ** 2) / (2 * district_radius ** 2))
+        density += np.outer(column, row)
+    return density
+
+
+def _weighted_sample(weights: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws count distinct cells, each with probability proportional to its weight, in one vectorized pass
+    (Efraimidis-Spirakis: the count largest u ** (1 / weight) keys win). Zero weight cells are never drawn.
+    :return: Flat indices of the drawn cells
+    """
+    weights = weights.reshape(-1)
+    candidates = np.flatnonzero(weights > 0)
+    count = min(count, candidates.size)
+    if count == 0:
+        return np.empty(0, dtype=np.int64)
+    keys = np.log(rng.random(candidates.size)) / weights[candidates]
+    return candidates[np.argpartition(keys, candidates.size - count)[candidates.size - count:]]
+
+
+def generate_procedural_scenario(width: int, height: int, num_mountains: int, num_buildings: int,
+                                 num_victims: int, seed: int, mountain_feature_size: float = 48,
+                                 num_districts: int = 6, district_radius: Optional[float] = None,
+                                 victims_in_rubble: float = 4.0) -> Dict[str, np.ndarray]:
+    """
+    Generates a disaster area with structure instead of uniform noise:
+    mountains follow the ridges of a fractal noise map, collapsed buildings cluster in a few districts and victims
+    are most likely inside and around collapsed buildings.
+    :param width: Width of the area
+    :param height: Height of the area
+    :param num_mountains: Number of mountain cells
+    :param num_buildings: Number of collapsed building cells
+    :param num_victims: Number of victims
+    :param seed: Seed, the same parameters and seed always give the same scenario
+    :param mountain_feature_size: Rough size in cells of a mountain range
+    :param num_districts: Number of city districts the collapsed buildings cluster in
+    :param district_radius: Spread of a district in cells, an eighth of the smaller side by default
+    :param victims_in_rubble: How much more likely a victim is on a collapsed building than on open ground nearby
+    :return: Flat (row major) indices of the 'mountains', 'buildings' and 'victims' cells
+    """
+    rng = np.random.default_rng(seed)
+    if district_radius is None:
+        district_radius = max(min(width, height) / 8, 1.0)
+
+    # Ridged noise peaks along thin lines, its highest cells form mountain ranges rather than round hills
+    ridges = 1 - np.abs(2 * fractal_noise(width, height, mountain_feature_size, rng) - 1)
+    num_mountains = min(num_mountains, ridges.size)
+    mountains = np.argpartition(ridges.reshape(-1), ridges.size - num_mountains)[ridges.size - num_mountains:]
+    open_ground = np.ones(width * height, dtype=bool)
+    open_ground[mountains] = False
+
+    density = district_density(width, height, num_districts, district_radius, rng).reshape(-1)
+    buildings = _weighted_sample(density * open_ground, num_buildings, rng)
+
+    # A little background weight so victims also turn up away from the districts
+    victim_weights = (density + 0.05 * density.max(initial=0.0) + 1e-6) * open_ground
+    victim_weights[buildings] *= victims_in_rubble
+    victims = _weighted_sample(victim_weights, num_victims, rng)
+    return {"mountains": mountains, "buildings": buildings, "victims": victims}
+
+
+def build_procedural_scenario(grid: Grid, num_mountains: int, num_buildings: int, num_victims: int, seed: int,
+                              cache: Optional[ScenarioCache] = None,
+                              keep_clear: Optional[Tuple[int, int, int]] = None, **params) -> None:
+    """
+    Fills a grid with a procedural scenario, loading it from the cache when it was generated before.
+    :param grid: The grid to fill
+    :param num_mountains: Number of mountain cells
+    :param num_buildings: Number of collapsed building cells
+    :param num_victims: Number of victims
+    :param seed: Scenario seed
+    :param cache: Optional on-disk scenario cache
+    :param keep_clear: Optional (x, y, radius) square left free of obstacles and victims, e.g. the drones' start area.
+                       Applied after loading, so it doesn't change which scenario is cached
+    :param params: Extra generate_procedural_scenario parameters
+    """
+    key_params = dict(params, generator="procedural", version=GENERATOR_VERSION, width=grid.width,
+                      height=grid.height, num_mountains=num_mountains, num_buildings=num_buildings,
+                      num_victims=num_victims, seed=seed)
+
+    def generate() -> Dict[str, np.ndarray]:
+        return generate_procedural_scenario(grid.width, grid.height, num_mountains, num_buildings, num_victims, seed,
+                                            **params)
+
+    layers = cache.get_or_create(key_params, generate) if cache is not None else generate()
+    if keep_clear is not None:
+        layers = {name: _outside_square(cells, grid.width, keep_clear) for name, cells in layers.items()}
+    apply_scenario(grid, layers["mountains"], layers["buildings"], layers["victims"])
+
+
+def _outside_square(cells: np.ndarray, width: int, square: Tuple[int, int, int]) -> np.ndarray:
+    """The flat cell indices that lie outside an (x, y, radius) square."""
+    x, y, radius = square
+    inside = (np.abs(cells % width - x) <= radius) & (np.abs(cells // width - y) <= radius)
+    return cells[~inside]
@@ -0,0 +1,215 @@
+# profiler.py
+import cProfile
+import functools
+import os
+from contextlib import contextmanager
+from time import perf_counter_ns
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    from idk_some_code.drone import Drone
+    from idk_some_code.grid import Grid
+    from idk_some_code.perception import PerceptionWindow
+    from idk_some_code.raster import GridRaster
+    from idk_some_code.scheduler import EventScheduler
+    from idk_some_code.video import RawVideoWriter
+except ImportError:
+    from drone import Drone
+    from grid import Grid
+    from perception import PerceptionWindow
+    from raster import GridRaster
+    from scheduler import EventScheduler
+    from video import RawVideoWriter
+
+# Methods timed by PhaseProfiler.instrumented, by tick phase
+PHASE_METHODS: Dict[str, List[Tuple[type, str]]] = {
+    "perception": [(Drone, "update_perceptions"), (Grid, "get_pheromones_square"), (PerceptionWindow, "update")],
+    "decision": [(Drone, "assess_and_act"), (Drone, "agent_main")],
+    "action": [(Drone, "move"), (Drone, "emit_pheromone"), (Drone, "explore_current_cell")],
+    "decay": [(Grid, "age_pheromones"), (Grid, "advance_time")],
+    "render": [(GridRaster, "update"), (RawVideoWriter, "write")],
+}
+
+# Sub-buckets per power of two, durations land in buckets at most 1/16 (about 6%) wide
+_SUB_BITS = 4
+_SUB_MASK = (1 << _SUB_BITS) - 1
+
+
+def _bucket(ns: int) -> int:
+    """Log-linear histogram bucket of a duration, exact below 32 ns."""
+    bits = ns.bit_length()
+    if bits <= _SUB_BITS + 1:
+        return ns
+    return ((bits - _SUB_BITS) << _SUB_BITS) | ((ns >> (bits - _SUB_BITS - 1)) & _SUB_MASK)
+
+
+def _bucket_bounds(bucket: int) -> Tuple[int, int]:
+    """[low, high) durations of a bucket."""
+    if bucket < 2 << _SUB_BITS:
+        return bucket, bucket + 1
+    shift = (bucket >> _SUB_BITS) - 1
+    low = ((1 << _SUB_BITS) | (bucket & _SUB_MASK)) << shift
+    return low, low + (1 << shift)
+
+
+class Histogram:
+    """
+    Fixed size log-linear histogram of durations in nanoseconds.
+    Recording is an integer bucket computation and an increment, memory does not grow with the number of samples.
+    """
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (64 << _SUB_BITS)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns: int) -> None:
+        self.counts[_bucket(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, percent: float) -> float:
+        """Duration below which percent of the samples fall, the middle of its bucket, 0 when empty."""
+        if self.count == 0:
+            return 0.0
+        rank = max(percent / 100 * self.count, 1)
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                low, high = _bucket_bounds(bucket)
+                return min((low + high - 1) / 2, self.max)
+        return float(self.max)
+
+
+class PhaseProfiler:
+    """
+    Times the phases of simulation ticks (perception, decision, action, decay, render) with perf_counter_ns.
+    Phases nest, each one is charged its own time only: a move calling update_perceptions counts as action for the
+    move itself and as perception for the update. Whatever no phase covers is charged to 'other'.
+    Chosen ticks can also be captured with cProfile, the .prof files load into snakeviz or flameprof as flame graphs.
+    """
+
+    def __init__(self, capture_ticks: Iterable[int] = (), capture_dir: Optional[str] = None) -> None:
+        """
+        :param capture_ticks: Ticks run under cProfile, see run
+        :param capture_dir: Where the captures are written, the current directory by default
+        """
+        self.histograms: Dict[str, Histogram] = {}
+        self.capture_ticks = set(capture_ticks)
+        self.capture_dir = capture_dir or "."
+        self.captures: List[str] = []
+        self._stack: List[List] = []  # [phase, start, time spent in nested phases]
+
+    def start(self, phase: str) -> None:
+        self._stack.append([phase, perf_counter_ns(), 0])
+
+    def stop(self) -> None:
+        phase, started, nested = self._stack.pop()
+        elapsed = perf_counter_ns() - started
+        self.record(phase, elapsed - nested)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def record(self, phase: str, ns: int) -> None:
+        """Adds a duration to a phase."""
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = Histogram()
+        histogram.record(ns)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times the block as the named phase."""
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def timed(self, phase: str, function: Callable) -> Callable:
+        """Wraps a function so every call is timed as the phase."""
+        start, stop = self.start, self.stop
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start(phase)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                stop()
+
+        return wrapper
+
+    @contextmanager
+    def instrumented(self, phase_methods: Optional[Dict[str, List[Tuple[type, str]]]] = None) -> Iterator[None]:
+        """
+        Times the phase methods of every instance while the block runs, the classes are restored afterwards.
+        Outside the block the methods are the plain ones, so an idle profiler costs nothing.
+        :param phase_methods: Classes and method names by phase, PHASE_METHODS by default
+        """
+        originals = []
+        try:
+            for phase, methods in (phase_methods or PHASE_METHODS).items():
+                for owner, name in methods:
+                    original = owner.__dict__[name]
+                    originals.append((owner, name, original))
+                    setattr(owner, name, self.timed(phase, original))
+            yield
+        finally:
+            for owner, name, original in reversed(originals):
+                setattr(owner, name, original)
+
+    def run(self, scheduler: EventScheduler, num_ticks: int, observers: Iterable[Callable[[int], None]] = ()) -> None:
+        """
+        Runs the scheduler tick by tick, timing every tick and capturing the chosen ones with cProfile.
+        :param scheduler: The simulation's scheduler
+        :param num_ticks: Number of ticks to run from the scheduler's current time
+        :param observers: Called with the tick once it is done, a video frame writer for instance, timed as part of
+                          the tick
+        """
+        observers = list(observers)
+        first_tick = scheduler.now
+        for tick in range(first_tick, first_tick + num_ticks):
+            profile = cProfile.Profile() if tick in self.capture_ticks else None
+            if profile is not None:
+                profile.enable()
+            started = perf_counter_ns()
+            with self.phase("other"):
+                scheduler.run_until(tick + 1)
+                for observer in observers:
+                    observer(tick)
+            self.record("tick", perf_counter_ns() - started)
+            if profile is not None:
+                profile.disable()
+                os.makedirs(self.capture_dir, exist_ok=True)
+                path = os.path.join(self.capture_dir, f"tick_{tick:06d}.prof")
+                profile.dump_stats(path)
+                self.captures.append(path)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Calls, total milliseconds and mean/p50/p95/p99/max microseconds of every phase."""
+        return {phase: {"calls": histogram.count,
+                        "total_ms": histogram.total / 1e6,
+                        "mean_us": histogram.total / histogram.count / 1e3,
+                        "p50_us": histogram.percentile(50) / 1e3,
+                        "p95_us": histogram.percentile(95) / 1e3,
+                        "p99_us": histogram.percentile(99) / 1e3,
+                        "max_us": histogram.max / 1e3}
+                for phase, histogram in sorted(self.histograms.items())}
+
+    def report(self) -> str:
+        """The summary as a text table."""
+        return format_summary(self.summary())
+
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    """A PhaseProfiler summary as a text table, one row per phase."""
+    columns = ("calls", "total_ms", "mean_us", "p50_us", "p95_us", "p99_us", "max_us")
+    lines = [f"{'phase':<12}" + "".join(f"{column:>12}" for column in columns)]
+    for phase, stats in summary.items():
+        lines.append(f"{phase:<12}{stats['calls']:>12}" + "".join(f"{stats[column]:>12.1f}" for column in columns[1:]))
+    return "\n".join(lines)
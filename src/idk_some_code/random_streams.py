@@ -0,0 +1,82 @@
+# random_streams.py
+from typing import Dict, List, Optional, Sequence, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+# Order matters: each subsystem gets the child of the root seed at its index, new subsystems go at the end
+# so existing streams stay the same
+SUBSYSTEMS = ("obstacles", "victims", "start_positions", "drones")
+
+
+class RandomStream:
+    """
+    A drone's own random stream. Uniform numbers are drawn from its Generator in batches and handed out one by one,
+    so the per-decision cost is a list index instead of a call into numpy.
+    """
+
+    __slots__ = ("generator", "batch_size", "_buffer", "_next")
+
+    def __init__(self, generator: np.random.Generator, batch_size: int = 256) -> None:
+        """
+        :param generator: The generator backing the stream
+        :param batch_size: How many numbers are drawn at once
+        """
+        self.generator = generator
+        self.batch_size = batch_size
+        self._buffer: List[float] = []
+        self._next = 0
+
+    def random(self) -> float:
+        """A uniform float in [0, 1)."""
+        if self._next == len(self._buffer):
+            self._buffer = self.generator.random(self.batch_size).tolist()
+            self._next = 0
+        value = self._buffer[self._next]
+        self._next += 1
+        return value
+
+    def choice(self, options: Sequence[T]) -> T:
+        """A uniformly picked element of a non-empty sequence."""
+        return options[int(self.random() * len(options))]
+
+
+class SimulationRandom:
+    """
+    All randomness of one simulation, derived from a single seed.
+    Every subsystem and every drone gets its own stream spawned from the seed's SeedSequence, so reruns with the same
+    seed are bit-identical and streams stay statistically independent, also across parallel runs.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """
+        :param seed: Root seed, fresh OS entropy if omitted (read it back from .seed to rerun)
+        """
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self._sequences: Dict[str, np.random.SeedSequence] = dict(
+            zip(SUBSYSTEMS, self.seed_sequence.spawn(len(SUBSYSTEMS))))
+        self._generators: Dict[str, np.random.Generator] = {}
+
+    @property
+    def seed(self) -> int:
+        """The root seed, rerunning with it reproduces the simulation."""
+        return self.seed_sequence.entropy
+
+    def generator(self, subsystem: str) -> np.random.Generator:
+        """
+        The Generator of a subsystem, created on first use and reused afterwards.
+        :param subsystem: One of SUBSYSTEMS
+        """
+        if subsystem not in self._sequences:
+            raise ValueError(f"Unknown random subsystem '{subsystem}', expected one of {SUBSYSTEMS}")
+        if subsystem not in self._generators:
+            self._generators[subsystem] = np.random.default_rng(self._sequences[subsystem])
+        return self._generators[subsystem]
+
+    def drone_streams(self, count: int) -> List[RandomStream]:
+        """
+        Spawns a stream for each of count new drones. The n-th drone spawned always gets the same stream,
+        however many drones are created and in whatever order they act.
+        """
+        return [RandomStream(np.random.default_rng(sequence)) for sequence in self._sequences["drones"].spawn(count)]
@@ -0,0 +1,100 @@
+# raster.py
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    from idk_some_code.grid import Grid, TERRAIN_COLLAPSED_BUILDING, TERRAIN_MOUNTAIN
+except ImportError:
+    from grid import Grid, TERRAIN_COLLAPSED_BUILDING, TERRAIN_MOUNTAIN
+
+# RGB colors of the layers, later entries are painted over earlier ones
+COLORS = {
+    "background": (0, 0, 0),
+    "mountain": (139, 69, 19),  # brown
+    "collapsed_building": (90, 90, 90),
+    "explored_building": (150, 150, 150),
+    "victim": (255, 215, 0),
+    "safe_zone": (0, 128, 0),  # green
+    "need_help": (0, 255, 255),  # cyan
+    "area_cleared": (255, 192, 203),  # pink
+    "drone": (255, 0, 0),  # red
+}
+
+# Pheromone overlays, painted in this order on top of the cell layers
+OVERLAY_PHEROMONES = ("need_help", "area_cleared")
+
+_TERRAIN_COLORS = np.zeros((3, 3), dtype=np.uint8)
+_TERRAIN_COLORS[TERRAIN_MOUNTAIN] = COLORS["mountain"]
+_TERRAIN_COLORS[TERRAIN_COLLAPSED_BUILDING] = COLORS["collapsed_building"]
+
+
+def cell_colors(terrain: np.ndarray, cells: np.ndarray, explored: np.ndarray,
+                pheromone_masks: Dict[str, np.ndarray]) -> np.ndarray:
+    """
+    Colors of cells from their layer values, all arguments are 1-d arrays over the same cells.
+    :param terrain: Terrain codes
+    :param cells: Grid cell values (2 victim, 3 safe zone)
+    :param explored: Explored building flags
+    :param pheromone_masks: For each OVERLAY_PHEROMONES type, which cells hold one
+    :return: (n, 3) uint8 colors
+    """
+    colors = _TERRAIN_COLORS[terrain]
+    colors[explored] = COLORS["explored_building"]
+    colors[cells == 2] = COLORS["victim"]
+    colors[cells == 3] = COLORS["safe_zone"]
+    for pheromone_type in OVERLAY_PHEROMONES:
+        colors[pheromone_masks[pheromone_type]] = COLORS[pheromone_type]
+    return colors
+
+
+def pheromone_mask(grid: Grid, flat_indices: np.ndarray, pheromone_type: str) -> np.ndarray:
+    """Mask of the given cells holding a pheromone of the type, looking at whichever side is smaller."""
+    pheromone_cells = grid.pheromone_type_cells.get(pheromone_type, ())
+    if not pheromone_cells:
+        return np.zeros(flat_indices.size, dtype=bool)
+    width = grid.width
+    if flat_indices.size <= len(pheromone_cells):
+        return np.fromiter(((index % width, index // width) in pheromone_cells for index in flat_indices.tolist()),
+                           dtype=bool, count=flat_indices.size)
+    occupied = np.fromiter((y * width + x for x, y in pheromone_cells), dtype=np.int64, count=len(pheromone_cells))
+    return np.isin(flat_indices, occupied)
+
+
+class GridRaster:
+    """
+    RGB image of the grid layers, one pixel per cell, kept up to date incrementally.
+    After the first full paint only cells whose version changed since the last update are repainted, all in
+    vectorized passes, so the per-frame cost follows the number of changes rather than the grid or pheromone count.
+    """
+
+    def __init__(self, grid: Grid) -> None:
+        """
+        :param grid: The grid to draw
+        """
+        self.grid = grid
+        # Row y of the image is row y of the grid, draw with origin='lower' to keep y pointing up
+        self.image: np.ndarray = np.zeros((grid.height, grid.width, 3), dtype=np.uint8)
+        self._synced_version: Optional[int] = None
+
+    def update(self) -> np.ndarray:
+        """
+        Repaints whatever changed on the grid since the last call.
+        :return: The (height, width, 3) uint8 image, updated in place
+        """
+        if self._synced_version is None:
+            self._paint(np.arange(self.grid.width * self.grid.height))
+        elif self.grid.version != self._synced_version:
+            self._paint(np.flatnonzero(self.grid.cell_versions > self._synced_version))
+        self._synced_version = self.grid.version
+        return self.image
+
+    def _paint(self, flat_indices: np.ndarray) -> None:
+        """Recomputes the color of the given cells, passed as flat (row major) indices."""
+        if flat_indices.size == 0:
+            return
+        masks = {pheromone_type: pheromone_mask(self.grid, flat_indices, pheromone_type)
+                 for pheromone_type in OVERLAY_PHEROMONES}
+        self.image.reshape(-1, 3)[flat_indices] = cell_colors(
+            self.grid.terrain.reshape(-1)[flat_indices], self.grid.grid.reshape(-1)[flat_indices],
+            self.grid.building_explored.reshape(-1)[flat_indices], masks)
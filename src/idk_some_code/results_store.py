@@ -0,0 +1,193 @@
+# results_store.py
+"""
+Per-run and per-tick simulation metrics in a database, written in batches by a background thread.
+
+    store = open_results_store("files/results.db")      # SQLite file, or "mysql://swarm_db"
+    simulate_disaster_response((100, 100), 1000, 300, 300, "heuristic", results_store=store)
+    store.close()
+
+Rows are buffered in memory per table and handed to the writer thread once batch_size of them piled up (or after
+flush_interval seconds). The writer inserts a whole batch with one executemany on a pooled connection, so a tick of
+a 1000 drone run costs a list append per drone, never a round trip.
+"""
+import functools
+import queue
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from idk_some_code.grid import Grid
+except ImportError:
+    from grid import Grid
+
+# Columns of every table, in insert order, with types both SQLite and MySQL understand
+RESULT_TABLES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "runs": (("run_id", "VARCHAR(64)"), ("seed", "VARCHAR(40)"), ("policy", "VARCHAR(16)"), ("width", "INTEGER"),
+             ("height", "INTEGER"), ("num_drones", "INTEGER"), ("num_victims", "INTEGER"),
+             ("num_mountains", "INTEGER"), ("num_buildings", "INTEGER"), ("simulation_time", "INTEGER"),
+             ("victims", "INTEGER"), ("victims_rescued", "INTEGER"), ("explored_cells", "INTEGER"),
+             ("coverage", "DOUBLE PRECISION"), ("decisions", "BIGINT"), ("wall_time", "DOUBLE PRECISION")),
+    "tick_metrics": (("run_id", "VARCHAR(64)"), ("tick", "INTEGER"), ("explored_cells", "INTEGER"),
+                     ("victims_left", "INTEGER"), ("decisions", "BIGINT")),
+    "drone_ticks": (("run_id", "VARCHAR(64)"), ("tick", "INTEGER"), ("drone_id", "INTEGER"), ("x", "INTEGER"),
+                    ("y", "INTEGER"), ("time_spent", "INTEGER")),
+}
+
+
+class ResultsStore:
+    """
+    Batched, asynchronous writer of simulation metrics on top of a ConnectionPool.
+    Errors of the writer thread are raised by the next flush or close, rows are never dropped silently.
+    """
+
+    def __init__(self, pool, batch_size: int = 10000, flush_interval: float = 1.0, max_pending: int = 8) -> None:
+        """
+        :param pool: global_code.helpful_functions.ConnectionPool of MySQLConnection or SQLiteConnection
+        :param batch_size: Rows of a table buffered before they are handed to the writer
+        :param flush_interval: Seconds after which the writer takes whatever is buffered anyway
+        :param max_pending: Batches waiting for the writer before add_rows blocks, bounds the memory of a slow
+                            database
+        """
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rows_written = 0
+        self.batches_written = 0
+        self._buffers: Dict[str, List[tuple]] = {table: [] for table in RESULT_TABLES}
+        self._lock = threading.Lock()
+        self._batches: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self.create_tables()
+        self._writer = threading.Thread(target=self._write_loop, name="results-writer", daemon=True)
+        self._writer.start()
+
+    def create_tables(self) -> None:
+        with self.pool.connection() as connection:
+            for table, columns in RESULT_TABLES.items():
+                connection.query_db(f"CREATE TABLE IF NOT EXISTS {table} "
+                                    f"({', '.join(f'{name} {kind}' for name, kind in columns)})")
+
+    def add_rows(self, table: str, rows: Iterable[tuple]) -> None:
+        """
+        Buffers rows of a table, values in RESULT_TABLES column order.
+        Only blocks when the writer is max_pending batches behind.
+        """
+        self._raise_error()
+        with self._lock:
+            buffer = self._buffers[table]
+            buffer.extend(rows)
+            if len(buffer) < self.batch_size:
+                return
+            self._buffers[table] = []
+        self._batches.put((table, buffer))
+
+    def record_run(self, run_id: str, config: Dict[str, Any], summary: Dict[str, Any]) -> None:
+        """
+        Adds the row of a finished run.
+        :param config: Parameters of the run, named like the 'runs' columns
+        :param summary: Its metrics, see simulate_disaster_response; missing ones are stored as NULL
+        """
+        values = {**config, **summary, "run_id": run_id}
+        # Seeds drawn from OS entropy are 128 bit, more than any integer column holds, so they are stored as text
+        if values.get("seed") is not None:
+            values["seed"] = str(values["seed"])
+        self.add_rows("runs", [tuple(values.get(name) for name, _ in RESULT_TABLES["runs"])])
+
+    def record_tick(self, run_id: str, tick: int, grid: Grid, drones: List, decisions: int) -> None:
+        """Adds the grid metrics of a tick and one row per drone."""
+        self.add_rows("tick_metrics", [(run_id, tick, grid.explored_cells, int(np.count_nonzero(grid.grid == 2)),
+                                        decisions)])
+        self.add_rows("drone_ticks", [(run_id, tick, index if drone.drone_id is None else drone.drone_id,
+                                       drone.position[0], drone.position[1], drone.time_spent)
+                                      for index, drone in enumerate(drones)])
+
+    def query(self, query: str, data=None):
+        """Runs a statement on a pooled connection, see query_db. Rows still buffered are not visible yet."""
+        with self.pool.connection() as connection:
+            return connection.query_db(query, data)
+
+    def flush(self) -> None:
+        """Hands every buffered row to the writer and waits until it's all in the database."""
+        self._hand_over_buffers()
+        self._batches.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Flushes, stops the writer thread and closes the pool."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self.flush()
+        finally:
+            self._batches.put(None)
+            self._writer.join()
+            self.pool.close()
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _hand_over_buffers(self) -> None:
+        with self._lock:
+            batches = [(table, rows) for table, rows in self._buffers.items() if rows]
+            for table, _ in batches:
+                self._buffers[table] = []
+        for batch in batches:
+            self._batches.put(batch)
+
+    def _write_loop(self) -> None:
+        while True:
+            try:
+                batch = self._batches.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._hand_over_buffers()
+                continue
+            try:
+                if batch is None:
+                    return
+                self._write(*batch)
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                self._batches.task_done()
+
+    def _write(self, table: str, rows: List[tuple]) -> None:
+        with self.pool.connection() as connection:
+            placeholders = ", ".join([connection.placeholder] * len(RESULT_TABLES[table]))
+            columns = ", ".join(name for name, _ in RESULT_TABLES[table])
+            connection.execute_many(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows)
+        self.rows_written += len(rows)
+        self.batches_written += 1
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("Writing results to the database failed") from error
+
+
+def open_results_store(target: str, pool_size: int = 2, **options) -> ResultsStore:
+    """
+    Opens a results store.
+    :param target: 'mysql://<database>' for MySQL (credentials from the MYSQL_* environment variables like
+                   MySQLConnection), anything else is the path of a SQLite file
+    :param pool_size: Connections kept open, the writer thread uses one
+    :param options: ResultsStore options, batch_size for instance
+    :return: The store, close it when done
+    """
+    # The database helpers load yaml and friends, only pulled in when results are actually stored
+    try:
+        from global_code.helpful_functions import ConnectionPool, MySQLConnection, SQLiteConnection
+    except ImportError:
+        from src.global_code.helpful_functions import ConnectionPool, MySQLConnection, SQLiteConnection
+    if target.startswith("mysql://"):
+        factory = functools.partial(MySQLConnection, target[len("mysql://"):])
+    else:
+        factory = functools.partial(SQLiteConnection, target)
+    return ResultsStore(ConnectionPool(factory, pool_size), **options)
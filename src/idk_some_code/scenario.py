@@ -0,0 +1,93 @@
+# scenario.py
+from typing import Optional, Tuple
+
+import numpy as np
+
+try:
+    from idk_some_code.grid import Grid
+except ImportError:
+    from grid import Grid
+
+
+def _sorted_unique(values: np.ndarray) -> np.ndarray:
+    """np.unique for integers, a plain sort and compare beats its generic implementation on large arrays."""
+    values = np.sort(values)
+    keep = np.ones(values.size, dtype=bool)
+    keep[1:] = values[1:] != values[:-1]
+    return values[keep]
+
+
+def _distinct_ranks(population: int, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws count distinct integers from range(population) in random order.
+    Generator.choice without replacement permutes the whole population once the sample is more than a few percent
+    of it, so sparse samples are drawn with replacement and deduplicated instead, which is a uniform subset too.
+    """
+    if count * 4 >= population:
+        return rng.permutation(population)[:count]
+    ranks = _sorted_unique(rng.integers(0, population, size=count + count // 8 + 16))
+    while ranks.size < count:
+        extra = rng.integers(0, population, size=count - ranks.size + 16)
+        ranks = _sorted_unique(np.concatenate((ranks, extra)))
+    # Shuffling before cutting keeps the subset uniform and its order random, callers split it into layers
+    return rng.permutation(ranks)[:count]
+
+
+def sample_free_cells(allowed: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws distinct cells from a mask in a single call, without any retry loop.
+    :param allowed: Boolean (height, width) mask of the cells that may be picked
+    :param count: Number of cells to draw, capped at the number of allowed cells
+    :param rng: The generator to draw with
+    :return: Flat (row major) indices of the picked cells
+    """
+    # Only the (usually few) blocked cells are listed, the allowed ones are drawn by rank and mapped back
+    # to flat indices by skipping every blocked cell in front of them
+    blocked = np.flatnonzero(~allowed)
+    num_allowed = allowed.size - blocked.size
+    ranks = _distinct_ranks(num_allowed, min(count, num_allowed), rng)
+    blocked_before = blocked - np.arange(blocked.size)
+    return ranks + np.searchsorted(blocked_before, ranks, side='right')
+
+
+def build_scenario(grid: Grid, num_mountains: int, num_buildings: int, num_victims: int,
+                   rng: Optional[np.random.Generator] = None,
+                   keep_clear: Optional[Tuple[int, int, int]] = None) -> None:
+    """
+    Places mountains, collapsed buildings and victims on every free cell they need in one vectorized pass.
+    All cells are drawn together without replacement, so no two items share a cell, and whole layers are written
+    at once instead of going through the per-cell Grid methods.
+    :param grid: The grid to fill, cells already holding an obstacle or anything else are left alone
+    :param num_mountains: Number of mountains to place
+    :param num_buildings: Number of collapsed buildings to place
+    :param num_victims: Number of victims to place
+    :param rng: Seeded generator, a fresh unseeded one is used if omitted
+    :param keep_clear: Optional (x, y, radius) square left free of obstacles and victims, e.g. the drones' start area
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    allowed = (grid.terrain == 0) & (grid.grid == 0)
+    if keep_clear is not None:
+        x, y, radius = keep_clear
+        allowed[max(y - radius, 0):y + radius + 1, max(x - radius, 0):x + radius + 1] = False
+
+    cells = sample_free_cells(allowed, num_mountains + num_buildings + num_victims, rng)
+    apply_scenario(grid, cells[:num_mountains], cells[num_mountains:num_mountains + num_buildings],
+                   cells[num_mountains + num_buildings:])
+
+
+def apply_scenario(grid: Grid, mountains: np.ndarray, buildings: np.ndarray, victims: np.ndarray) -> None:
+    """
+    Writes generated cells, given as flat (row major) indices, onto the grid layer by layer.
+    :param grid: The grid to write to
+    :param mountains: Cells turning into mountains
+    :param buildings: Cells turning into unexplored collapsed buildings
+    :param victims: Cells holding a victim
+    """
+    # Sorted indices write the layers front to back instead of jumping around memory
+    if mountains.size:
+        grid.add_mountains(np.sort(mountains))
+    if buildings.size:
+        grid.add_collapsed_buildings(np.sort(buildings))
+    if victims.size:
+        grid.add_victims(np.sort(victims))
@@ -0,0 +1,77 @@
+# scenario_cache.py
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+
+class ScenarioCache:
+    """
+    Content-addressed on-disk store of generated scenarios.
+    A scenario is saved under the hash of the parameters and seed it was generated from, so repeated sweeps load
+    identical scenarios instead of generating them again, and changing any parameter simply misses the cache.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        :param directory: Where the .npz files are kept, created when needed
+        """
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(params: Dict[str, Any]) -> str:
+        """Hash of the parameters, independent of their order."""
+        encoded = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        """File of a scenario, sharded on the first two characters of its key."""
+        return os.path.join(self.directory, key[:2], key + ".npz")
+
+    def load(self, params: Dict[str, Any]) -> Optional[Dict[str, np.ndarray]]:
+        """Returns the cached arrays of a scenario, None if it isn't cached."""
+        path = self.path(self.key(params))
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    def save(self, params: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> str:
+        """
+        Stores the arrays of a scenario. The file is written next to its final path and renamed into place,
+        so concurrent sweeps never read a half written scenario.
+        :return: The path the scenario was stored at
+        """
+        path = self.path(self.key(params))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handle, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as file:
+                np.savez_compressed(file, **arrays)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+        return path
+
+    def get_or_create(self, params: Dict[str, Any],
+                      generate: Callable[[], Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+        """
+        Loads a scenario from the cache, generating and storing it first on a miss.
+        :param params: Everything the scenario depends on, seed included
+        :param generate: Builds the scenario arrays
+        :return: The scenario arrays
+        """
+        arrays = self.load(params)
+        if arrays is not None:
+            self.hits += 1
+            return arrays
+        self.misses += 1
+        arrays = generate()
+        self.save(params, arrays)
+        return arrays
@@ -0,0 +1,77 @@
+# scheduler.py
+import heapq
+import itertools
+from typing import Any, Iterable, List, Optional, Tuple
+
+try:
+    from idk_some_code.grid import Grid
+except ImportError:
+    from grid import Grid
+
+
+class EventScheduler:
+    """
+    heapq based discrete-event scheduler.
+    Every drone sits in the queue at the time of its next decision (anything with a step(current_time) -> next_time
+    method works). Busy drones are simply not popped until their work is done, and when every drone is busy
+    the clock jumps straight to the next decision instead of ticking through the idle stretch.
+    Grid pheromone decay is advanced by the time elapsed between events.
+    """
+
+    def __init__(self, grid: Grid, decay_rate: float = 100, start_time: int = 0) -> None:
+        """
+        :param grid: The grid whose pheromones decay as time advances
+        :param decay_rate: Decay rate handed to Grid.advance_time
+        :param start_time: Simulation time the clock starts at
+        """
+        self.grid = grid
+        self.decay_rate = decay_rate
+        self.now = start_time
+        self.decisions = 0  # Number of drone decisions processed, handy for metrics
+        self._queue: List[Tuple[int, int, Any]] = []
+        self._sequence = itertools.count()  # Tie breaker, drones due at the same time act in scheduling order
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def schedule(self, time: int, drone: Any) -> None:
+        """Schedules a drone's next decision."""
+        heapq.heappush(self._queue, (time, next(self._sequence), drone))
+
+    def unschedule(self, drones: Iterable[Any]) -> List[Tuple[int, Any]]:
+        """
+        Takes drones out of the queue, e.g. to hand them over to another scheduler.
+        :return: (time of the next decision, drone) of every drone that was scheduled
+        """
+        leaving = {id(drone) for drone in drones}
+        removed = [(time, drone) for time, _, drone in self._queue if id(drone) in leaving]
+        if removed:
+            self._queue = [entry for entry in self._queue if id(entry[2]) not in leaving]
+            heapq.heapify(self._queue)
+        return removed
+
+    def peek_time(self) -> Optional[int]:
+        """Time of the next decision, or None if nothing is scheduled."""
+        return self._queue[0][0] if self._queue else None
+
+    def advance_to(self, time: int) -> None:
+        """Moves the clock forward, decaying the grid by the elapsed time."""
+        if time > self.now:
+            self.grid.advance_time(time - self.now, self.decay_rate)
+            self.now = time
+
+    def run_until(self, end_time: int) -> int:
+        """
+        Processes every decision scheduled before end_time, then moves the clock to end_time.
+        :param end_time: Simulation time to stop at (exclusive)
+        :return: Number of decisions processed
+        """
+        processed = 0
+        while self._queue and self._queue[0][0] < end_time:
+            time, _, drone = heapq.heappop(self._queue)
+            self.advance_to(time)
+            self.schedule(drone.step(time), drone)
+            processed += 1
+        self.advance_to(end_time)
+        self.decisions += processed
+        return processed
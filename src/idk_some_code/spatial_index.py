@@ -0,0 +1,133 @@
+# spatial_index.py
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+
+class BucketIndex:
+    """
+    Uniform bucket grid over cell coordinates.
+    Every item lives in the bucket covering its (x, y), so neighbourhood and nearest-item queries only look at the
+    handful of buckets around the query point instead of every item.
+    """
+
+    def __init__(self, bucket_size: int = 16) -> None:
+        """
+        :param bucket_size: Width and height of a bucket in cells, around the typical query radius works best
+        """
+        self.bucket_size = bucket_size
+        self._buckets: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self._positions: Dict[Hashable, Tuple[int, int]] = {}
+        # Bounds of the buckets ever used, limits how far a nearest search has to look
+        self._min_bucket: Optional[Tuple[int, int]] = None
+        self._max_bucket: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def position(self, item: Hashable) -> Optional[Tuple[int, int]]:
+        """Returns the (x, y) an item was added or moved to."""
+        return self._positions.get(item)
+
+    def add(self, item: Hashable, x: int, y: int) -> None:
+        """Adds an item at (x, y), moving it if it was already indexed."""
+        if item in self._positions:
+            self.move(item, x, y)
+            return
+        self._positions[item] = (x, y)
+        bucket = self._bucket_of(x, y)
+        self._buckets.setdefault(bucket, set()).add(item)
+        self._grow_bounds(bucket)
+
+    def discard(self, item: Hashable) -> None:
+        """Removes an item if it is indexed."""
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+        bucket = self._bucket_of(*position)
+        items = self._buckets[bucket]
+        items.discard(item)
+        if not items:
+            del self._buckets[bucket]
+
+    def move(self, item: Hashable, x: int, y: int) -> None:
+        """Updates the position of an indexed item, only touching buckets when it crosses a bucket border."""
+        old_position = self._positions[item]
+        self._positions[item] = (x, y)
+        old_bucket, new_bucket = self._bucket_of(*old_position), self._bucket_of(x, y)
+        if old_bucket != new_bucket:
+            items = self._buckets[old_bucket]
+            items.discard(item)
+            if not items:
+                del self._buckets[old_bucket]
+            self._buckets.setdefault(new_bucket, set()).add(item)
+            self._grow_bounds(new_bucket)
+
+    def at(self, x: int, y: int) -> List[Hashable]:
+        """Returns the items sitting exactly on (x, y)."""
+        return [item for item in self._buckets.get(self._bucket_of(x, y), ()) if self._positions[item] == (x, y)]
+
+    def within(self, x: int, y: int, radius: float) -> List[Hashable]:
+        """Returns the items whose Euclidean distance to (x, y) is at most radius."""
+        radius_squared = radius * radius
+        bx0, by0 = self._bucket_of(int(x - radius), int(y - radius))
+        bx1, by1 = self._bucket_of(int(x + radius), int(y + radius))
+        found = []
+        for by in range(by0, by1 + 1):
+            for bx in range(bx0, bx1 + 1):
+                for item in self._buckets.get((bx, by), ()):
+                    ix, iy = self._positions[item]
+                    if (ix - x) ** 2 + (iy - y) ** 2 <= radius_squared:
+                        found.append(item)
+        return found
+
+    def nearest(self, x: int, y: int) -> Optional[Hashable]:
+        """
+        Returns the item closest to (x, y) by Euclidean distance, or None if the index is empty.
+        Buckets are searched in rings of growing size until no closer item can exist further out.
+        """
+        if not self._positions:
+            return None
+        center_x, center_y = self._bucket_of(x, y)
+        max_ring = max(abs(center_x - self._min_bucket[0]), abs(center_x - self._max_bucket[0]),
+                       abs(center_y - self._min_bucket[1]), abs(center_y - self._max_bucket[1]))
+        best_item, best_distance = None, None
+        for ring in range(max_ring + 1):
+            # Anything in this ring is at least (ring - 1) buckets away
+            if best_distance is not None and best_distance <= ((ring - 1) * self.bucket_size) ** 2:
+                break
+            for bucket in self._ring(center_x, center_y, ring):
+                for item in self._buckets.get(bucket, ()):
+                    ix, iy = self._positions[item]
+                    distance = (ix - x) ** 2 + (iy - y) ** 2
+                    if best_distance is None or distance < best_distance:
+                        best_item, best_distance = item, distance
+        return best_item
+
+    def _bucket_of(self, x: int, y: int) -> Tuple[int, int]:
+        return x // self.bucket_size, y // self.bucket_size
+
+    def _grow_bounds(self, bucket: Tuple[int, int]) -> None:
+        if self._min_bucket is None:
+            self._min_bucket = self._max_bucket = bucket
+            return
+        self._min_bucket = (min(self._min_bucket[0], bucket[0]), min(self._min_bucket[1], bucket[1]))
+        self._max_bucket = (max(self._max_bucket[0], bucket[0]), max(self._max_bucket[1], bucket[1]))
+
+    @staticmethod
+    def _ring(center_x: int, center_y: int, ring: int) -> List[Tuple[int, int]]:
+        """Buckets at exactly `ring` buckets (Chebyshev) from the center bucket."""
+        if ring == 0:
+            return [(center_x, center_y)]
+        buckets = []
+        for bx in range(center_x - ring, center_x + ring + 1):
+            buckets.append((bx, center_y - ring))
+            buckets.append((bx, center_y + ring))
+        for by in range(center_y - ring + 1, center_y + ring):
+            buckets.append((center_x - ring, by))
+            buckets.append((center_x + ring, by))
+        return buckets
@@ -0,0 +1,58 @@
+# swarm.py
+from typing import List, Optional, Tuple
+
+try:
+    from idk_some_code.spatial_index import BucketIndex
+except ImportError:
+    from spatial_index import BucketIndex
+
+
+class SwarmIndex:
+    """
+    Where every drone of the swarm is, kept in a BucketIndex.
+    Drones registered here report their own moves, so proximity and occupancy questions only look at the buckets
+    around the query point instead of comparing every pair of drones.
+    """
+
+    def __init__(self, bucket_size: int = 8) -> None:
+        """
+        :param bucket_size: Bucket size in cells, roughly the separation radius the drones query with
+        """
+        self._index = BucketIndex(bucket_size)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, drone) -> bool:
+        return drone in self._index
+
+    def register(self, drone) -> None:
+        """Starts tracking a drone at its current position."""
+        self._index.add(drone, *drone.position)
+
+    def unregister(self, drone) -> None:
+        """Stops tracking a drone."""
+        self._index.discard(drone)
+
+    def update(self, drone) -> None:
+        """Records the new position of a tracked drone."""
+        self._index.move(drone, *drone.position)
+
+    def drones_at(self, x: int, y: int) -> List:
+        """The drones currently on (x, y)."""
+        return self._index.at(x, y)
+
+    def is_occupied(self, x: int, y: int) -> bool:
+        """True if any drone is on (x, y)."""
+        return bool(self._index.at(x, y))
+
+    def drones_within(self, x: int, y: int, radius: float, exclude=None) -> List:
+        """
+        The drones within Euclidean distance radius of (x, y).
+        :param exclude: A drone to leave out, usually the one asking
+        """
+        return [drone for drone in self._index.within(x, y, radius) if drone is not exclude]
+
+    def position_of(self, drone) -> Optional[Tuple[int, int]]:
+        """The last recorded position of a drone."""
+        return self._index.position(drone)
@@ -0,0 +1,181 @@
+# sweep.py
+"""
+Parameter sweeps over simulate_disaster_response.
+
+    python -m idk_some_code.sweep --grid 50x50 100x100 --drones 2 4 8 --victims 200 --seeds 0 1 2 --out sweep.csv
+
+With --scenario-cache DIR procedural scenarios are generated once and loaded by every later run using them.
+
+Every combination of the parameters is one run. Runs are spread over a process pool and each result is appended to
+the CSV as soon as it finishes, so an interrupted sweep started again with the same output only runs what is missing.
+"""
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from idk_some_code.main import simulate_disaster_response
+    from idk_some_code.scenario_cache import ScenarioCache
+except ImportError:
+    from main import simulate_disaster_response
+    from scenario_cache import ScenarioCache
+
+# Parameters of a run, in CSV column order
+PARAMETERS = ("width", "height", "num_drones", "num_victims", "num_mountains", "num_buildings", "scenario",
+              "policy", "simulation_time", "seed")
+METRICS = ("victims", "victims_rescued", "coverage", "explored_cells", "ticks", "decisions", "wall_time")
+COLUMNS = ("run_id",) + PARAMETERS + METRICS
+
+
+def expand_grid(grid_sizes: Iterable[Tuple[int, int]], num_drones: Iterable[int], num_victims: Iterable[int],
+                num_mountains: Iterable[int] = (0,), num_buildings: Iterable[int] = (0,),
+                policies: Iterable[str] = ("heuristic",), seeds: Iterable[int] = (0,),
+                simulation_time: int = 300, scenarios: Iterable[str] = ("random",)) -> List[Dict]:
+    """
+    Every combination of the given parameter values, one run configuration each.
+    :return: Run configurations, keyed by the PARAMETERS names
+    """
+    return [{"width": width, "height": height, "num_drones": drones, "num_victims": victims,
+             "num_mountains": mountains, "num_buildings": buildings, "scenario": scenario, "policy": policy,
+             "simulation_time": simulation_time, "seed": seed}
+            for (width, height), drones, victims, mountains, buildings, scenario, policy, seed
+            in itertools.product(grid_sizes, num_drones, num_victims, num_mountains, num_buildings, scenarios,
+                                 policies, seeds)]
+
+
+def run_id(config: Dict) -> str:
+    """Stable identifier of a run configuration, how finished runs are recognized when resuming."""
+    encoded = json.dumps({name: config[name] for name in PARAMETERS}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+def run_config(config: Dict, scenario_cache: Optional[str] = None) -> Dict:
+    """
+    Runs one configuration, in a pool worker.
+    :param config: The run configuration
+    :param scenario_cache: Directory of the ScenarioCache procedural scenarios are loaded from and stored in
+    :return: The CSV row of the run
+    """
+    started = time.perf_counter()
+    summary = simulate_disaster_response((config["width"], config["height"]), config["num_drones"],
+                                         config["num_victims"], config["simulation_time"], config["policy"],
+                                         config["seed"], num_mountains=config["num_mountains"],
+                                         num_buildings=config["num_buildings"], scenario=config["scenario"],
+                                         scenario_cache=ScenarioCache(scenario_cache) if scenario_cache else None)
+    summary["wall_time"] = time.perf_counter() - started
+    row = {name: config[name] for name in PARAMETERS}
+    row.update({name: summary[name] for name in METRICS})
+    row["run_id"] = run_id(config)
+    return row
+
+
+def completed_runs(results_path: str) -> Set[str]:
+    """
+    Ids of the runs already in a results file.
+    A row cut short by an interruption is removed, so appending starts on a clean line.
+    """
+    if not os.path.exists(results_path):
+        return set()
+    with open(results_path, "rb+") as file:
+        content = file.read()
+        if content and not content.endswith(b"\n"):
+            file.truncate(content.rfind(b"\n") + 1)
+    with open(results_path, newline="") as file:
+        return {row["run_id"] for row in csv.DictReader(file) if row.get(COLUMNS[-1])}
+
+
+def run_sweep(configs: List[Dict], results_path: str, workers: Optional[int] = None,
+              scenario_cache: Optional[str] = None) -> int:
+    """
+    Runs every configuration not yet in the results file across a process pool,
+    appending each result to the file as soon as it is done.
+    :param configs: Run configurations, see expand_grid
+    :param results_path: CSV the results are streamed to, resumed if it exists
+    :param workers: Number of processes, one per CPU by default
+    :param scenario_cache: Directory shared by the workers to cache procedural scenarios in
+    :return: Number of runs done by this call
+    """
+    done = completed_runs(results_path)
+    pending = [config for config in configs if run_id(config) not in done]
+    if not pending:
+        return 0
+    new_file = not os.path.exists(results_path) or os.path.getsize(results_path) == 0
+    with open(results_path, "a", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=COLUMNS)
+        if new_file:
+            writer.writeheader()
+        pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        try:
+            futures = {pool.submit(run_config, config, scenario_cache) for config in pending}
+            while futures:
+                finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    writer.writerow(future.result())
+                file.flush()
+        finally:
+            # On an error or Ctrl+C drop the queued runs instead of finishing the whole sweep first
+            pool.shutdown(cancel_futures=True)
+    return len(pending)
+
+
+def aggregate(results_path: str) -> List[Dict]:
+    """
+    Averages the metrics of a results file over seeds.
+    :return: One row per configuration without its seed, with the number of runs and the mean of every metric
+    """
+    groups: Dict[Tuple, List[Dict]] = {}
+    with open(results_path, newline="") as file:
+        for row in csv.DictReader(file):
+            groups.setdefault(tuple(row[name] for name in PARAMETERS if name != "seed"), []).append(row)
+    summary = []
+    for key, rows in groups.items():
+        entry = dict(zip([name for name in PARAMETERS if name != "seed"], key))
+        entry["runs"] = len(rows)
+        entry.update({name: sum(float(row[name]) for row in rows) / len(rows) for name in METRICS})
+        summary.append(entry)
+    return summary
+
+
+def _grid_size(value: str) -> Tuple[int, int]:
+    width, _, height = value.partition("x")
+    return int(width), int(height or width)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run every combination of simulation parameters in parallel.")
+    parser.add_argument("--grid", type=_grid_size, nargs="+", default=[(100, 100)], metavar="WIDTHxHEIGHT")
+    parser.add_argument("--drones", type=int, nargs="+", default=[4])
+    parser.add_argument("--victims", type=int, nargs="+", default=[300])
+    parser.add_argument("--mountains", type=int, nargs="+", default=[0])
+    parser.add_argument("--buildings", type=int, nargs="+", default=[0])
+    parser.add_argument("--scenario", nargs="+", choices=("random", "procedural"), default=["random"])
+    parser.add_argument("--scenario-cache", default=None, metavar="DIR",
+                        help="Generate every procedural scenario once and load it in later runs")
+    parser.add_argument("--policy", nargs="+", choices=("llm", "heuristic", "stub"), default=["heuristic"])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--time", type=int, default=300, help="Simulation time of every run")
+    parser.add_argument("--workers", type=int, default=None, help="Processes, one per CPU by default")
+    parser.add_argument("--out", default="sweep.csv", help="Results CSV, an existing one is resumed")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configs = expand_grid(args.grid, args.drones, args.victims, args.mountains, args.buildings, args.policy,
+                          args.seeds, args.time, args.scenario)
+    ran = run_sweep(configs, args.out, args.workers, args.scenario_cache)
+    print(f"{ran} of {len(configs)} runs done, {len(configs) - ran} were already in {args.out}")
+    for entry in aggregate(args.out):
+        print(json.dumps(entry))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
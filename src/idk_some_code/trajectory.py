@@ -0,0 +1,146 @@
+# trajectory.py
+import json
+import struct
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+try:
+    from idk_some_code.grid import Grid
+    from idk_some_code.raster import OVERLAY_PHEROMONES, cell_colors, pheromone_mask
+except ImportError:
+    from grid import Grid
+    from raster import OVERLAY_PHEROMONES, cell_colors, pheromone_mask
+
+MAGIC = b"DRONETRAJ1\n"
+# tick, number of drones, number of changed cells
+RECORD_HEADER = struct.Struct("<qII")
+
+# Bit layout of a packed cell state
+_CELL_SHIFT = 2
+_EXPLORED_BIT = 1 << 4
+_PHEROMONE_BITS = {pheromone_type: 1 << (5 + bit) for bit, pheromone_type in enumerate(OVERLAY_PHEROMONES)}
+
+
+def pack_cells(grid: Grid, flat_indices: np.ndarray) -> np.ndarray:
+    """
+    Packs everything the renderer needs to know about cells into one byte each:
+    terrain code (2 bits), cell value (2 bits), explored building flag and one flag per overlay pheromone.
+    :param grid: The grid to read
+    :param flat_indices: Flat (row major) indices of the cells
+    :return: uint8 states
+    """
+    states = grid.terrain.reshape(-1)[flat_indices].astype(np.uint8)
+    states |= grid.grid.reshape(-1)[flat_indices].astype(np.uint8) << _CELL_SHIFT
+    states[grid.building_explored.reshape(-1)[flat_indices]] |= _EXPLORED_BIT
+    for pheromone_type, bit in _PHEROMONE_BITS.items():
+        states[pheromone_mask(grid, flat_indices, pheromone_type)] |= bit
+    return states
+
+
+def _state_palette() -> np.ndarray:
+    """Color of every possible packed cell state, so a whole frame is a single table lookup."""
+    states = np.arange(256, dtype=np.uint8)
+    masks = {pheromone_type: (states & bit) != 0 for pheromone_type, bit in _PHEROMONE_BITS.items()}
+    return cell_colors(np.minimum(states & 3, 2), (states >> _CELL_SHIFT) & 3, (states & _EXPLORED_BIT) != 0, masks)
+
+
+STATE_PALETTE = _state_palette()
+
+
+class TrajectoryRecord(NamedTuple):
+    tick: int
+    positions: np.ndarray  # (drones, 2) int32 x, y
+    changed: np.ndarray  # Flat indices of the cells that changed since the previous record
+    states: np.ndarray  # Packed states of those cells
+
+
+class TrajectoryRecorder:
+    """
+    Writes a compact per-tick log of a running simulation: drone positions and the packed state of every cell that
+    changed since the previous tick, using the grid's cell versions. The first record holds every cell.
+    Rendering reads the log afterwards, so it never slows the simulation down and can be redone at any resolution.
+    """
+
+    def __init__(self, grid: Grid, file: BinaryIO) -> None:
+        """
+        :param grid: The grid being simulated
+        :param file: Binary file the log is written to, see open_recorder
+        """
+        self.grid = grid
+        self.file = file
+        self.records = 0
+        self._synced_version: Optional[int] = None
+        header = json.dumps({"width": grid.width, "height": grid.height}).encode("utf-8")
+        file.write(MAGIC + header + b"\n")
+
+    def record(self, tick: int, drones: List) -> None:
+        """
+        Appends the state of a tick.
+        :param tick: The tick, usually the simulation time
+        :param drones: The drones, in a stable order
+        """
+        if self._synced_version is None:
+            changed = np.arange(self.grid.width * self.grid.height, dtype=np.uint32)
+        else:
+            changed = np.flatnonzero(self.grid.cell_versions > self._synced_version).astype(np.uint32)
+        self._synced_version = self.grid.version
+        positions = np.array([drone.position for drone in drones], dtype=np.int32).reshape(-1, 2)
+        self.file.write(RECORD_HEADER.pack(tick, len(positions), changed.size))
+        self.file.write(positions.tobytes())
+        self.file.write(changed.tobytes())
+        self.file.write(pack_cells(self.grid, changed).tobytes())
+        self.records += 1
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def open_recorder(grid: Grid, path: str) -> TrajectoryRecorder:
+    """Starts a trajectory log at path."""
+    return TrajectoryRecorder(grid, open(path, "wb"))
+
+
+def read_trajectory(path: str) -> Iterator:
+    """
+    Reads a trajectory log. A record cut short by an interrupted run ends the log.
+    :param path: The log written by a TrajectoryRecorder
+    :return: The header dict first, then every TrajectoryRecord in order
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a trajectory log")
+        yield json.loads(file.readline())
+        while True:
+            header = file.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            tick, num_drones, num_changed = RECORD_HEADER.unpack(header)
+            payload = file.read(num_drones * 8 + num_changed * 5)
+            if len(payload) < num_drones * 8 + num_changed * 5:
+                return
+            positions = np.frombuffer(payload, dtype=np.int32, count=num_drones * 2).reshape(-1, 2)
+            changed = np.frombuffer(payload, dtype=np.uint32, count=num_changed, offset=num_drones * 8)
+            states = np.frombuffer(payload, dtype=np.uint8, offset=num_drones * 8 + num_changed * 4)
+            yield TrajectoryRecord(tick, positions, changed, states)
+
+
+class TrajectoryReplay:
+    """Rebuilds the cell states of a logged simulation record by record."""
+
+    def __init__(self, header: Dict) -> None:
+        self.width: int = header["width"]
+        self.height: int = header["height"]
+        self.states = np.zeros(self.width * self.height, dtype=np.uint8)
+        self.positions = np.empty((0, 2), dtype=np.int32)
+        self.tick: Optional[int] = None
+
+    def apply(self, record: TrajectoryRecord) -> None:
+        """Moves the replay to the state after a record."""
+        self.states[record.changed] = record.states
+        self.positions = record.positions
+        self.tick = record.tick
+
+    def image(self) -> np.ndarray:
+        """(height, width, 3) uint8 image of the cells, row y is grid row y like GridRaster.image."""
+        return STATE_PALETTE[self.states].reshape(self.height, self.width, 3)
@@ -0,0 +1,201 @@
+# video.py
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from idk_some_code.raster import COLORS
+    from idk_some_code.trajectory import TrajectoryReplay, read_trajectory
+except ImportError:
+    from raster import COLORS
+    from trajectory import TrajectoryReplay, read_trajectory
+
+
+class RawVideoWriter:
+    """
+    Streams raw RGB frames into an ffmpeg subprocess, skipping matplotlib entirely.
+    Frames are written straight from the array memory, so the cost per frame is the pipe write and the encoder.
+    Use as a context manager, leaving it waits for ffmpeg to finish the file.
+    """
+
+    def __init__(self, output_path: str, width: int, height: int, fps: int = 30, codec: str = "libx264",
+                 flip: bool = True) -> None:
+        """
+        :param output_path: The video file to write
+        :param width: Frame width in pixels
+        :param height: Frame height in pixels
+        :param fps: Frames per second
+        :param codec: ffmpeg video codec
+        :param flip: Frames are bottom row first, like GridRaster.image, and ffmpeg flips them upright
+        """
+        self.width = width
+        self.height = height
+        # yuv420p needs even dimensions, odd sized grids get a one pixel border
+        filters = ("vflip," if flip else "") + "pad=ceil(iw/2)*2:ceil(ih/2)*2"
+        self.process = subprocess.Popen(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}",
+             "-r", str(fps), "-i", "-", "-vf", filters, "-c:v", codec, "-pix_fmt", "yuv420p", output_path],
+            stdin=subprocess.PIPE)
+
+    def write(self, frame: np.ndarray) -> None:
+        """Writes a (height, width, 3) uint8 C-contiguous frame without copying it."""
+        if frame.shape != (self.height, self.width, 3) or frame.dtype != np.uint8 or not frame.flags.c_contiguous:
+            raise ValueError(f"Expected a contiguous ({self.height}, {self.width}, 3) uint8 frame")
+        self.process.stdin.write(frame.data)
+
+    def close(self) -> None:
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with code {self.process.returncode}")
+
+    def __enter__(self) -> "RawVideoWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.process.kill()
+            self.process.wait()
+
+
+def frame_size(width: int, height: int, downsample: int = 1) -> Tuple[int, int]:
+    """(width, height) of frames of a width x height grid keeping every downsample-th cell."""
+    return -(-width // downsample), -(-height // downsample)
+
+
+def write_grid_frame(writer: RawVideoWriter, image: np.ndarray, drone_positions: np.ndarray,
+                     downsample: int = 1) -> None:
+    """
+    Writes a grid image with the drones painted on.
+    Without downsampling the image itself is written, the drone pixels are restored afterwards instead of copying it.
+    :param writer: The video writer
+    :param image: (height, width, 3) uint8 grid image, bottom row first
+    :param drone_positions: (drones, 2) x, y positions
+    :param downsample: Keep every n-th cell in both directions
+    """
+    frame = np.ascontiguousarray(image[::downsample, ::downsample]) if downsample > 1 else image
+    positions = np.asarray(drone_positions, dtype=np.int64).reshape(-1, 2) // downsample
+    rows, columns = positions[:, 1], positions[:, 0]
+    covered = frame[rows, columns].copy()
+    frame[rows, columns] = COLORS["drone"]
+    writer.write(frame)
+    frame[rows, columns] = covered
+
+
+def count_records(log_path: str) -> int:
+    """Number of ticks in a trajectory log."""
+    records = read_trajectory(log_path)
+    next(records)
+    return sum(1 for _ in records)
+
+
+def split_frames(num_frames: int, num_segments: int) -> List[Tuple[int, int]]:
+    """Splits frames [0, num_frames) into at most num_segments contiguous (start, stop) ranges of similar size."""
+    num_segments = max(1, min(num_segments, num_frames))
+    bounds = [num_frames * segment // num_segments for segment in range(num_segments + 1)]
+    return [(bounds[segment], bounds[segment + 1]) for segment in range(num_segments)]
+
+
+def render_segment(log_path: str, output_path: str, start: int, stop: int, fps: int = 30, dpi: int = 100,
+                   figsize: Tuple[float, float] = (6.4, 6.4)) -> str:
+    """
+    Renders frames [start, stop) of a trajectory log into a video file.
+    The log is replayed from the beginning, applying records before start without drawing them.
+    :return: output_path
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from matplotlib.animation import FFMpegWriter
+
+    records = read_trajectory(log_path)
+    replay = TrajectoryReplay(next(records))
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.set_xlim(-0.5, replay.width - 0.5)
+    ax.set_ylim(-0.5, replay.height - 0.5)
+    grid_image = ax.imshow(replay.image(), origin='lower', interpolation='nearest',
+                           extent=(-0.5, replay.width - 0.5, -0.5, replay.height - 0.5), zorder=1)
+    drone_scatter = ax.scatter([], [], s=100, color='red', label='Drones', zorder=4)
+    writer = FFMpegWriter(fps=fps)
+    with writer.saving(fig, output_path, dpi):
+        for frame, record in enumerate(records):
+            if frame >= stop:
+                break
+            replay.apply(record)
+            if frame < start:
+                continue
+            grid_image.set_data(replay.image())
+            drone_scatter.set_offsets(replay.positions)
+            ax.set_title(f"t = {record.tick}")
+            writer.grab_frame()
+    plt.close(fig)
+    return output_path
+
+
+def render_segment_raw(log_path: str, output_path: str, start: int, stop: int, fps: int = 30,
+                       downsample: int = 1) -> str:
+    """
+    Same as render_segment, but streams one pixel per (downsampled) cell straight to ffmpeg.
+    :return: output_path
+    """
+    records = read_trajectory(log_path)
+    replay = TrajectoryReplay(next(records))
+    with RawVideoWriter(output_path, *frame_size(replay.width, replay.height, downsample), fps=fps) as writer:
+        for frame, record in enumerate(records):
+            if frame >= stop:
+                break
+            replay.apply(record)
+            if frame >= start:
+                write_grid_frame(writer, replay.image(), replay.positions, downsample)
+    return output_path
+
+
+def concat_segments(segment_paths: List[str], output_path: str) -> None:
+    """Joins video segments with ffmpeg's concat demuxer, without re-encoding."""
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as listing:
+        for path in segment_paths:
+            listing.write(f"file '{os.path.abspath(path)}'\n")
+    try:
+        subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", listing.name,
+                        "-c", "copy", output_path], check=True)
+    finally:
+        os.remove(listing.name)
+
+
+def render_video(log_path: str, output_path: str, workers: Optional[int] = None, fps: int = 30, dpi: int = 100,
+                 figsize: Tuple[float, float] = (6.4, 6.4), raw: bool = False, downsample: int = 1) -> str:
+    """
+    Renders a trajectory log to an MP4, splitting the frames across a process pool and concatenating the segments.
+    :param log_path: Log written by a TrajectoryRecorder
+    :param output_path: The video to write
+    :param workers: Number of processes, one per CPU by default
+    :param fps: Frames per second, one frame per logged tick
+    :param dpi: Figure resolution, together with figsize sets the video size
+    :param figsize: Figure size in inches
+    :param raw: Stream raw frames, one pixel per cell, to ffmpeg instead of drawing figures; for large grids
+    :param downsample: With raw, keep every n-th cell in both directions
+    :return: output_path
+    """
+    workers = workers or os.cpu_count() or 1
+    segments = split_frames(count_records(log_path), workers)
+    if raw:
+        render, options = render_segment_raw, (fps, downsample)
+    else:
+        render, options = render_segment, (fps, dpi, figsize)
+    with tempfile.TemporaryDirectory() as directory:
+        segment_paths = [os.path.join(directory, f"segment_{index:04d}.mp4") for index in range(len(segments))]
+        if len(segments) == 1:
+            render(log_path, output_path, *segments[0], *options)
+            return output_path
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render, log_path, path, start, stop, *options)
+                       for path, (start, stop) in zip(segment_paths, segments)]
+            for future in futures:
+                future.result()
+        concat_segments(segment_paths, output_path)
+    return output_path
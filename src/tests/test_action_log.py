@@ -0,0 +1,107 @@
+# test_action_log.py
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from idk_some_code.action_log import ActionRecord, ActionReplay, load_replay, read_actions
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+from idk_some_code.main import replay_simulation, simulate_disaster_response
+from idk_some_code.random_streams import RandomStream
+
+RUN = dict(grid_size=(30, 30), num_drones=4, num_victims=40, simulation_time=120, policy="stub", seed=9,
+           num_mountains=20, num_buildings=30)
+
+
+class TestActionLog(unittest.TestCase):
+    """Paying the model once per decision is plenty."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.directory, "actions.log")
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def record(self) -> dict:
+        return simulate_disaster_response(**RUN, record_actions=self.log_path)
+
+    def test_header_holds_the_run(self):
+        summary = self.record()
+        header = next(read_actions(self.log_path))
+        self.assertEqual(header["seed"], summary["seed"], "The log forgot its seed")
+        self.assertEqual(header["policy"], "stub", "The log forgot who was deciding")
+        self.assertEqual(tuple(header["grid_size"]), RUN["grid_size"], "The log lost the map")
+
+    def test_replay_rebuilds_the_run_without_deciding(self):
+        recorded = self.record()
+        with mock.patch.object(Drone, "stub_decision", side_effect=AssertionError("decided during a replay")):
+            replayed = replay_simulation(self.log_path)
+        self.assertGreater(replayed.pop("replayed_decisions"), 0, "Nothing was replayed")
+        self.assertEqual(replayed, recorded, "The replay remembered a different disaster")
+
+    def test_fast_forward_hands_over_to_the_policy(self):
+        self.record()
+        consultations = [record.tick for record in list(read_actions(self.log_path))[1:]
+                         if record.action == "consult"]
+        until = 60
+        with mock.patch.object(Drone, "stub_decision", autospec=True, return_value="") as decide:
+            summary = replay_simulation(self.log_path, until=until)
+        self.assertEqual(summary["replayed_decisions"], sum(tick < until for tick in consultations),
+                         "Fast-forward replayed the wrong stretch")
+        self.assertGreater(decide.call_count, 0, "Nobody took over after the fast-forward")
+
+    def test_heuristic_run_replays(self):
+        run = dict(RUN, policy="heuristic")
+        recorded = simulate_disaster_response(**run, record_actions=self.log_path)
+        with mock.patch.object(RandomStream, "random", side_effect=AssertionError("rolled the dice during a replay")):
+            replayed = replay_simulation(self.log_path)
+        self.assertEqual(replayed.pop("replayed_decisions"), recorded["decisions"], "Heuristic decisions went missing")
+        self.assertEqual(replayed, recorded, "The replayed heuristic remembered a different disaster")
+
+    def test_nested_actions_logged_once(self):
+        self.record()
+        actions = {record.action for record in list(read_actions(self.log_path))[1:]}
+        self.assertIn("explore_frontier", actions, "The stub never went exploring")
+        self.assertNotIn("go_to", actions, "explore_frontier's go_to was logged twice")
+
+    def test_interrupted_log_still_replays(self):
+        self.record()
+        with open(self.log_path, "rb+") as file:
+            file.truncate(os.path.getsize(self.log_path) - 3)
+        header, replay = load_replay(self.log_path)
+        summary = replay_simulation(self.log_path)
+        self.assertEqual(header["seed"], RUN["seed"], "A cut off tail took the header with it")
+        self.assertGreater(summary["replayed_decisions"], 0, "A cut off tail lost the whole log")
+
+    def test_not_an_action_log(self):
+        with open(self.log_path, "wb") as file:
+            file.write(b"certainly not decisions\n")
+        with self.assertRaises(ValueError):
+            next(read_actions(self.log_path))
+
+    def test_divergence_is_reported(self):
+        grid = Grid(5, 5)
+        drone = Drone(grid, (2, 2), policy="stub", drone_id=0)
+        replay = ActionReplay([ActionRecord(4, 0, "consult", ()), ActionRecord(4, 0, "move_up", ())])
+        with self.assertRaises(RuntimeError):
+            replay.consult(drone, 7)
+
+    def test_replayed_actions_run_on_the_drone(self):
+        grid = Grid(5, 5)
+        drone = Drone(grid, (2, 2), policy="stub", drone_id=1)
+        replay = ActionReplay([ActionRecord(0, 1, "consult", ()), ActionRecord(0, 1, "move_right", ()),
+                               ActionRecord(0, 1, "emit_need_help_tool", ())])
+        self.assertTrue(replay.consult(drone, 0), "The logged decision was skipped")
+        self.assertEqual(drone.position, (3, 2), "The replayed drone went the wrong way")
+        self.assertFalse(replay.consult(drone, 1), "The replay made up a decision past the end of the log")
+
+    def test_record_and_replay_exclusive(self):
+        with self.assertRaises(ValueError):
+            simulate_disaster_response(**RUN, record_actions=self.log_path, replay=ActionReplay([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
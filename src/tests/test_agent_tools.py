@@ -19,6 +19,7 @@ class TestDrone(unittest.TestCase):
         self.grid.is_victim = Mock(return_value=False)
         self.grid.remove_victim = Mock()
         self.grid.add_pheromone = Mock()
+        self.grid.get_pheromones = Mock(return_value=[])  # No pheromones around, the perception window reads this
         self.drone = Drone(grid=self.grid, start_pos=(5, 5))
 
     def test_move_up(self):
@@ -42,13 +43,14 @@ class TestDrone(unittest.TestCase):
         self.grid.is_passable.assert_called_once_with(6, 5)
 
     def test_emit_pheromone_need_help(self):
-        self.drone.emit_pheromone("need_help", self.current_time)
-        self.grid.add_pheromone.assert_called_once_with(5, 5, "need_help", "Assistance required", self.drone.time_spent)
+        self.drone.emit_pheromone("need_help", "Assistance required", self.drone.time_spent)
+        self.grid.add_pheromone.assert_called_once_with(5, 5, "need_help", "Assistance required", self.drone.time_spent,
+                                                        1.0)
 
     def test_emit_pheromone_area_cleared(self):
-        self.drone.emit_pheromone("area_cleared", self.current_time)
+        self.drone.emit_pheromone("area_cleared", "Area now under control", self.drone.time_spent)
         self.grid.add_pheromone.assert_called_once_with(5, 5, "area_cleared", "Area now under control",
-                                                        self.drone.time_spent)
+                                                        self.drone.time_spent, 1.0)
 
     def test_obstacle_blocking(self):
         # Test obstacle blocking movement
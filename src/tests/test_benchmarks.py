@@ -0,0 +1,68 @@
+# test_benchmarks.py
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks import grid_bench
+from benchmarks.harness import compare, load_results, measure, result_key, write_results
+
+
+class TestHarness(unittest.TestCase):
+    """Numbers are only useful next to other numbers."""
+
+    def test_measure(self):
+        result = measure(lambda: sum(range(100)), repeat=2, min_time=0.001)
+        self.assertTrue(0 < result["min_us"] <= result["median_us"] <= result["max_us"], "The timings are jumbled")
+        self.assertGreaterEqual(result["calls"], 1, "Nothing was called")
+
+    def test_result_key_is_stable(self):
+        self.assertEqual(result_key("grid.x", size=10, density=0.1), result_key("grid.x", density=0.1, size=10),
+                         "The same benchmark got two names")
+
+    def test_compare(self):
+        baseline = {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}, "gone": {"median_us": 1.0}}
+        current = {"a": {"median_us": 14.0}, "b": {"median_us": 30.0}, "new": {"median_us": 99.0}}
+        self.assertEqual(compare(current, baseline, threshold=1.5), [("b", 10.0, 30.0, 3.0)],
+                         "Only b got slower than allowed")
+
+    def test_results_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "nested", "results.json")
+            write_results(path, {"a": {"median_us": 1.5}})
+            self.assertEqual(load_results(path), {"a": {"median_us": 1.5}}, "The results did not survive the disk")
+            with open(path) as file:
+                self.assertIn("python", json.load(file)["environment"], "The results forgot where they came from")
+
+
+class TestGridBench(unittest.TestCase):
+    """A tiny map is enough to know the suite runs."""
+
+    def _main(self, *argv):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return grid_bench.main(["--sizes", "20", "--densities", "0.05", "--repeat", "1", "--min-time", "0.0001",
+                                    *argv])
+
+    def test_every_case_runs(self):
+        results = grid_bench.run([20], [0.05], repeat=1, min_time=0.0001)
+        names = {key.split("[")[0] for key in results}
+        self.assertEqual(names, {f"grid.{name}" for name in grid_bench.grid_cases(*grid_bench.build_grid(5, 0.1))},
+                         "A case went missing")
+        self.assertTrue(all(result["pheromones"] == 20 for result in results.values()), "The density was ignored")
+
+    def test_baseline_regression_exit_code(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, "baseline.json")
+            self.assertEqual(self._main("--baseline", baseline, "--save-baseline"), 0, "Saving a baseline failed")
+            self.assertEqual(self._main("--baseline", baseline, "--threshold", "1000"), 0, "A generous threshold failed")
+            results = load_results(baseline)
+            for result in results.values():
+                result["median_us"] /= 10000
+            write_results(baseline, results)
+            self.assertEqual(self._main("--baseline", baseline), 1, "A 10000x slowdown went unnoticed")
+
+
+if __name__ == '__main__':
+    unittest.main()
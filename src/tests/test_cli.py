@@ -0,0 +1,67 @@
+# test_cli.py
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import idk_some_code
+
+from idk_some_code.cli import build_parser, run
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(idk_some_code.__file__)))
+HEAVY_MODULES = ("matplotlib", "crewai", "langchain_anthropic", "langchain_openai", "openai", "pymysql", "yaml")
+
+
+def _run_python(code, *args):
+    """Runs code in a fresh interpreter that only sees the source tree."""
+    env = dict(os.environ, PYTHONPATH=SRC_DIR)
+    return subprocess.run([sys.executable, "-c", code, *args], env=env, capture_output=True, text=True, check=True)
+
+
+class TestCli(unittest.TestCase):
+    """A drone swarm without a screen, a model or a database."""
+
+    def test_heuristic_run_summary(self):
+        args = build_parser().parse_args(["--grid", "20", "15", "--drones", "3", "--victims", "25", "--time", "40",
+                                          "--seed", "5"])
+        summary = run(args)
+        self.assertEqual(summary["seed"], 5, "The seed went missing in action")
+        self.assertEqual(summary["victims"], 25, "Somebody lost count of the victims")
+        self.assertTrue(0 <= summary["victims_rescued"] <= 25, "Rescued more people than there were")
+        self.assertGreater(summary["explored_cells"], 0, "The drones never left the hangar")
+
+    def test_same_seed_same_summary(self):
+        args = build_parser().parse_args(["--grid", "20", "20", "--victims", "40", "--time", "60", "--seed", "11"])
+        self.assertEqual(run(args), run(args), "Same seed, different disaster")
+
+    def test_procedural_scenario_from_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            args = build_parser().parse_args(["--grid", "30", "30", "--victims", "40", "--mountains", "60",
+                                              "--buildings", "120", "--time", "30", "--seed", "4", "--scenario",
+                                              "procedural", "--scenario-cache", directory])
+            first = run(args)
+            cached = [name for _, _, names in os.walk(directory) for name in names if name.endswith(".npz")]
+            self.assertEqual(len(cached), 1, "The scenario never made it to the cache")
+            self.assertEqual(run(args), first, "The cached scenario played out differently")
+        self.assertEqual(first["victims"], 40, "The procedural scenario lost some victims")
+
+    def test_core_imports_stay_light(self):
+        loaded = json.loads(_run_python(
+            "import json, sys\n"
+            "import idk_some_code.main, idk_some_code.cli\n"
+            "print(json.dumps(sorted(m for m in sys.modules if m.split('.')[0] in sys.argv[1:])))",
+            *HEAVY_MODULES).stdout)
+        self.assertEqual(loaded, [], "The headless core dragged a heavy stack along")
+
+    def test_json_output(self):
+        output = _run_python("import sys\nfrom idk_some_code.cli import main\nsys.exit(main())",
+                             "--grid", "12", "12", "--victims", "10", "--time", "20", "--seed", "3", "--json")
+        summary = json.loads(output.stdout)
+        self.assertEqual(summary["seed"], 3, "The JSON forgot which seed it was")
+        self.assertIn("wall_time", summary, "Nobody timed the run")
+
+
+if __name__ == '__main__':
+    unittest.main()
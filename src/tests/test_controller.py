@@ -0,0 +1,102 @@
+# test_controller.py
+import unittest
+
+from idk_some_code.controller import EventDrivenController
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+
+
+class TestEventDrivenController(unittest.TestCase):
+    """Makes sure the LLM only gets bothered when something worth talking about happens."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(20, 20)
+        self.drone = Drone(self.grid, (10, 10))
+        self.controller = EventDrivenController(need_help_radius=5, max_plan_age=3)
+
+    def _look(self) -> None:
+        """What agent_main does before asking the controller."""
+        self.drone.update_perceptions()
+        self.drone.perception.update(self.drone.position)
+
+    def _settle(self) -> None:
+        """Consume the initial trigger so the tests start from a drone that already has a plan."""
+        self._look()
+        self.controller.check_triggers(self.drone)
+        self.controller.start_consultation(EventDrivenController.TRIGGER_INITIAL)
+
+    def test_first_tick_consults_model(self):
+        self._look()
+        self.assertEqual(self.controller.check_triggers(self.drone), EventDrivenController.TRIGGER_INITIAL,
+                         "A drone without a plan should ask the model for one.")
+
+    def test_quiet_tick_has_no_trigger(self):
+        self._settle()
+        self._look()
+        self.assertIsNone(self.controller.check_triggers(self.drone), "Nothing changed, yet the model got called.")
+
+    def test_local_policy_continues_last_intent(self):
+        self._settle()
+        self.controller.record_intent("right")
+        self.assertTrue(self.controller.continue_intent(self.drone))
+        self.assertEqual(self.drone.position, (11, 10), "Drone forgot which way it was heading.")
+        self.assertEqual(self.controller.local_steps, 1)
+
+    def test_new_victim_triggers(self):
+        self._settle()
+        self.grid.add_victim(10, 9)
+        self._look()
+        self.assertEqual(self.controller.check_triggers(self.drone), EventDrivenController.TRIGGER_NEW_VICTIM)
+        self._look()
+        self.assertIsNone(self.controller.check_triggers(self.drone), "The same victim should only trigger once.")
+
+    def test_need_help_appearing_and_disappearing_triggers(self):
+        self._settle()
+        self.grid.add_pheromone(12, 12, "need_help", "Assistance required", 0)
+        self._look()
+        self.assertEqual(self.controller.check_triggers(self.drone),
+                         EventDrivenController.TRIGGER_NEED_HELP_CHANGED)
+        for _ in range(4):
+            self.drone.move("left")  # Walk far enough that the pheromone leaves the radius
+        self._look()
+        self.assertEqual(self.controller.check_triggers(self.drone),
+                         EventDrivenController.TRIGGER_NEED_HELP_CHANGED)
+
+    def test_need_help_fading_away_triggers(self):
+        self._settle()
+        self.grid.add_pheromone(12, 12, "need_help", "Assistance required", 0)
+        self._look()
+        self.assertEqual(self.controller.check_triggers(self.drone),
+                         EventDrivenController.TRIGGER_NEED_HELP_CHANGED)
+        self.grid.advance_time(10000)  # Long enough for the pheromone to decay below the removal threshold
+        self.assertEqual(self.grid.get_pheromones(12, 12), [], "The cry for help never faded")
+        self._look()
+        self.assertEqual(self.controller.check_triggers(self.drone),
+                         EventDrivenController.TRIGGER_NEED_HELP_CHANGED,
+                         "Nobody noticed the cry for help went silent.")
+
+    def test_need_help_out_of_range_is_ignored(self):
+        self._settle()
+        self.grid.add_pheromone(0, 0, "need_help", "Assistance required", 0)
+        self._look()
+        self.assertIsNone(self.controller.check_triggers(self.drone), "Drone heard a cry for help from too far away.")
+
+    def test_blocked_move_triggers(self):
+        self._settle()
+        self.controller.record_intent("up")
+        self.grid.add_mountain(10, 9)
+        self.assertFalse(self.controller.continue_intent(self.drone))
+        self.assertEqual(self.drone.position, (10, 10), "Drone climbed a mountain it shouldn't have.")
+        self._look()
+        self.assertEqual(self.controller.check_triggers(self.drone), EventDrivenController.TRIGGER_BLOCKED)
+
+    def test_stale_plan_triggers(self):
+        self._settle()
+        for _ in range(3):
+            self.assertTrue(self.controller.continue_intent(self.drone))
+        self._look()
+        self.assertEqual(self.controller.check_triggers(self.drone), EventDrivenController.TRIGGER_STALE_PLAN)
+
+
+if __name__ == "__main__":
+    unittest.main()
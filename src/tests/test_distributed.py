@@ -0,0 +1,108 @@
+# test_distributed.py
+import socket
+import threading
+import unittest
+
+from idk_some_code.distributed import SocketChannel, TileLayout, TileWorker, merge_reports, simulate_distributed
+
+SCENARIO = dict(num_drones=12, num_victims=200, policy="heuristic", seed=5)
+
+
+def run_in_process(workers, ticks):
+    """Runs tile workers in this process, delivering every halo message by hand."""
+    for tick in range(ticks):
+        outgoing = {worker.tile: worker.tick(tick) for worker in workers}
+        for worker in workers:
+            worker.apply({neighbour: outgoing[neighbour][worker.tile] for neighbour in worker.neighbours})
+
+
+class TestDistributed(unittest.TestCase):
+    """Four little maps pretending to be one big one."""
+
+    def test_layout(self):
+        layout = TileLayout(100, 60, 3, 2, halo=10)
+        self.assertEqual(len(layout), 6, "Tiles went missing")
+        self.assertEqual(layout.bounds(4), (33, 30, 66, 60), "The tile is in the wrong place")
+        self.assertEqual(layout.owner(33, 30), 4, "A cell on the edge went to the wrong tile")
+        self.assertEqual(layout.owner(99, 59), 5, "The last cell fell off the map")
+        self.assertEqual(layout.neighbours(0), [1, 3, 4], "Tile 0 forgot a neighbour")
+        self.assertEqual(layout.halo_bounds(0), (0, 0, 43, 40), "The halo spilled off the map")
+        with self.assertRaises(ValueError):
+            TileLayout(30, 30, 3, 1, halo=11)
+
+    def test_drone_handover(self):
+        layout = TileLayout(40, 40, 2, 1)
+        left, right = (TileWorker(layout, tile, **SCENARIO) for tile in range(2))
+        drone = next(iter(left.drones.values()))
+        drone.position = (25, 10)
+        left.scheduler.unschedule([drone])
+        left.scheduler.schedule(7, drone)
+        right.apply(left.outgoing())
+        self.assertNotIn(drone.drone_id, left.drones, "The drone is still flying on the left")
+        self.assertEqual(len(left.scheduler), len(left.drones), "The left tile still schedules the drone")
+        arrived = right.drones[drone.drone_id]
+        self.assertEqual(arrived.position, (25, 10), "The drone arrived somewhere else")
+        self.assertIs(arrived.grid, right.grid, "The drone flies on the wrong map")
+        self.assertIn(arrived, right.swarm, "The swarm on the right never saw the drone arrive")
+        self.assertEqual(right.scheduler.peek_time(), 0, "The right tile's own drones lost their turn")
+        self.assertIn(7, [time for time, _, scheduled in right.scheduler._queue if scheduled is arrived],
+                      "The drone lost its next decision time on the way")
+
+    def test_halo_pheromones(self):
+        layout = TileLayout(40, 40, 2, 1)
+        left, right = (TileWorker(layout, tile, **SCENARIO) for tile in range(2))
+        left.grid.add_pheromone(15, 3, "need_help", "over here", 0)  # In the right tile's halo
+        left.grid.add_pheromone(5, 3, "need_help", "far away", 0)  # Too far for the right tile to see
+        left.grid.add_pheromone(22, 4, "area_cleared", "done", 0)  # On the right tile itself
+        left.grid.add_safe_zone(22, 4)
+        right.apply(left.outgoing())
+        self.assertEqual([p["message"] for p in right.grid.get_pheromones(15, 3)], ["over here"],
+                         "The trail stopped at the tile edge")
+        self.assertEqual(right.grid.get_pheromones(5, 3), [], "The halo reaches too far")
+        self.assertEqual([p["message"] for p in right.grid.get_pheromones(22, 4)], ["done"],
+                         "The owner never heard of the pheromone emitted on its cell")
+        self.assertTrue(right.grid.is_safe_zone(22, 4), "The owner never heard its cell was cleared")
+        self.assertEqual(right.grid.pheromone_type_cells["need_help"], {(15, 3)}, "The type index is out of sync")
+
+    def test_emitter_keeps_its_trail_through_the_merge(self):
+        layout = TileLayout(40, 40, 2, 1)
+        left, right = (TileWorker(layout, tile, **SCENARIO) for tile in range(2))
+        right.grid.add_pheromone(20, 3, "trail", "owner's", 0)  # Edge cell of the right tile, in the left's halo
+        left.grid.add_pheromone(20, 3, "need_help", "over here", 0)  # Dropped by a left drone flying over it
+        to_right, to_left = left.outgoing(), right.outgoing()
+        left.apply(to_left)
+        self.assertEqual([p["message"] for p in left.grid.get_pheromones(20, 3)], ["owner's", "over here"],
+                         "The owner's stale copy wiped out the trail its emitter just left")
+        self.assertEqual(left.grid.pheromone_type_cells["need_help"], {(20, 3)}, "The type index lost the trail")
+        right.apply(to_right)
+        self.assertEqual([p["message"] for p in right.grid.get_pheromones(20, 3)], ["owner's", "over here"],
+                         "The owner and the emitter disagree about the cell")
+
+    def test_socket_channel(self):
+        a, b = socket.socketpair()
+        sender, receiver = SocketChannel(a), SocketChannel(b)
+        payload = bytes(range(256)) * 8192
+        thread = threading.Thread(target=sender.send_bytes, args=(payload,))
+        thread.start()
+        self.assertEqual(bytes(receiver.recv_bytes()), payload, "The message got mangled on the wire")
+        thread.join()
+        sender.close()
+        with self.assertRaises(EOFError):
+            receiver.recv_bytes()
+        receiver.close()
+
+    def test_processes_match_in_process_run(self):
+        layout = TileLayout(40, 40, 2, 2)
+        workers = [TileWorker(layout, tile, **SCENARIO) for tile in range(4)]
+        run_in_process(workers, 40)
+        expected = merge_reports([worker.report() for worker in workers])
+        self.assertEqual(expected["drones"], 12, "Drones got lost between the tiles")
+        self.assertGreater(sum(worker.drones_received for worker in workers), 0, "No drone ever crossed a tile edge")
+        for transport in ("pipe", "socket"):
+            summary = simulate_distributed((40, 40), 12, 200, 40, "heuristic", seed=5, tiles=(2, 2),
+                                           transport=transport)
+            self.assertEqual(summary, expected, f"The {transport} run took another turn")
+
+
+if __name__ == '__main__':
+    unittest.main()
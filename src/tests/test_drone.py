@@ -1,5 +1,8 @@
 # Additional tests in test_drone.py
+import sys
 import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
 from idk_some_code.drone import Drone
 from idk_some_code.grid import Grid
@@ -38,6 +41,46 @@ class TestDroneExpanded(unittest.TestCase):
         self.assertEqual(self.drone.move_counter_since_last_victim, 0, "Drone's move counter didn't reset after a rescue.")
         self.assertEqual(self.drone.victim_counter, original_victim_count, "Drone didn't brag about the victim it just rescued.")
 
+    def test_drone_is_slotted(self):
+        """Drones use __slots__ so thousands of them stay cheap."""
+        self.assertFalse(hasattr(self.drone, "__dict__"), "Drone grew a __dict__, scenario sweeps will feel it.")
+
+    def test_llm_client_is_lazy_and_shared(self):
+        """No LLM client is built on construction, and every drone shares the same one."""
+        import idk_some_code.drone as drone_module
+        # Neither config.yaml nor the LLM stack are needed to check who builds the client and when
+        chat_anthropic = Mock(side_effect=lambda **kwargs: object())
+        with patch.object(drone_module, "_shared_llm", None), \
+                patch.object(drone_module, "configure_llm_environment") as configure, \
+                patch.dict(sys.modules, {"langchain_anthropic": SimpleNamespace(ChatAnthropic=chat_anthropic)}):
+            Drone(self.grid, (1, 1))
+            self.assertIsNone(drone_module._shared_llm, "Creating a drone shouldn't build an LLM client.")
+            configure.assert_not_called()
+            other = Drone(self.grid, (2, 2))
+            self.assertIs(self.drone.llm, other.llm, "Each drone got its own LLM client.")
+            self.assertEqual(chat_anthropic.call_count, 1, "The shared LLM client was built more than once.")
+
+    def test_heuristic_policy_does_not_need_the_model(self):
+        """The heuristic policy explores without a crew."""
+        drone = Drone(self.grid, (5, 5), policy="heuristic")
+        drone.agent_main()
+        self.assertTrue(self.grid.is_safe_zone(*drone.position), "Heuristic drone didn't explore where it stands.")
+
+    def test_step_reports_busy_period(self):
+        """Assisting a victim keeps the drone busy, so its next decision is further away."""
+        self.grid.add_mountain(5, 4)
+        self.grid.add_mountain(5, 6)
+        self.grid.add_mountain(4, 5)
+        self.grid.add_mountain(6, 5)  # Boxed in, so the heuristic can't wander off the victim
+        self.grid.add_victim(5, 5)
+        drone = Drone(self.grid, (5, 5), policy="heuristic")
+        self.assertEqual(drone.step(10), 16, "Rescue work should keep the drone busy for 6 ticks.")
+        self.assertEqual(drone.step(16), 17, "Plain exploring should only take a tick.")
+
+    def test_unknown_policy_rejected(self):
+        with self.assertRaises(ValueError):
+            Drone(self.grid, (5, 5), policy="vibes")
+
     # def test_need_help_emission_conditions(self):
     #     """Checks if 'Need Help' pheromone is correctly emitted when conditions are met."""
     #     self.drone.victim_counter = 2  # Found some victims
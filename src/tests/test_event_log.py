@@ -0,0 +1,99 @@
+# test_event_log.py
+import io
+import json
+import logging
+import threading
+import unittest
+
+from idk_some_code.drone import Drone
+from idk_some_code.event_log import EventLogger, EventPolicy, configure_logging, set_event_policy, shutdown_logging
+from idk_some_code.grid import Grid
+
+
+class TestEventPolicy(unittest.TestCase):
+    """Not every drone needs to be heard."""
+
+    def test_sampling_keeps_one_in_n(self):
+        policy = EventPolicy(sample_every=10)
+        self.assertEqual(sum(policy.allow() for _ in range(100)), 10, "Sampling kept the wrong share")
+        self.assertEqual(policy.suppressed, 90, "Dropped events went uncounted")
+
+    def test_rate_limit_caps_bursts(self):
+        policy = EventPolicy(rate=1.0, burst=3)
+        self.assertEqual(sum(policy.allow() for _ in range(50)), 3, "The rate limit let a flood through")
+
+
+class TestEventLog(unittest.TestCase):
+    """Chatter belongs on the logging thread."""
+
+    def setUp(self) -> None:
+        self.output = io.StringIO()
+        self.log = EventLogger("test")
+
+    def tearDown(self) -> None:
+        shutdown_logging()
+
+    def _lines(self):
+        shutdown_logging()
+        return self.output.getvalue().splitlines()
+
+    def test_events_are_written_by_the_listener(self):
+        configure_logging(logging.DEBUG, stream=self.output, json_lines=True)
+        written_by = []
+        original_emit = logging.StreamHandler.emit
+
+        def spying_emit(handler, record):
+            written_by.append(threading.current_thread())
+            original_emit(handler, record)
+
+        logging.StreamHandler.emit = spying_emit
+        try:
+            self.log.info("landed", position=(1, 2), battery=0.5)
+            lines = self._lines()
+        finally:
+            logging.StreamHandler.emit = original_emit
+        self.assertEqual(len(lines), 1, "The event got lost or duplicated")
+        event = json.loads(lines[0])
+        self.assertEqual((event["event"], event["position"], event["battery"]), ("test.landed", [1, 2], 0.5),
+                         "The fields did not survive the trip")
+        self.assertNotIn(threading.main_thread(), written_by, "The simulation thread did the writing itself")
+
+    def test_level_filters_before_anything_is_built(self):
+        configure_logging(logging.INFO, stream=self.output)
+        self.log.debug("whisper")
+        self.log.warning("shout", volume=11)
+        lines = self._lines()
+        self.assertEqual(len(lines), 1, "A debug event slipped past an INFO pipeline")
+        self.assertIn("test.shout volume=11", lines[0], "The text format lost its fields")
+        self.assertFalse(self.log.enabled(logging.DEBUG), "Hot call sites would still count for nobody")
+        self.assertTrue(self.log.enabled(logging.WARNING), "Warnings went deaf")
+
+    def test_perception_summary_only_when_listened_to(self):
+        configure_logging(logging.DEBUG, stream=self.output, json_lines=True)
+        drone = Drone(Grid(5, 5), (2, 2), policy="heuristic")
+        drone.grid.add_victim(2, 1)
+        drone.update_perceptions()
+        events = [json.loads(line) for line in self._lines()]
+        self.assertEqual([event["event"] for event in events], ["drone.perceptions_updated"], "The summary went missing")
+        self.assertEqual(events[0]["victims"], 1, "The summary miscounted the victims")
+
+    def test_suppressed_count_is_reported(self):
+        configure_logging(logging.DEBUG, stream=self.output, json_lines=True, policies={})
+        set_event_policy("test.tick", sample_every=5)
+        for tick in range(11):
+            self.log.debug("tick", tick=tick)
+        events = [json.loads(line) for line in self._lines()]
+        self.assertEqual([event["tick"] for event in events], [0, 5, 10], "Sampling kept the wrong ticks")
+        self.assertEqual(events[1]["suppressed"], 4, "The skipped events were not owned up to")
+
+    def test_drone_bumping_into_a_wall(self):
+        configure_logging(logging.DEBUG, stream=self.output, json_lines=True)
+        drone = Drone(Grid(5, 5), (0, 0), policy="heuristic")
+        drone.move("left")
+        events = [json.loads(line) for line in self._lines()]
+        self.assertEqual([event["event"] for event in events], ["drone.move_blocked"], "The bump went unnoticed")
+        self.assertEqual(events[0]["direction"], "left", "The log forgot which way the drone tried")
+
+
+if __name__ == '__main__':
+    unittest.main()
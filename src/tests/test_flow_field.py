@@ -0,0 +1,88 @@
+# test_flow_field.py
+import unittest
+
+from idk_some_code.flow_field import FlowField
+from idk_some_code.grid import Grid
+
+
+class TestFlowField(unittest.TestCase):
+    """One search, every drone knows where to go."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(10, 10)
+
+    def _walk(self, field, start):
+        """Follows the field from start until it stops, returning the visited cells."""
+        offsets = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+        x, y = start
+        visited = [start]
+        while field.next_direction(x, y) is not None:
+            dx, dy = offsets[field.next_direction(x, y)]
+            x, y = x + dx, y + dy
+            visited.append((x, y))
+            self.assertLess(len(visited), 100, "Flow field is going in circles.")
+        return visited
+
+    def test_distances_from_multiple_sources(self):
+        field = FlowField(self.grid, [(0, 0), (9, 9)])
+        self.assertEqual(field.distance(0, 0), 0)
+        self.assertEqual(field.distance(2, 1), 3)
+        self.assertEqual(field.distance(9, 7), 2, "Cell should flow to the closest source.")
+
+    def test_following_the_field_reaches_a_source(self):
+        field = FlowField(self.grid, [(7, 2)])
+        self.assertEqual(self._walk(field, (1, 8))[-1], (7, 2))
+
+    def test_mountains_are_routed_around(self):
+        for y in range(9):
+            self.grid.add_mountain(5, y)
+        field = FlowField(self.grid, [(9, 0)])
+        path = self._walk(field, (0, 0))
+        self.assertEqual(path[-1], (9, 0))
+        self.assertIn((5, 9), path, "Field should lead through the gap in the wall.")
+        self.assertTrue(all(self.grid.is_passable(x, y) for x, y in path))
+
+    def test_collapsed_buildings_cost_more(self):
+        self.grid.add_collapsed_building(1, 0)
+        field = FlowField(self.grid, [(0, 0)])
+        self.assertEqual(field.distance(2, 0), 4, "Going around the building is cheaper than through it.")
+
+    def test_max_distance_limits_the_search(self):
+        field = FlowField(self.grid, [(0, 0)], max_distance=3)
+        self.assertEqual(field.distance(1, 2), 3)
+        self.assertIsNone(field.distance(5, 5), "Field expanded past its max distance.")
+
+    def test_grid_field_is_shared_until_targets_change(self):
+        self.grid.add_pheromone(2, 2, "need_help", "Assistance required", 0)
+        field = self.grid.get_need_help_flow_field()
+        self.assertIs(self.grid.get_need_help_flow_field(), field, "Field recomputed although nothing changed.")
+        self.grid.add_pheromone(2, 2, "trail", "Drone trail", 0)
+        self.assertIs(self.grid.get_need_help_flow_field(), field, "A trail pheromone isn't a new target.")
+        self.grid.add_pheromone(8, 8, "need_help", "Assistance required", 1)
+        updated = self.grid.get_need_help_flow_field()
+        self.assertIsNot(updated, field, "New 'Need Help' pheromone didn't refresh the field.")
+        self.assertEqual(updated.distance(8, 7), 1)
+        self.grid.add_mountain(8, 7)
+        self.assertIsNot(self.grid.get_need_help_flow_field(), updated, "Terrain change didn't refresh the field.")
+
+    def test_extra_targets_leave_the_shared_field_alone(self):
+        self.grid.add_pheromone(2, 2, "need_help", "Assistance required", 0)
+        shared = self.grid.get_need_help_flow_field()
+        private = self.grid.get_need_help_flow_field(extra_targets=[(8, 8)])
+        self.assertEqual(private.sources, frozenset({(2, 2), (8, 8)}), "The private field lost a target.")
+        self.assertIs(self.grid.get_need_help_flow_field(), shared, "One drone's targets evicted everyone's field.")
+
+    def test_second_pheromone_on_a_need_help_cell_keeps_the_field(self):
+        self.grid.add_pheromone(2, 2, "need_help", "Assistance required", 0)
+        field = self.grid.get_need_help_flow_field()
+        self.grid.add_pheromone(2, 2, "need_help", "Still here", 1)
+        self.assertIs(self.grid.get_need_help_flow_field(), field, "The same target set was searched twice.")
+
+    def test_faded_need_help_is_no_longer_a_target(self):
+        self.grid.add_pheromone(2, 2, "need_help", "Assistance required", 0)
+        self.grid.advance_time(10000)
+        self.assertEqual(self.grid.get_need_help_flow_field().sources, frozenset())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# test_frontier.py
+import random
+import unittest
+
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+from idk_some_code.spatial_index import BucketIndex
+
+
+class TestBucketIndex(unittest.TestCase):
+    """The bucket index should agree with a plain scan, just faster."""
+
+    def test_nearest_and_within_match_a_brute_force_scan(self):
+        rng = random.Random(7)
+        index = BucketIndex(bucket_size=4)
+        points = {}
+        for item in range(60):
+            points[item] = (rng.randrange(50), rng.randrange(50))
+            index.add(item, *points[item])
+        for item in range(0, 60, 3):  # Move some around, across bucket borders too
+            points[item] = (rng.randrange(50), rng.randrange(50))
+            index.move(item, *points[item])
+        for item in range(0, 60, 5):
+            index.discard(item)
+            del points[item]
+
+        for _ in range(30):
+            x, y = rng.randrange(50), rng.randrange(50)
+            closest = min((px - x) ** 2 + (py - y) ** 2 for px, py in points.values())
+            px, py = points[index.nearest(x, y)]
+            self.assertEqual((px - x) ** 2 + (py - y) ** 2, closest, "Index missed a closer item.")
+            expected = {item for item, (px, py) in points.items() if (px - x) ** 2 + (py - y) ** 2 <= 36}
+            self.assertEqual(set(index.within(x, y, 6)), expected)
+
+    def test_empty_index(self):
+        self.assertIsNone(BucketIndex().nearest(3, 3), "Found something in an empty index.")
+
+
+class TestFrontierIndex(unittest.TestCase):
+    """The frontier should always be the unexplored cells bordering explored ground."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(12, 12)
+
+    def _brute_force_frontier(self):
+        frontier = set()
+        for y in range(self.grid.height):
+            for x in range(self.grid.width):
+                if not self.grid.is_passable(x, y) or self.grid.is_explored(x, y):
+                    continue
+                for nx, ny in ((x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+                    if 0 <= nx < self.grid.width and 0 <= ny < self.grid.height and self.grid.is_explored(nx, ny):
+                        frontier.add((x, y))
+        return frontier
+
+    def test_frontier_matches_a_full_scan(self):
+        rng = random.Random(3)
+        for _ in range(15):
+            self.grid.add_mountain(rng.randrange(12), rng.randrange(12))
+        for _ in range(10):
+            self.grid.add_collapsed_building(rng.randrange(12), rng.randrange(12))
+        for _ in range(80):
+            x, y = rng.randrange(12), rng.randrange(12)
+            if not self.grid.is_passable(x, y):
+                continue
+            if self.grid.obstacles[y][x] is not None:
+                self.grid.explore_cell(x, y)
+            else:
+                self.grid.add_safe_zone(x, y)
+            self.assertEqual(set(self.grid.frontier.cells()), self._brute_force_frontier(),
+                             "Frontier drifted away from the grid.")
+
+    def test_frontier_follows_victims_found_and_rescued(self):
+        rng = random.Random(5)
+        for _ in range(60):
+            x, y = rng.randrange(12), rng.randrange(12)
+            if rng.random() < 0.5:
+                self.grid.add_safe_zone(x, y)
+            else:
+                self.grid.add_victim(x, y)  # Sometimes on explored ground, taking it off again
+            self.assertEqual(set(self.grid.frontier.cells()), self._brute_force_frontier(),
+                             "A new victim threw the frontier off.")
+        for x, y in self.grid.get_victim_positions():
+            self.grid.remove_victim(x, y)
+            self.assertEqual(set(self.grid.frontier.cells()), self._brute_force_frontier(),
+                             "A rescue threw the frontier off.")
+
+    def test_mountain_removes_frontier_cell(self):
+        self.grid.add_safe_zone(5, 5)
+        self.assertIn((5, 6), self.grid.frontier)
+        self.grid.add_mountain(5, 6)
+        self.assertNotIn((5, 6), self.grid.frontier, "Drones can't explore a mountain.")
+        self.assertEqual(len(self.grid.frontier), 3)
+
+    def test_frontier_follows_obstacles_set_directly(self):
+        grid = self.grid
+        grid.add_mountain(3, 2)
+        grid.add_safe_zone(2, 2)
+        grid.obstacles[2][3] = None
+        self.assertIn((3, 2), grid.frontier, "The cleared mountain never joined the frontier.")
+        self.assertEqual(grid.frontier.nearest(4, 2), (3, 2), "The frontier still routes around the old mountain.")
+        grid.obstacles[1][2] = {'type': 'collapsed_building', 'explored': True}
+        self.assertIn((2, 0), grid.frontier, "The explored building's neighbours never joined the frontier.")
+        grid.obstacles[1][2] = {'type': 'mountain'}
+        self.assertEqual(set(grid.frontier.cells()), self._brute_force_frontier(),
+                         "Direct obstacle writes threw the frontier off.")
+
+    def test_drone_explores_nearest_frontier(self):
+        self.grid.add_safe_zone(8, 8)
+        drone = Drone(self.grid, (0, 0))
+        drone.explore_frontier()
+        while drone.destination is not None:
+            self.assertTrue(drone.follow_path())
+        self.assertIn(drone.position, [(7, 8), (8, 7)], "Drone flew past the closest frontier cell.")
+
+    def test_no_frontier_yet(self):
+        drone = Drone(self.grid, (0, 0))
+        self.assertEqual(drone.explore_frontier(), "No frontier left to explore")
+
+
+if __name__ == "__main__":
+    unittest.main()
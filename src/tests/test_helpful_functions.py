@@ -0,0 +1,94 @@
+# test_helpful_functions.py
+import logging
+import os
+import tempfile
+import unittest
+
+from global_code.helpful_functions import (CustomError, benchmark_and_log_exceptions, benchmark_function,
+                                           benchmark_methods, log_exceptions)
+
+# Compiled under a temporary file name so the decorators put their logs in a temporary folder
+SAMPLE = '''
+calls = []
+
+
+def hot(x):
+    return x + 1
+
+
+def broken():
+    raise ValueError("nope")
+
+
+def custom():
+    raise CustomError("custom")
+
+
+class Sample:
+    def work(self, x):
+        calls.append(x)
+        return x * 2
+'''
+
+
+class TestDecorators(unittest.TestCase):
+    """Timing a function should not cost more than the function."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.namespace = {"CustomError": CustomError}
+        exec(compile(SAMPLE, os.path.join(self.directory.name, "sample.py"), "exec"), self.namespace)
+
+    def tearDown(self) -> None:
+        for name in ("BM_hot", "BM_Sample.work", "broken", "custom"):
+            logger = logging.getLogger(name)
+            for handler in list(logger.handlers):
+                handler.close()
+                logger.removeHandler(handler)
+        self.directory.cleanup()
+
+    def _log(self, name):
+        with open(os.path.join(self.directory.name, "logs", "sample", name + ".log")) as file:
+            return file.read()
+
+    def test_timings_are_aggregated(self):
+        hot = benchmark_function(flush_every=50)(self.namespace["hot"])
+        self.assertEqual([hot(x) for x in range(120)], list(range(1, 121)), "The benchmark changed the answer")
+        self.assertEqual(hot.__name__, "hot", "The wrapper forgot who it wraps")
+        self.assertEqual(hot.timing_stats.count, 20, "Timings were not kept in memory between flushes")
+        hot.timing_stats.flush()
+        self.assertEqual(self._log("BM_hot").count("hot ran"), 3, "Expected one summary line per flush")
+
+    def test_without_parentheses(self):
+        hot = benchmark_function(self.namespace["hot"])
+        self.assertEqual(hot(1), 2, "Bare @benchmark_function broke the function")
+
+    def test_loggers_are_created_once(self):
+        for _ in range(3):
+            benchmark_function(self.namespace["hot"])(1)
+        self.assertEqual(len(logging.getLogger("BM_hot").handlers), 1, "Every decoration leaked a file handler")
+
+    def test_log_exceptions_raises(self):
+        broken = log_exceptions(self.namespace["broken"])
+        with self.assertRaises(ValueError, msg="The exception got swallowed"):
+            broken()
+        self.assertIn("nope", self._log("broken"), "The exception never made it to the log")
+
+    def test_benchmark_and_log_exceptions(self):
+        self.assertIsNone(benchmark_and_log_exceptions()(self.namespace["broken"])(),
+                          "A plain exception should be logged and swallowed")
+        with self.assertRaises(CustomError, msg="CustomError should keep going up the stack"):
+            benchmark_and_log_exceptions(self.namespace["custom"])()
+
+    def test_benchmark_methods(self):
+        sample_class = self.namespace["Sample"]
+        original = sample_class.__dict__["work"]
+        restore = benchmark_methods(sample_class, ["work"])
+        self.assertEqual(sample_class().work(4), 8, "The timed method changed the answer")
+        restore()
+        self.assertIs(sample_class.__dict__["work"], original, "The original method was not put back")
+        self.assertIn("Sample.work ran 1 times", self._log("BM_Sample.work"), "The summary was not flushed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# test_parquet_export.py
+import os
+import shutil
+import tempfile
+import unittest
+
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from idk_some_code.action_log import read_actions
+from idk_some_code.main import replay_simulation, simulate_disaster_response
+from idk_some_code.parquet_export import ParquetExporter
+
+RUN = dict(grid_size=(30, 30), num_drones=5, num_victims=40, simulation_time=60, policy="stub", seed=2)
+
+
+def _table(directory, name):
+    return ds.dataset(os.path.join(directory, name), partitioning="hive").to_table()
+
+
+class TestParquetExport(unittest.TestCase):
+    """Millions of ticks later, somebody will want to read this back."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_every_tick_and_drone_exported(self):
+        summary = simulate_disaster_response(**RUN, exporter=ParquetExporter(self.directory), run_id="first")
+        positions, kpis = _table(self.directory, "positions"), _table(self.directory, "kpis")
+        self.assertEqual(positions.num_rows, 60 * 5, "Drones went missing from the positions")
+        self.assertEqual(kpis.num_rows, 60, "Ticks went missing from the KPIs")
+        self.assertEqual(kpis.column("decisions").to_pylist()[-1], summary["decisions"], "The KPIs lost count")
+        self.assertEqual(set(positions.column("run_id").to_pylist()), {"first"}, "The run landed in the wrong partition")
+        self.assertGreater(_table(self.directory, "pheromones").num_rows, 0, "Not a single trail was exported")
+
+    def test_actions_match_the_action_log(self):
+        log_path = os.path.join(self.directory, "actions.log")
+        simulate_disaster_response(**RUN, exporter=ParquetExporter(os.path.join(self.directory, "out")),
+                                   record_actions=log_path)
+        logged = [(record.tick, record.drone_id, record.action) for record in list(read_actions(log_path))[1:]
+                  if record.action != "consult"]
+        actions = _table(os.path.join(self.directory, "out"), "actions")
+        exported = list(zip(*(actions.column(name).to_pylist() for name in ("tick", "drone_id", "action"))))
+        self.assertGreater(len(logged), 0, "The stub never did anything")
+        self.assertEqual(exported, logged, "The exporter and the action log remember different decisions")
+
+    def test_heuristic_actions_exported(self):
+        log_path = os.path.join(self.directory, "actions.log")
+        simulate_disaster_response(**dict(RUN, policy="heuristic"), record_actions=log_path,
+                                   exporter=ParquetExporter(os.path.join(self.directory, "out")))
+        logged = [(record.tick, record.drone_id, record.action) for record in list(read_actions(log_path))[1:]
+                  if record.action != "consult"]
+        actions = _table(os.path.join(self.directory, "out"), "actions")
+        exported = list(zip(*(actions.column(name).to_pylist() for name in ("tick", "drone_id", "action"))))
+        self.assertGreater(len(exported), 0, "The heuristic drones moved without anybody writing it down")
+        self.assertTrue(all(action.startswith("move_") for _, _, action in exported), "The heuristic grew new tricks")
+        self.assertEqual(exported, logged, "The exporter and the action log remember different decisions")
+
+    def test_replayed_run_exports_the_same(self):
+        log_path = os.path.join(self.directory, "actions.log")
+        simulate_disaster_response(**RUN, exporter=ParquetExporter(self.directory), run_id="live",
+                                   record_actions=log_path)
+        replay_simulation(log_path, exporter=ParquetExporter(self.directory), run_id="replayed")
+        positions = _table(self.directory, "positions")
+        by_run = {}
+        for run_id, tick, drone_id, x, y in zip(*(positions.column(name).to_pylist()
+                                                   for name in ("run_id", "tick", "drone_id", "x", "y"))):
+            by_run.setdefault(run_id, set()).add((tick, drone_id, x, y))
+        self.assertEqual(by_run["replayed"], by_run["live"], "The replay flew somewhere else")
+
+    def test_parts_and_row_groups_stay_bounded(self):
+        exporter = ParquetExporter(self.directory, row_group_size=64, ticks_per_file=20)
+        simulate_disaster_response(**RUN, exporter=exporter)
+        position_files = sorted(path for path in exporter.files if "positions" in path)
+        self.assertEqual(len(position_files), 3, "60 ticks at 20 per file should be 3 parts")
+        for path in position_files:
+            metadata = pq.ParquetFile(path).metadata
+            self.assertTrue(all(metadata.row_group(index).num_rows <= 64 for index in range(metadata.num_row_groups)),
+                            "A row group outgrew its buffer")
+        self.assertEqual(_table(self.directory, "positions").num_rows, 60 * 5, "Rolling files lost rows")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# test_perception.py
+import random
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from idk_some_code.grid import Grid
+from idk_some_code.perception import PerceptionWindow
+
+
+class TestPerceptionWindow(unittest.TestCase):
+    """The incremental window has to see exactly what a full scan sees, while reading far fewer cells."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(40, 40)
+        self.window = PerceptionWindow(self.grid, radius=10)
+
+    def _assert_matches_full_scan(self, center, visibility):
+        expected = self.grid.get_pheromones_square(center, visibility)
+        actual = self.window.pheromones_square(visibility)
+        for direction in expected:
+            self.assertEqual([p['message'] for p in actual[direction]], [p['message'] for p in expected[direction]],
+                             f"Window and full scan disagree about what's {direction} of {center}.")
+
+    def test_matches_full_scan_while_wandering(self):
+        rng = random.Random(7)
+        position = (20, 20)
+        for step in range(200):
+            if rng.random() < 0.5:
+                px, py = rng.randrange(40), rng.randrange(40)
+                self.grid.add_pheromone(px, py, rng.choice(["trail", "need_help"]), f"{step}", step)
+            dx, dy = rng.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
+            position = (min(39, max(0, position[0] + dx)), min(39, max(0, position[1] + dy)))
+            self.window.update(position)
+            self._assert_matches_full_scan(position, 10)
+            self._assert_matches_full_scan(position, 5)
+
+    def test_one_cell_move_reads_only_the_entering_edge(self):
+        self.window.update((20, 20))
+        before = self.window.cells_read
+        self.window.update((21, 20))
+        self.assertEqual(self.window.cells_read - before, 21, "A one cell move should only read one column.")
+
+    def test_unchanged_grid_is_not_read_again(self):
+        self.window.update((20, 20))
+        before = self.window.cells_read
+        self.window.update((20, 20))
+        self.assertEqual(self.window.cells_read, before, "Standing still shouldn't cost any grid reads.")
+
+    def test_changed_cell_inside_window_is_picked_up(self):
+        self.window.update((20, 20))
+        self.grid.add_pheromone(22, 18, "need_help", "Help!", 0)
+        before = self.window.cells_read
+        self.window.update((20, 20))
+        self.assertEqual(self.window.cells_read - before, 1, "Only the changed cell should be read again.")
+        self.assertEqual(self.window.cells_with("need_help"), {(22, 18)})
+
+    def test_sync_follows_the_change_journal(self):
+        self.window.update((20, 20))
+        self.grid.add_pheromone(35, 35, "trail", "far away", 0)
+        self.grid.add_pheromone(22, 18, "need_help", "close by", 0)
+        self.grid.add_mountains(np.array([21 * 40 + 19, 3]))
+        before = self.window.cells_read
+        # No stamps to compare, the window has to find the changes in the journal
+        with mock.patch.object(self.grid, "cell_versions", None):
+            self.window.update((20, 20))
+        self.assertEqual(self.window.cells_read - before, 2, "Only the changed cells in the window should be read.")
+        self._assert_matches_full_scan((20, 20), 10)
+
+    def test_sync_falls_back_when_the_journal_ran_out(self):
+        with mock.patch("idk_some_code.grid.JOURNAL_LENGTH", 4):
+            self.grid = Grid(40, 40)
+        self.window = PerceptionWindow(self.grid, radius=10)
+        self.window.update((20, 20))
+        for step in range(12):
+            self.grid.add_pheromone(15 + step, 20, "trail", f"{step}", step)
+        self.assertIsNone(self.grid.changes_since(0), "The journal should have been trimmed.")
+        self.window.update((20, 20))
+        self._assert_matches_full_scan((20, 20), 10)
+
+    def test_pheromone_counts(self):
+        self.grid.add_pheromone(20, 15, "need_help", "Help!", 0)
+        self.grid.add_pheromone(20, 15, "area_cleared", "Cleared", 0)
+        self.grid.add_pheromone(25, 25, "need_help", "Help!", 0)
+        self.window.update((20, 20))
+        counts = self.window.pheromone_counts(("need_help", "area_cleared"))
+        self.assertEqual(counts["N"], {"need_help": 1, "area_cleared": 1})
+        self.assertEqual(counts["SE"], {"need_help": 1, "area_cleared": 0})
+
+    def test_aging_keeps_cached_pheromones_current(self):
+        self.grid.add_pheromone(21, 20, "trail", "Drone trail", 0)
+        self.window.update((20, 20))
+        self.grid.age_pheromones(current_time=50, decay_rate=10)
+        self.window.update((20, 20))
+        self.assertLess(self.window.pheromones_at(21, 20)[0]['intensity'], 1.0,
+                        "Window is looking at a stale copy of the pheromone.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# test_planner.py
+import unittest
+
+from idk_some_code.controller import EventDrivenController
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+from idk_some_code.planner import plan_path, path_cost
+
+
+class TestPlanPath(unittest.TestCase):
+    """The planner should find the cheap way around, never the way over a mountain."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(10, 10)
+
+    def test_straight_line(self):
+        path = plan_path(self.grid, (0, 0), (3, 0))
+        self.assertEqual(path, [(1, 0), (2, 0), (3, 0)])
+
+    def test_already_there(self):
+        self.assertEqual(plan_path(self.grid, (4, 4), (4, 4)), [])
+
+    def test_goes_around_mountains(self):
+        for y in range(0, 9):
+            self.grid.add_mountain(5, y)  # A wall with a gap at the bottom
+        path = plan_path(self.grid, (0, 0), (9, 0))
+        self.assertIsNotNone(path, "Planner gave up even though there's a gap in the wall.")
+        self.assertIn((5, 9), path, "Planner didn't use the only gap in the wall.")
+        self.assertTrue(all(self.grid.is_passable(x, y) for x, y in path), "Planner flew through a mountain.")
+
+    def test_unreachable_goal(self):
+        for y in range(10):
+            self.grid.add_mountain(5, y)
+        self.assertIsNone(plan_path(self.grid, (0, 0), (9, 0)), "Planner found a path through solid rock.")
+        self.assertIsNone(plan_path(self.grid, (0, 0), (5, 5)), "A mountain can't be a destination.")
+
+    def test_prefers_detour_over_collapsed_buildings(self):
+        for y in range(0, 3):
+            self.grid.add_collapsed_building(2, y)
+        # Going through a building costs 3, walking around the 3 tall block costs 6 extra moves
+        path = plan_path(self.grid, (0, 1), (4, 1))
+        self.assertEqual(path_cost(self.grid, path), 6, "Planner should cut through one building here.")
+        self.grid.explore_cell(2, 1)
+        path = plan_path(self.grid, (0, 1), (4, 1))
+        self.assertEqual(path_cost(self.grid, path), 4, "An explored building should cost like open ground.")
+
+
+class TestDroneGoTo(unittest.TestCase):
+    """A single go_to should carry the drone all the way without asking the model again."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(10, 10)
+        self.drone = Drone(self.grid, (0, 0))
+
+    def test_go_to_takes_first_step_and_controller_follows(self):
+        self.drone.go_to(3, 2)
+        self.assertEqual(self.drone.controller.last_intent, EventDrivenController.INTENT_GO_TO)
+        steps = 1
+        while self.drone.destination is not None:
+            self.assertTrue(self.drone.controller.continue_intent(self.drone))
+            steps += 1
+        self.assertEqual(self.drone.position, (3, 2))
+        self.assertEqual(steps, 5, "Drone took a scenic route.")
+        self.assertTrue(self.drone.controller.arrived, "Arriving should be reported to the controller.")
+
+    def test_replans_when_blocked(self):
+        self.drone.go_to(5, 0)
+        self.grid.add_mountain(2, 0)  # Drops in front of the drone after planning
+        while self.drone.destination is not None:
+            self.assertTrue(self.drone.follow_path(), "Drone gave up instead of replanning.")
+        self.assertEqual(self.drone.position, (5, 0))
+
+    def test_respond_to_need_help_follows_flow_field(self):
+        self.grid.add_pheromone(4, 3, "need_help", "Assistance required", 0)
+        self.drone.respond_to_need_help()
+        while self.drone.controller.last_intent is not None:
+            self.assertTrue(self.drone.controller.continue_intent(self.drone))
+        self.assertEqual(self.drone.position, (4, 3), "Drone didn't show up where help was needed.")
+        self.assertTrue(self.drone.controller.arrived)
+
+    def test_unreachable_destination_is_reported(self):
+        for y in range(10):
+            self.grid.add_mountain(5, y)
+        self.assertEqual(self.drone.go_to(9, 9), "UNREACHABLE")
+        self.assertEqual(self.drone.position, (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+# test_procedural.py
+import tempfile
+import unittest
+
+import numpy as np
+
+from idk_some_code.grid import Grid
+from idk_some_code.procedural import build_procedural_scenario, fractal_noise, generate_procedural_scenario
+from idk_some_code.scenario_cache import ScenarioCache
+
+
+class TestProceduralScenario(unittest.TestCase):
+    """Disasters with some structure to them, and never generated twice."""
+
+    def test_noise_is_smooth_and_bounded(self):
+        noise = fractal_noise(64, 48, 16, np.random.default_rng(0), octaves=1)
+        self.assertEqual(noise.shape, (48, 64))
+        self.assertTrue((noise >= 0).all() and (noise <= 1).all(), "Noise escaped its [0, 1] box.")
+        self.assertLess(np.abs(np.diff(noise, axis=1)).max(), 0.25, "Single octave noise shouldn't be this jumpy.")
+
+    def test_counts_and_layers_dont_overlap(self):
+        layers = generate_procedural_scenario(80, 60, 200, 500, 150, seed=7)
+        self.assertEqual(len(layers["mountains"]), 200)
+        self.assertEqual(len(set(layers["buildings"].tolist())), 500)
+        self.assertEqual(len(set(layers["victims"].tolist())), 150)
+        self.assertFalse(set(layers["mountains"].tolist()) & set(layers["buildings"].tolist()),
+                         "A building collapsed on top of a mountain.")
+        self.assertFalse(set(layers["mountains"].tolist()) & set(layers["victims"].tolist()),
+                         "Victim stranded on a mountain top.")
+
+    def test_victims_cluster_in_rubble(self):
+        layers = generate_procedural_scenario(100, 100, 500, 1000, 400, seed=1)
+        in_rubble = np.isin(layers["victims"], layers["buildings"]).mean()
+        self.assertGreater(in_rubble, 1000 / 10000 * 2, "Victims don't care where the buildings collapsed.")
+
+    def test_same_seed_same_scenario(self):
+        first = generate_procedural_scenario(40, 40, 50, 100, 30, seed=3)
+        second = generate_procedural_scenario(40, 40, 50, 100, 30, seed=3)
+        for name in first:
+            np.testing.assert_array_equal(first[name], second[name])
+
+    def test_cache_returns_identical_scenario(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ScenarioCache(directory)
+            first, second, other = Grid(30, 30), Grid(30, 30), Grid(30, 30)
+            build_procedural_scenario(first, 40, 80, 20, seed=5, cache=cache)
+            build_procedural_scenario(second, 40, 80, 20, seed=5, cache=cache)
+            self.assertEqual((cache.hits, cache.misses), (1, 1), "Second run should have come from the cache.")
+            np.testing.assert_array_equal(first.terrain, second.terrain)
+            np.testing.assert_array_equal(first.grid, second.grid)
+            build_procedural_scenario(other, 40, 80, 20, seed=6, cache=cache)
+            self.assertEqual(cache.misses, 2, "A different seed can't be a cache hit.")
+
+    def test_cache_key_ignores_parameter_order(self):
+        self.assertEqual(ScenarioCache.key({"a": 1, "b": 2}), ScenarioCache.key({"b": 2, "a": 1}))
+
+
+if __name__ == "__main__":
+    unittest.main()
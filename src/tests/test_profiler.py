@@ -0,0 +1,79 @@
+# test_profiler.py
+import os
+import pstats
+import shutil
+import tempfile
+import unittest
+
+from idk_some_code.drone import Drone
+from idk_some_code.main import simulate_disaster_response
+from idk_some_code.profiler import Histogram, PhaseProfiler, _bucket, _bucket_bounds
+
+
+class TestHistogram(unittest.TestCase):
+    """Percentiles without keeping a single sample."""
+
+    def test_buckets_cover_durations(self):
+        for ns in list(range(200)) + [10 ** 3, 12345, 10 ** 6 + 7, 3 * 10 ** 9, 2 ** 62 + 5]:
+            low, high = _bucket_bounds(_bucket(ns))
+            self.assertTrue(low <= ns < high, f"{ns} ns fell outside its own bucket")
+            self.assertLessEqual(high - low, max(low / 16, 1), "A bucket got too wide to trust")
+
+    def test_percentiles(self):
+        histogram = Histogram()
+        for ns in range(1, 10001):
+            histogram.record(ns * 1000)
+        for percent in (50, 95, 99):
+            self.assertAlmostEqual(histogram.percentile(percent), percent * 100000, delta=percent * 100000 * 0.07,
+                                   msg=f"p{percent} is off by more than a bucket")
+        self.assertEqual(histogram.percentile(100), 10 ** 7, "The slowest call went missing")
+        self.assertEqual(Histogram().percentile(50), 0.0, "An empty histogram made up a duration")
+
+
+class TestPhaseProfiler(unittest.TestCase):
+    """Who ate the tick?"""
+
+    def test_nested_phases_are_charged_once(self):
+        profiler = PhaseProfiler()
+        with profiler.phase("outer"):
+            with profiler.phase("inner"):
+                sum(range(10000))
+        outer, inner = profiler.histograms["outer"], profiler.histograms["inner"]
+        self.assertEqual((outer.count, inner.count), (1, 1), "A phase was counted twice")
+        self.assertLess(outer.total, inner.total, "The outer phase was also charged for the inner one")
+
+    def test_instrumented_restores_methods(self):
+        original_move = Drone.__dict__["move"]
+        profiler = PhaseProfiler()
+        with profiler.instrumented():
+            self.assertIsNot(Drone.__dict__["move"], original_move, "move was never wrapped")
+        self.assertIs(Drone.__dict__["move"], original_move, "The profiler left its fingerprints on Drone")
+
+    def test_profiled_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = PhaseProfiler(capture_ticks=[5], capture_dir=directory)
+            summary = simulate_disaster_response((20, 20), 3, 20, 30, "heuristic", seed=2, profiler=profiler)
+            plain = simulate_disaster_response((20, 20), 3, 20, 30, "heuristic", seed=2)
+            self.assertEqual(summary, plain, "Profiling changed the outcome of the run")
+            phases = profiler.summary()
+            for phase in ("perception", "decision", "action", "decay", "tick"):
+                self.assertIn(phase, phases, f"The {phase} phase was never timed")
+            self.assertEqual(phases["tick"]["calls"], 30, "Ticks went uncounted")
+            self.assertEqual(profiler.captures, [os.path.join(directory, "tick_000005.prof")], "Wrong ticks captured")
+            self.assertGreater(pstats.Stats(profiler.captures[0]).total_calls, 0, "The capture is empty")
+            self.assertIn("p99_us", profiler.report(), "The report lost its tail")
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg is not installed")
+    def test_profiled_video_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = PhaseProfiler(capture_ticks=[3], capture_dir=directory)
+            video = os.path.join(directory, "run.mp4")
+            simulate_disaster_response((20, 20), 3, 20, 10, "heuristic", seed=2, video_path=video, profiler=profiler)
+            self.assertTrue(os.path.getsize(video) > 0, "The video got lost behind the profiler")
+            self.assertEqual(profiler.summary()["render"]["calls"], 20, "Frames were drawn off the clock")
+            self.assertEqual(profiler.captures, [os.path.join(directory, "tick_000003.prof")],
+                             "The video swallowed the capture")
+
+
+if __name__ == '__main__':
+    unittest.main()
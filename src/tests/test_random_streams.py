@@ -0,0 +1,58 @@
+# test_random_streams.py
+import unittest
+
+import numpy as np
+
+from idk_some_code.main import initialize_simulation, initialize_victims, schedule_drones
+from idk_some_code.random_streams import RandomStream, SimulationRandom
+
+
+class TestRandomStreams(unittest.TestCase):
+    """Same seed, same disaster, same drone dance moves."""
+
+    def _run(self, seed, num_drones=4, steps=60):
+        streams = SimulationRandom(seed)
+        grid, drones = initialize_simulation((30, 30), num_drones, 20, 80, streams)
+        initialize_victims(grid, 40, streams.generator("victims"))
+        for drone in drones:
+            drone.policy = "heuristic"
+        schedule_drones(grid, drones).run_until(steps)
+        return grid, drones
+
+    def test_same_seed_is_bit_identical(self):
+        first_grid, first_drones = self._run(123)
+        second_grid, second_drones = self._run(123)
+        np.testing.assert_array_equal(first_grid.terrain, second_grid.terrain)
+        np.testing.assert_array_equal(first_grid.grid, second_grid.grid)
+        self.assertEqual([drone.position for drone in first_drones], [drone.position for drone in second_drones],
+                         "Same seed, different flight paths.")
+
+    def test_different_seeds_differ(self):
+        first_grid, _ = self._run(1, steps=0)
+        second_grid, _ = self._run(2, steps=0)
+        self.assertFalse(np.array_equal(first_grid.terrain, second_grid.terrain), "Seed doesn't reach the map.")
+
+    def test_drone_stream_doesnt_depend_on_swarm_size(self):
+        small = SimulationRandom(9).drone_streams(2)
+        large = SimulationRandom(9).drone_streams(5)
+        for first, second in zip(small, large):
+            self.assertEqual([first.random() for _ in range(10)], [second.random() for _ in range(10)],
+                             "Adding drones changed what the existing ones roll.")
+
+    def test_streams_are_independent(self):
+        first, second = SimulationRandom(9).drone_streams(2)
+        self.assertNotEqual([first.random() for _ in range(5)], [second.random() for _ in range(5)])
+
+    def test_batched_stream_matches_generator(self):
+        stream = RandomStream(np.random.default_rng(4), batch_size=3)
+        drawn = [stream.random() for _ in range(7)]
+        expected = np.random.default_rng(4).random(9)[:7].tolist()
+        self.assertEqual(drawn, expected, "Batching changed the numbers themselves.")
+
+    def test_unknown_subsystem(self):
+        with self.assertRaises(ValueError):
+            SimulationRandom(0).generator("weather")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+# test_raster.py
+import unittest
+from unittest.mock import patch
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+
+from idk_some_code.grid import Grid
+from idk_some_code.main import main, schedule_drones, setup_visualization, update_visualization
+from idk_some_code.drone import Drone
+from idk_some_code.raster import COLORS, GridRaster
+
+
+class TestGridRaster(unittest.TestCase):
+    """One pixel per cell, and only the ones that changed get a new coat of paint."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(12, 8)
+
+    def _color(self, image, x, y):
+        return tuple(int(channel) for channel in image[y, x])
+
+    def test_layers_have_their_colors(self):
+        self.grid.add_mountain(1, 1)
+        self.grid.add_collapsed_building(2, 2)
+        self.grid.add_victim(3, 3)
+        self.grid.add_safe_zone(4, 4)
+        self.grid.add_pheromone(5, 5, "need_help", "Assistance required", 0)
+        image = GridRaster(self.grid).update()
+        self.assertEqual(self._color(image, 1, 1), COLORS["mountain"])
+        self.assertEqual(self._color(image, 2, 2), COLORS["collapsed_building"])
+        self.assertEqual(self._color(image, 3, 3), COLORS["victim"])
+        self.assertEqual(self._color(image, 4, 4), COLORS["safe_zone"])
+        self.assertEqual(self._color(image, 5, 5), COLORS["need_help"])
+        self.assertEqual(self._color(image, 0, 0), COLORS["background"])
+
+    def test_incremental_updates_match_a_fresh_paint(self):
+        raster = GridRaster(self.grid)
+        raster.update()
+        rng = np.random.default_rng(2)
+        for step in range(40):
+            x, y = int(rng.integers(12)), int(rng.integers(8))
+            action = step % 5
+            if action == 0:
+                self.grid.add_mountain(x, y)
+            elif action == 1:
+                self.grid.add_victim(x, y)
+            elif action == 2:
+                self.grid.add_safe_zone(x, y)
+            elif action == 3:
+                self.grid.add_pheromone(x, y, "area_cleared", "Area now under control", step)
+            else:
+                self.grid.advance_time(300)  # Lets pheromones fade away
+            np.testing.assert_array_equal(raster.update(), GridRaster(self.grid).update(),
+                                          "Incremental raster drifted from the grid.")
+
+    def test_unchanged_grid_paints_nothing(self):
+        raster = GridRaster(self.grid)
+        raster.update()
+        raster.image[0, 0] = (1, 2, 3)  # Would be overwritten by a repaint
+        raster.update()
+        self.assertEqual(self._color(raster.image, 0, 0), (1, 2, 3), "Raster repainted a grid that didn't change.")
+
+    def test_visualization_updates(self):
+        drones = [Drone(self.grid, (6, 4), policy="heuristic")]
+        fig, ax, drone_scatter, grid_image, raster = setup_visualization(self.grid, (12, 8), drones)
+        scheduler = schedule_drones(self.grid, drones)
+        artists = update_visualization(3, self.grid, drones, scheduler, drone_scatter, grid_image, raster)
+        self.assertIn(grid_image, artists)
+        self.assertEqual(self._color(grid_image.get_array(), *drones[0].position), COLORS["safe_zone"],
+                         "Cell the drone just explored isn't shown as safe.")
+
+    def test_interactive_main_animates_the_raster(self):
+        with patch("matplotlib.pyplot.show") as show, patch("matplotlib.animation.FuncAnimation") as animation, \
+                patch("idk_some_code.main.record_simulation") as record:
+            main(show=True)
+        show.assert_called_once()
+        record.assert_not_called()
+        figure, update = animation.call_args.args
+        self.assertIs(update, update_visualization, "The window is animated by something else.")
+        self.assertEqual(len(figure.axes[0].images), 1, "The grid is not painted as a single raster.")
+
+
+if __name__ == "__main__":
+    unittest.main()
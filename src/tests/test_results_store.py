@@ -0,0 +1,124 @@
+# test_results_store.py
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from global_code.helpful_functions import ConnectionPool, SQLiteConnection, _statement_kind
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+from idk_some_code.main import simulate_disaster_response
+from idk_some_code.profiler import PhaseProfiler
+from idk_some_code.results_store import ResultsStore, open_results_store
+
+
+class CountingConnection(SQLiteConnection):
+    """A SQLite connection counting its round trips."""
+    opened = 0
+
+    def __init__(self, db):
+        super().__init__(db)
+        CountingConnection.opened += 1
+        self.batches = []
+
+    def execute_many(self, query, rows):
+        self.batches.append(len(rows))
+        return super().execute_many(query, rows)
+
+
+class BrokenConnection(SQLiteConnection):
+    def execute_many(self, query, rows):
+        raise OSError("the database went for coffee")
+
+
+class TestResultsStore(unittest.TestCase):
+    """A thousand drones, and the database barely notices."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.directory, "results.db")
+        CountingConnection.opened = 0
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_ticks_are_written_in_batches(self):
+        pool = ConnectionPool(lambda: CountingConnection(self.db_path), size=2)
+        grid = Grid(40, 40)
+        drones = [Drone(grid, (i % 40, i // 40), policy="heuristic", drone_id=i) for i in range(1000)]
+        with ResultsStore(pool, batch_size=4000) as store:
+            for tick in range(10):
+                store.record_tick("run", tick, grid, drones, tick)
+            store.flush()
+            rows = store.query("SELECT COUNT(*) AS n FROM drone_ticks")[0]["n"]
+            batches = [size for connection in pool._opened for size in connection.batches]
+        self.assertEqual(rows, 10000, "Some drones never made it into the database")
+        self.assertLessEqual(len(batches), 5, "The store went to the database once per drone")
+        self.assertLessEqual(CountingConnection.opened, 2, "The pool kept opening new connections")
+
+    def test_run_row(self):
+        with open_results_store(self.db_path) as writer:
+            summary = simulate_disaster_response((20, 20), 3, 15, 30, "heuristic", seed=4, run_id="seed-4",
+                                                 results_store=writer)
+        store = open_results_store(self.db_path)
+        try:
+            run = store.query("SELECT * FROM runs WHERE run_id = ?", ("seed-4",))[0]
+            ticks = store.query("SELECT COUNT(*) AS n FROM tick_metrics WHERE run_id = ?", ("seed-4",))[0]["n"]
+            drone_ticks = store.query("SELECT COUNT(*) AS n FROM drone_ticks")[0]["n"]
+        finally:
+            store.close()
+        self.assertEqual(summary["run_id"], "seed-4", "The run forgot its name")
+        self.assertEqual(run["seed"], "4", "The stored run lost its seed")
+        self.assertGreater(run["wall_time"], 0, "Nobody timed the stored run")
+        self.assertEqual(run["victims_rescued"], summary["victims_rescued"], "The database tells another story")
+        self.assertEqual(ticks, 30, "Ticks went missing between the simulation and the database")
+        self.assertEqual(drone_ticks, 90, "Drones went missing between the simulation and the database")
+
+    def test_large_seed_and_video_run(self):
+        video = os.path.join(os.path.dirname(self.db_path), "run.mp4")
+        with open_results_store(self.db_path) as writer:
+            # As big as the seeds picked from OS entropy when no seed is given
+            summary = simulate_disaster_response((20, 20), 2, 10, 12, "heuristic", seed=2 ** 100, run_id="entropy",
+                                                 results_store=writer, video_path=video if shutil.which("ffmpeg")
+                                                 else None, profiler=PhaseProfiler())
+        store = open_results_store(self.db_path)
+        try:
+            run = store.query("SELECT seed FROM runs WHERE run_id = ?", ("entropy",))[0]
+            ticks = store.query("SELECT COUNT(*) AS n FROM tick_metrics WHERE run_id = ?", ("entropy",))[0]["n"]
+        finally:
+            store.close()
+        self.assertEqual(run["seed"], str(summary["seed"]), "The 128 bit seed didn't survive the database")
+        self.assertEqual(ticks, 12, "The profiler ran the ticks behind the store's back")
+
+    def test_writer_errors_surface(self):
+        store = ResultsStore(ConnectionPool(lambda: BrokenConnection(self.db_path)))
+        store.add_rows("tick_metrics", [("run", 0, 0, 0, 0)])
+        with self.assertRaises(RuntimeError):
+            store.flush()
+        store.close()
+
+    def test_interval_flush_without_filling_a_batch(self):
+        with ResultsStore(ConnectionPool(lambda: SQLiteConnection(self.db_path)), flush_interval=0.01) as store:
+            store.add_rows("tick_metrics", [("run", 0, 1, 2, 3)])
+            deadline = time.monotonic() + 2
+            while not store.rows_written and time.monotonic() < deadline:
+                time.sleep(0.01)
+            written = store.rows_written
+        self.assertEqual(written, 1, "A lonely row waited forever for company")
+
+    def test_pool_reuses_connections(self):
+        pool = ConnectionPool(lambda: CountingConnection(self.db_path), size=1)
+        for _ in range(5):
+            with pool.connection() as connection:
+                connection.query_db("SELECT 1")
+        self.assertEqual(CountingConnection.opened, 1, "Every query got its own connection")
+        pool.close()
+
+    def test_statement_kind(self):
+        self.assertEqual(_statement_kind("  select inserted_at from runs"), "select", "Mistook a SELECT for an INSERT")
+        self.assertEqual(_statement_kind("INSERT INTO runs VALUES (1)"), "insert", "Didn't recognize an INSERT")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# test_scenario.py
+import unittest
+
+import numpy as np
+
+from idk_some_code.grid import Grid
+from idk_some_code.scenario import build_scenario, sample_free_cells
+
+
+class TestScenario(unittest.TestCase):
+    """Whole maps in one go, and nobody ends up sharing a cell."""
+
+    def test_sample_free_cells_stays_inside_the_mask(self):
+        rng = np.random.default_rng(5)
+        for _ in range(50):
+            allowed = rng.random((8, 11)) < rng.random()
+            count = int(rng.integers(0, 100))
+            cells = sample_free_cells(allowed, count, rng)
+            self.assertEqual(len(cells), min(count, allowed.sum()))
+            self.assertEqual(len(set(cells.tolist())), len(cells), "Same cell drawn twice.")
+            self.assertTrue(allowed.flat[cells].all(), "Drew a cell outside the mask.")
+
+    def test_counts_and_no_overlap(self):
+        grid = Grid(50, 40)
+        build_scenario(grid, 100, 300, 200, np.random.default_rng(1))
+        self.assertEqual(len(grid.get_mountain_positions()), 100)
+        self.assertEqual(int((grid.terrain == 2).sum()), 300)
+        victims = grid.get_victim_positions()
+        self.assertEqual(len(victims), 200)
+        self.assertFalse(any(grid.is_obstacle(x, y) for x, y in victims), "A victim got buried under an obstacle.")
+
+    def test_same_seed_same_map(self):
+        first, second = Grid(30, 30), Grid(30, 30)
+        build_scenario(first, 20, 50, 40, np.random.default_rng(42))
+        build_scenario(second, 20, 50, 40, np.random.default_rng(42))
+        np.testing.assert_array_equal(first.terrain, second.terrain)
+        np.testing.assert_array_equal(first.grid, second.grid)
+
+    def test_keep_clear_and_existing_content(self):
+        grid = Grid(20, 20)
+        grid.add_safe_zone(0, 0)
+        build_scenario(grid, 100, 100, 100, np.random.default_rng(3), keep_clear=(10, 10, 2))
+        self.assertTrue(grid.is_safe_zone(0, 0), "Scenario builder paved over a safe zone.")
+        area = (slice(8, 13), slice(8, 13))
+        self.assertFalse(grid.terrain[area].any() or (grid.grid[area] == 2).any(), "Start area isn't clear.")
+
+    def test_full_map(self):
+        grid = Grid(5, 5)
+        build_scenario(grid, 10, 10, 10, np.random.default_rng(0))
+        self.assertEqual(int((grid.terrain != 0).sum() + (grid.grid == 2).sum()), 25, "Couldn't fill a tiny map.")
+
+    def test_obstacle_view_matches_layers(self):
+        grid = Grid(6, 6)
+        grid.add_collapsed_building(1, 2)
+        self.assertEqual(grid.obstacles[2][1], {'type': 'collapsed_building', 'explored': False})
+        grid.explore_cell(1, 2)
+        self.assertTrue(grid.obstacles[2][1]['explored'], "Explored building forgot it was explored.")
+        grid.obstacles[3][3] = {'type': 'mountain'}
+        self.assertFalse(grid.is_passable(3, 3))
+        grid.add_collapsed_building(1, 1)
+        grid.obstacles[1][1]['explored'] = True
+        self.assertTrue(grid.obstacles[1][1]['explored'], "Exploring through the old view got lost.")
+        self.assertTrue(grid.is_explored(1, 1), "The layers never heard the building was explored.")
+        with self.assertRaises(TypeError):
+            del grid.obstacles[1][1]['explored']
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# test_scheduler.py
+import unittest
+
+from idk_some_code.grid import Grid
+from idk_some_code.scheduler import EventScheduler
+
+
+class Worker:
+    """Something schedulable that is busy for a fixed number of ticks after each decision."""
+
+    def __init__(self, busy_for: int) -> None:
+        self.busy_for = busy_for
+        self.decision_times = []
+
+    def step(self, current_time: int) -> int:
+        self.decision_times.append(current_time)
+        return current_time + self.busy_for
+
+
+class TestEventScheduler(unittest.TestCase):
+    """Time should only be spent where something actually happens."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(10, 10)
+        self.scheduler = EventScheduler(self.grid, decay_rate=100)
+
+    def test_busy_periods_are_honored_exactly(self):
+        quick, slow = Worker(1), Worker(5)
+        self.scheduler.schedule(0, quick)
+        self.scheduler.schedule(0, slow)
+        self.scheduler.run_until(12)
+        self.assertEqual(quick.decision_times, list(range(12)))
+        self.assertEqual(slow.decision_times, [0, 5, 10], "The slow worker got polled while it was busy.")
+
+    def test_idle_stretches_cost_nothing(self):
+        sleeper = Worker(1000)
+        self.scheduler.schedule(0, sleeper)
+        processed = self.scheduler.run_until(5000)
+        self.assertEqual(processed, 5, "The scheduler ticked through time nobody needed.")
+        self.assertEqual(self.scheduler.now, 5000)
+
+    def test_same_time_keeps_scheduling_order(self):
+        order = []
+
+        class Named:
+            def __init__(self, name):
+                self.name = name
+
+            def step(self, current_time):
+                order.append(self.name)
+                return current_time + 1
+
+        for name in "abc":
+            self.scheduler.schedule(0, Named(name))
+        self.scheduler.run_until(1)
+        self.assertEqual(order, ["a", "b", "c"])
+
+    def test_decay_follows_elapsed_time(self):
+        self.grid.add_pheromone(3, 3, "trail", "Drone trail", 0)
+        self.scheduler.schedule(0, Worker(37))
+        self.scheduler.run_until(100)
+        intensity = self.grid.get_pheromones(3, 3)[0]['intensity']
+        self.assertAlmostEqual(intensity, 0.9, places=9,
+                               msg="Decay should only depend on elapsed time, not on how often the clock stopped.")
+
+    def test_faded_pheromones_are_removed(self):
+        self.grid.add_pheromone(3, 3, "trail", "Drone trail", 0)
+        self.scheduler.run_until(10000)
+        self.assertEqual(self.grid.get_pheromones(3, 3), [])
+        self.assertNotIn((3, 3), self.grid.pheromone_cells)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# test_swarm.py
+import random
+import unittest
+
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+from idk_some_code.swarm import SwarmIndex
+
+
+class TestSwarmIndex(unittest.TestCase):
+    """Drones should always know who's flying next to them, without asking everybody."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(40, 40)
+        self.swarm = SwarmIndex(bucket_size=4)
+
+    def test_moves_are_tracked(self):
+        drone = Drone(self.grid, (5, 5), swarm=self.swarm)
+        self.assertTrue(self.swarm.is_occupied(5, 5))
+        drone.move("right")
+        self.assertFalse(self.swarm.is_occupied(5, 5), "Swarm still thinks the drone is where it left.")
+        self.assertEqual(self.swarm.drones_at(6, 5), [drone])
+        drone.position = (20, 20)  # Teleports count too
+        self.assertEqual(self.swarm.position_of(drone), (20, 20))
+
+    def test_drones_within_matches_pairwise_check(self):
+        rng = random.Random(11)
+        drones = [Drone(self.grid, (rng.randrange(40), rng.randrange(40)), swarm=self.swarm) for _ in range(50)]
+        for drone in drones[::2]:
+            for _ in range(6):
+                drone.move(rng.choice(["up", "down", "left", "right"]))
+        for drone in drones:
+            x, y = drone.position
+            expected = {other for other in drones if other is not drone and
+                        (other.position[0] - x) ** 2 + (other.position[1] - y) ** 2 <= 25}
+            self.assertEqual(set(drone.nearby_drones(5)), expected, "Swarm index lost track of a neighbour.")
+
+    def test_unregister(self):
+        drone = Drone(self.grid, (1, 1), swarm=self.swarm)
+        self.swarm.unregister(drone)
+        self.assertNotIn(drone, self.swarm)
+        self.assertFalse(self.swarm.is_occupied(1, 1))
+
+    def test_drone_without_swarm(self):
+        drone = Drone(self.grid, (1, 1))
+        self.assertEqual(drone.nearby_drones(5), [], "A lone drone shouldn't see anybody.")
+
+
+if __name__ == "__main__":
+    unittest.main()
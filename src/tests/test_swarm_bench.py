@@ -0,0 +1,53 @@
+# test_swarm_bench.py
+import unittest
+
+from benchmarks.swarm_bench import build_swarm, run, run_config
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+from idk_some_code.main import simulate_disaster_response
+
+
+class TestStubPolicy(unittest.TestCase):
+    """The whole agent loop, minus the agent."""
+
+    def test_stub_runs_the_agent_loop_offline(self):
+        drone = Drone(Grid(15, 15), (7, 7), policy="stub")
+        for current_time in range(20):
+            drone.step(current_time)
+        self.assertGreater(drone.controller.llm_calls, 0, "The stub was never consulted")
+        self.assertGreater(drone.controller.local_steps, 0, "The drone never followed an intent on its own")
+        self.assertGreater(drone.grid.explored_cells, 1, "The stub drone never explored anything")
+
+    def test_stub_runs_are_reproducible(self):
+        self.assertEqual(simulate_disaster_response((20, 20), 4, 20, 40, "stub", seed=9),
+                         simulate_disaster_response((20, 20), 4, 20, 40, "stub", seed=9),
+                         "Same seed, different stub run")
+
+
+class TestSwarmBench(unittest.TestCase):
+    """How many drones before Python gives up?"""
+
+    def test_drones_are_spread_out(self):
+        grid, drones, scheduler = build_swarm(30, 50, "stub")
+        self.assertEqual(len({drone.position for drone in drones}), 50, "Drones were stacked on the same cell")
+        self.assertTrue(all(grid.is_passable(*drone.position) for drone in drones), "A drone started in a mountain")
+        self.assertEqual(len(scheduler), 50, "Some drones were never scheduled")
+
+    def test_more_drones_than_cells(self):
+        _, drones, _ = build_swarm(4, 40, "heuristic")
+        self.assertEqual(len(drones), 40, "Crowding dropped drones")
+
+    def test_result_fields(self):
+        result = run_config(20, 5, 10, "stub", phases=True)
+        for field in ("ticks_per_s", "us_per_drone_tick", "us_per_decision", "peak_rss_mb"):
+            self.assertIn(field, result, f"The result lost its {field}")
+        self.assertGreater(result["decisions"], 0, "No drone decided anything")
+        self.assertIn("decision", result["phases"], "The phase breakdown is missing the decisions")
+
+    def test_dense_configurations_are_skipped(self):
+        results = run([10], [1, 50], ticks=5, isolated=False, max_density=0.1)
+        self.assertEqual([result["drones"] for result in results.values()], [1], "A crowded map was benchmarked")
+
+
+if __name__ == '__main__':
+    unittest.main()
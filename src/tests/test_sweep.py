@@ -0,0 +1,71 @@
+# test_sweep.py
+import csv
+import os
+import tempfile
+import unittest
+
+from idk_some_code.sweep import COLUMNS, aggregate, completed_runs, expand_grid, run_config, run_id, run_sweep
+
+
+class TestSweep(unittest.TestCase):
+    """Hundreds of disasters, none of them run by hand."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.results = os.path.join(self.directory.name, "sweep.csv")
+        self.configs = expand_grid([(15, 15)], [1, 3], [20], num_mountains=[5], seeds=[0, 1], simulation_time=30)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _rows(self):
+        with open(self.results, newline="") as file:
+            return list(csv.DictReader(file))
+
+    def test_expand_grid(self):
+        self.assertEqual(len(self.configs), 4, "The parameter grid multiplied wrong")
+        self.assertEqual(len({run_id(config) for config in self.configs}), 4, "Two runs ended up with the same id")
+
+    def test_run_config_is_reproducible(self):
+        first, second = run_config(self.configs[0]), run_config(self.configs[0])
+        for row in (first, second):
+            del row["wall_time"]
+        self.assertEqual(first, second, "Same configuration, different disaster")
+        self.assertTrue(0 < first["coverage"] <= 1, "Coverage went off the map")
+        self.assertEqual(first["ticks"], 30, "The run did not last as long as asked")
+
+    def test_sweep_writes_every_run(self):
+        self.assertEqual(run_sweep(self.configs, self.results, workers=2), 4, "Some runs never ran")
+        rows = self._rows()
+        self.assertEqual(len(rows), 4, "The table is missing rows")
+        self.assertEqual(tuple(rows[0].keys()), COLUMNS, "The columns got shuffled")
+
+    def test_resume_skips_finished_runs(self):
+        run_sweep(self.configs[:2], self.results, workers=2)
+        # An interruption in the middle of writing a row
+        with open(self.results, "a") as file:
+            file.write("deadbeef,15,15,3")
+        self.assertEqual(completed_runs(self.results), {run_id(config) for config in self.configs[:2]},
+                         "A half written row counted as done")
+        self.assertEqual(run_sweep(self.configs, self.results, workers=2), 2, "Finished runs were run again")
+        self.assertEqual(len(self._rows()), 4, "Resuming duplicated or lost rows")
+        self.assertEqual(run_sweep(self.configs, self.results), 0, "A finished sweep started over")
+
+    def test_procedural_scenarios_are_cached(self):
+        configs = expand_grid([(15, 15)], [2], [20], num_mountains=[10], num_buildings=[20], seeds=[0],
+                              simulation_time=20, scenarios=["random", "procedural"])
+        cache = os.path.join(self.directory.name, "scenarios")
+        self.assertEqual(run_sweep(configs, self.results, workers=1, scenario_cache=cache), 2, "Some runs never ran")
+        self.assertEqual({row["scenario"] for row in self._rows()}, {"random", "procedural"},
+                         "A scenario went missing from the table")
+        self.assertEqual(len(os.listdir(cache)), 1, "Only the procedural scenario belongs in the cache")
+
+    def test_aggregate_over_seeds(self):
+        run_sweep(self.configs, self.results, workers=2)
+        summary = aggregate(self.results)
+        self.assertEqual(len(summary), 2, "Seeds were not averaged away")
+        self.assertTrue(all(entry["runs"] == 2 for entry in summary), "A configuration lost a seed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# test_trajectory.py
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+from idk_some_code.main import record_simulation, schedule_drones
+from idk_some_code.random_streams import SimulationRandom
+from idk_some_code.raster import GridRaster
+from idk_some_code.trajectory import TrajectoryReplay, open_recorder, read_trajectory
+from idk_some_code.video import render_video, split_frames
+
+
+class TestTrajectoryLog(unittest.TestCase):
+    """Whatever the simulation saw, the replay should see too."""
+
+    def setUp(self) -> None:
+        self.directory = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.directory, "trajectory.log")
+        self.grid = Grid(15, 10)
+        self.grid.add_mountain(3, 3)
+        self.grid.add_collapsed_building(5, 5)
+        self.grid.add_victim(7, 2)
+        streams = SimulationRandom(4)
+        self.drones = [Drone(self.grid, (7, 5), policy="heuristic", rng=rng) for rng in streams.drone_streams(3)]
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def test_replay_matches_the_live_grid(self):
+        scheduler = schedule_drones(self.grid, self.drones)
+        recorder = open_recorder(self.grid, self.log_path)
+        images, positions = [], []
+        for tick in range(20):
+            scheduler.run_until(tick + 1)
+            if tick == 10:
+                self.grid.add_pheromone(1, 1, "need_help", "Assistance required", tick)
+            recorder.record(tick, self.drones)
+            images.append(GridRaster(self.grid).update().copy())
+            positions.append([drone.position for drone in self.drones])
+        recorder.close()
+
+        records = read_trajectory(self.log_path)
+        replay = TrajectoryReplay(next(records))
+        for tick, record in enumerate(records):
+            replay.apply(record)
+            self.assertEqual(record.tick, tick)
+            np.testing.assert_array_equal(replay.image(), images[tick], "Replayed frame differs from the live one.")
+            self.assertEqual([tuple(position) for position in replay.positions.tolist()], positions[tick])
+
+    def test_only_changes_are_logged(self):
+        record_simulation(self.grid, self.drones, schedule_drones(self.grid, self.drones), 5, self.log_path)
+        records = list(read_trajectory(self.log_path))[1:]
+        self.assertEqual(len(records), 5)
+        self.assertEqual(len(records[0].changed), 150, "First record should hold the whole grid.")
+        self.assertTrue(all(len(record.changed) < 20 for record in records[1:]), "Log is rewriting unchanged cells.")
+
+    def test_truncated_record_ends_the_log(self):
+        record_simulation(self.grid, self.drones, schedule_drones(self.grid, self.drones), 5, self.log_path)
+        with open(self.log_path, "rb+") as file:
+            file.truncate(os.path.getsize(self.log_path) - 1)  # The run died while writing the last record
+        records = list(read_trajectory(self.log_path))[1:]
+        self.assertEqual([record.tick for record in records], [0, 1, 2, 3], "The cut off record was read anyway.")
+
+    def test_split_frames(self):
+        self.assertEqual(split_frames(10, 3), [(0, 3), (3, 6), (6, 10)])
+        self.assertEqual(split_frames(2, 8), [(0, 1), (1, 2)], "More segments than frames.")
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg is not installed")
+    def test_parallel_render(self):
+        record_simulation(self.grid, self.drones, schedule_drones(self.grid, self.drones), 12, self.log_path)
+        output = os.path.join(self.directory, "animation.mp4")
+        render_video(self.log_path, output, workers=3, figsize=(2, 2), dpi=50)
+        self.assertGreater(os.path.getsize(output), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# test_video.py
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import numpy as np
+
+from idk_some_code.drone import Drone
+from idk_some_code.grid import Grid
+from idk_some_code.main import record_simulation, schedule_drones, stream_simulation
+from idk_some_code.raster import COLORS, GridRaster
+from idk_some_code.random_streams import SimulationRandom
+from idk_some_code.video import frame_size, render_video, write_grid_frame
+
+
+class _FrameCollector:
+    """Stands in for RawVideoWriter, keeping copies of the frames written."""
+
+    def __init__(self):
+        self.frames = []
+
+    def write(self, frame):
+        self.frames.append(frame.copy())
+
+
+def _decoded_frame_count(path, width, height):
+    """Decodes a video back to raw RGB and counts its frames."""
+    raw = subprocess.run(["ffmpeg", "-loglevel", "error", "-i", path, "-f", "rawvideo", "-pix_fmt", "rgb24", "-"],
+                         check=True, capture_output=True).stdout
+    return len(raw) // (width * height * 3)
+
+
+class TestRawFrames(unittest.TestCase):
+    """Pixels straight to the encoder, no figure in sight."""
+
+    def setUp(self) -> None:
+        self.grid = Grid(9, 7)
+        self.grid.add_mountain(2, 2)
+        self.image = GridRaster(self.grid).update()
+
+    def test_drones_are_painted_and_the_raster_left_alone(self):
+        before = self.image.copy()
+        collector = _FrameCollector()
+        write_grid_frame(collector, self.image, np.array([[4, 3], [2, 2]]))
+        frame = collector.frames[0]
+        self.assertEqual(tuple(frame[3, 4]), COLORS["drone"])
+        self.assertEqual(tuple(frame[2, 2]), COLORS["drone"], "Drone hidden behind a mountain.")
+        np.testing.assert_array_equal(self.image, before, "Drones got burned into the raster.")
+
+    def test_downsampling(self):
+        collector = _FrameCollector()
+        write_grid_frame(collector, self.image, np.array([[8, 6]]), downsample=2)
+        self.assertEqual(collector.frames[0].shape, (4, 5, 3))
+        self.assertEqual(frame_size(9, 7, 2), (5, 4))
+        self.assertEqual(tuple(collector.frames[0][3, 4]), COLORS["drone"])
+
+    @unittest.skipUnless(shutil.which("ffmpeg"), "ffmpeg is not installed")
+    def test_stream_and_raw_render(self):
+        directory = tempfile.mkdtemp()
+        try:
+            drones = [Drone(self.grid, (4, 3), policy="heuristic", rng=rng)
+                      for rng in SimulationRandom(1).drone_streams(2)]
+            live = os.path.join(directory, "live.mp4")
+            stream_simulation(self.grid, drones, schedule_drones(self.grid, drones), 8, live)
+            self.assertEqual(_decoded_frame_count(live, 10, 8), 8, "Live stream lost frames.")
+
+            log_path = os.path.join(directory, "trajectory.log")
+            record_simulation(self.grid, drones, schedule_drones(self.grid, drones), 10, log_path)
+            rendered = os.path.join(directory, "rendered.mp4")
+            render_video(log_path, rendered, workers=2, raw=True, downsample=2)
+            self.assertEqual(_decoded_frame_count(rendered, 6, 4), 10, "Parallel raw render lost frames.")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    unittest.main()